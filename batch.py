@@ -0,0 +1,113 @@
+"""
+    Batch conversion of the projects of a manifest, in one process or a pool of worker processes.
+
+        python cli.py --batch D:/Projects/projects.json --batch-workers 4
+
+    The manifest lists the project folders, or the ProjectPaths folders of a project, relative to the
+    manifest folder :
+
+        {"projects" : ["LineA", "LineB", {"name" : "LineC", "project" : "LineC", "outputDir" : "D:/Out/LineC"}]}
+
+    Every process imports the converter once and converts its projects one after the other. The parsed
+    BaseFiles, PlcTags.csv frames, tag resolvers and WPH templates are kept by content hash, a project with
+    the same files as a previous one of the process reuses them (see parser.configureProject). A failed
+    project is reported and the batch goes on. The run report and the tag list of each project are written
+    to its output folder. The timing of every project is printed and written to BatchReport.json next to the manifest.
+"""
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from projectconfig import ProjectPaths
+
+# converter settings of the batch, the global of parser with the same name is set in every process
+CONVERTER_SETTINGS = ['STREAMING_OUTPUT', 'PROFILE_MODE', 'RUN_REPORT', 'BUILD_CACHE_FOLDER', 'DRY_RUN', 'VALIDATE_MODEL', 'TAG_INDEX', 'VERIFY_TAGS',
+                      'VERIFY_CONCURRENCY', 'VERIFY_BATCH_SIZE', 'VERIFY_CACHE', 'SPLIT_OUTPUT', 'TAG_LIST_FILE',
+                      'INGESTION_WORKERS', 'GENERATION_WORKERS']
+
+# counters of the run report telling what a project reused from the previous ones of its process
+REUSE_COUNTERS = ['base files parsed', 'PlcTags files parsed', 'tag resolvers compiled', 'wph template misses']
+
+def readManifest(path : str) -> dict[str, ProjectPaths]:
+    """Project name -> ProjectPaths of every project of the manifest, in manifest order"""
+    with open(path, encoding='utf-8') as fh:
+        manifest = json.load(fh)
+    folder = os.path.dirname(os.path.abspath(path))
+    projects : dict[str, ProjectPaths] = {}
+    for entry in manifest['projects']:
+        entry = {'project' : entry} if isinstance(entry, str) else entry
+        root = os.path.join(folder, entry.get('project', '.'))
+        defaults = ProjectPaths.fromRoot(root)
+        name = entry.get('name', os.path.basename(os.path.normpath(root)))
+        if name in projects:
+            print(f"Error project {name} is twice in {path}, the second one is ignored")
+            continue
+        projects[name] = ProjectPaths(inputFolder=os.path.join(folder, entry['inputDir']) if 'inputDir' in entry else defaults.inputFolder,
+                                      configFolder=os.path.join(folder, entry['configDir']) if 'configDir' in entry else defaults.configFolder,
+                                      baseFolder=os.path.join(folder, entry['baseDir']) if 'baseDir' in entry else defaults.baseFolder,
+                                      outputFolder=os.path.join(folder, entry['outputDir']) if 'outputDir' in entry else defaults.outputFolder)
+    return projects
+
+def useConverterSettings(settings : dict[str, object]):
+    """Worker initializer, the settings of the batch"""
+    import parser
+
+    for name, value in settings.items():
+        setattr(parser, name, value)
+
+def convertProject(name : str, paths : ProjectPaths) -> dict:
+    """Convert one project in this process, its timing and results"""
+    import parser
+
+    start = time.perf_counter()
+    result = {'project' : name, 'process' : os.getpid(), 'status' : 'converted'}
+    tagListFile = parser.TAG_LIST_FILE
+    if tagListFile:
+        parser.TAG_LIST_FILE = os.path.join(paths.outputFolder, os.path.basename(tagListFile))
+    try:
+        parser.configureProject(paths)
+        changes = parser.runConverter()
+    except Exception as e:
+        print(f"Error project {name} failed : {type(e).__name__} {e}")
+        result.update(status='failed', error=f"{type(e).__name__} {e}", seconds=round(time.perf_counter() - start, 6))
+        return result
+    finally:
+        parser.TAG_LIST_FILE = tagListFile
+
+    result['seconds'] = round(time.perf_counter() - start, 6)
+    result['outputsChanged'] = sum(change['status'] != 'unchanged' for change in changes.values())
+    result['violations'] = len(parser.MODEL_VIOLATIONS)
+    if parser.TAG_VERIFICATION is not None:
+        result['missingTags'] = len(parser.TAG_VERIFICATION.missing) + len(parser.TAG_VERIFICATION.errors)
+    result['stages'] = {stageName : round(statistics.seconds, 6) for stageName, statistics in parser.INSTRUMENTATION.stages.items()}
+    result['reuse'] = {counter : parser.INSTRUMENTATION.counters.get(counter, 0) for counter in REUSE_COUNTERS}
+    return result
+
+def runBatch(projects : dict[str, ProjectPaths], settings : dict[str, object], workers : int = 1) -> list[dict]:
+    """Results of every project, in manifest order. With `workers` > 1 each project is converted with one process"""
+    # the summary reads the stage timers and counters of every project
+    settings = dict(settings, RUN_REPORT=True)
+    if workers <= 1 or len(projects) <= 1:
+        useConverterSettings(settings)
+        return [convertProject(name, paths) for name, paths in projects.items()]
+
+    settings = dict(settings, INGESTION_WORKERS=1, GENERATION_WORKERS=1)
+    with ProcessPoolExecutor(max_workers=min(workers, len(projects)), initializer=useConverterSettings, initargs=(settings,)) as executor:
+        return list(executor.map(convertProject, projects.keys(), projects.values()))
+
+def batchSummary(results : list[dict], seconds : float) -> str:
+    lines = [f"{'project':<24} {'status':<10} {'seconds':>8} {'changed':>8} {'errors':>7} {'parsed':>7} {'compiled':>9} {'process':>8}"]
+    for result in results:
+        reuse = result.get('reuse', {})
+        lines.append(f"{result['project']:<24} {result['status']:<10} {result['seconds']:>8.3f} {result.get('outputsChanged', '-'):>8} "
+                     f"{result.get('violations', '-'):>7} {reuse.get('base files parsed', 0) + reuse.get('PlcTags files parsed', 0):>7} "
+                     f"{reuse.get('tag resolvers compiled', 0):>9} {result['process']:>8}")
+    converted = sum(result['status'] == 'converted' for result in results)
+    lines.append(f"{converted} of {len(results)} projects converted in {seconds:.2f} s, "
+                 f"{sum(result['seconds'] for result in results):.2f} s of project time")
+    return '\n'.join(lines)
+
+def writeBatchReport(path : str, results : list[dict], seconds : float, workers : int):
+    with open(path, 'w', encoding='utf-8') as fh:
+        json.dump({'seconds' : round(seconds, 6), 'workers' : workers, 'projects' : results}, fh, indent=4)
@@ -0,0 +1,169 @@
+"""Converter benchmark : each stage timed on a synthetic plant, results written to a JSON file.
+
+    python benchmarks/bench_converter.py --plcs 2 --machines 2 --stations 20 --actuators 10 --alarms 5000 --output bench.json
+    python benchmarks/bench_converter.py --baseline bench.json --threshold 0.2
+
+Every stage reports its best time over --repeat runs and the peak of traced Python allocations of one more
+run under tracemalloc. With --baseline the stage times are compared to a previous result of the same plant
+size and the benchmark fails when one of them got slower by more than --threshold. Both runs also time a fixed
+calibration loop and stage times are compared in units of it, so a baseline recorded on another machine does
+not read as a regression or hide one.
+generateMainInformationModelFromDataFrames includes the makeAlarmsTextFiles call it makes.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows, peak RSS is then not reported
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_plant import makeSyntheticProject, registerPlcConfigs
+
+REPOSITORY_FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# iterations of the calibration loop, about 0.1 s on a current desktop
+CALIBRATION_ITERATIONS = 1_000_000
+
+def gitCommit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPOSITORY_FOLDER,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def maxRssBytes() -> int:
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    maxRss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxRss if sys.platform == 'darwin' else maxRss * 1024
+
+def calibrationSeconds(repeat : int = 5) -> float:
+    """Best time of a fixed pure Python loop, the unit stage times are compared in"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        total = 0
+        for i in range(CALIBRATION_ITERATIONS):
+            total += i % 7
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def measure(function, repeat : int) -> (dict, object):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'seconds' : best, 'peakBytes' : peak}, result
+
+def compareToBaseline(result : dict, baseline : dict, threshold : float) -> list[str]:
+    """Stages slower than the baseline by more than `threshold`, as report lines
+
+    Stage times are divided by the calibration time of their own run before they are compared.
+    A baseline without calibration time is compared in seconds.
+    """
+    if baseline['plant'] != result['plant']:
+        print(f"Warning : baseline plant {baseline['plant']} differs from {result['plant']}")
+    scale = 1.0
+    if baseline.get('calibrationSeconds') and result.get('calibrationSeconds'):
+        scale = baseline['calibrationSeconds'] / result['calibrationSeconds']
+        if baseline.get('machine') != result.get('machine'):
+            print(f"Baseline recorded on {baseline.get('machine')}, stage times scaled by {scale:.2f}")
+
+    regressions : list[str] = []
+    for stage, measurement in result['stages'].items():
+        if stage not in baseline['stages']:
+            continue
+        reference = baseline['stages'][stage]['seconds']
+        seconds = measurement['seconds'] * scale
+        ratio = seconds / reference if reference else 1.0
+        line = f"{stage:<45} {reference:8.3f} s -> {seconds:8.3f} s ({ratio - 1:+.0%})"
+        print(line)
+        if ratio > 1 + threshold:
+            regressions.append(line)
+    return regressions
+
+def main():
+    argParser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argParser.add_argument('--plcs', type=int, default=2)
+    argParser.add_argument('--machines', type=int, default=2)
+    argParser.add_argument('--stations', type=int, default=10)
+    argParser.add_argument('--actuators', type=int, default=8)
+    argParser.add_argument('--alarms', type=int, default=2000)
+    argParser.add_argument('--wph', type=int, default=160, help="WPH count of the loop shift registers")
+    argParser.add_argument('--workers', type=int, default=1, help="ingestion and generation processes")
+    argParser.add_argument('--repeat', type=int, default=3)
+    argParser.add_argument('--output', default='bench_converter.json')
+    argParser.add_argument('--baseline', help="result of a previous run to compare with")
+    argParser.add_argument('--threshold', type=float, default=0.2, help="allowed slowdown per stage, 0.2 = 20%%")
+    args = argParser.parse_args()
+
+    output = os.path.abspath(args.output)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as fh:
+            baseline = json.load(fh)
+
+    plant = {'plcs' : args.plcs, 'machines' : args.machines, 'stations' : args.stations,
+             'actuators' : args.actuators, 'alarms' : args.alarms, 'wph' : args.wph}
+
+    with tempfile.TemporaryDirectory() as root:
+        makeSyntheticProject(root, plcs=args.plcs, machines=args.machines, stations=args.stations,
+                             actuators=args.actuators, alarms=args.alarms)
+        os.chdir(root)
+        import parser
+
+        registerPlcConfigs(parser, args.plcs)
+        parser.LOOP_WPH_COUNT = args.wph
+
+        stages : dict[str, dict] = {}
+        stages['excelConfigFilesToDataFrames'], (dfinformationModel, dfParameters, dfAlarms) = measure(
+            lambda: parser.excelConfigFilesToDataFrames(os.path.join(root, 'InputFiles'), workers=args.workers), args.repeat)
+        stages['generateMainInformationModelFromDataFrames'], maininformationmodel = measure(
+            lambda: parser.generateMainInformationModelFromDataFrames(dfinformationModel=dfinformationModel, dfParameters=dfParameters,
+                                                                      dfAlarms=dfAlarms, workers=args.workers), args.repeat)
+        stages['makeAlarmsTextFiles'], _ = measure(lambda: parser.makeAlarmsTextFiles(dfAlarms=dfAlarms), args.repeat)
+        stages['makeProjectHmiTypeTags'], _ = measure(lambda: parser.makeProjectHmiTypeTags(maininformationmodel=maininformationmodel), args.repeat)
+
+        outputSize = os.path.getsize(parser.PROJECT.mainInformationModelFile)
+
+    result = {'commit' : gitCommit(), 'python' : platform.python_version(), 'plant' : plant,
+              'machine' : f"{platform.node()} {platform.machine()}", 'calibrationSeconds' : calibrationSeconds(),
+              'workers' : args.workers, 'repeat' : args.repeat, 'stages' : stages,
+              'informationModelRows' : len(dfinformationModel), 'alarmRows' : len(dfAlarms),
+              'mainInformationModelBytes' : outputSize, 'maxRssBytes' : maxRssBytes()}
+
+    for stage, measurement in stages.items():
+        print(f"{stage:<45} {measurement['seconds']:8.3f} s {measurement['peakBytes'] / 1e6:9.1f} MB peak")
+    if result['maxRssBytes'] is not None:
+        print(f"{'max RSS':<45} {result['maxRssBytes'] / 1e6:19.1f} MB")
+
+    with open(output, 'w', encoding='utf-8') as fh:
+        json.dump(result, fh, indent=4)
+    print(f"Results written to {output}")
+
+    if baseline is not None:
+        regressions = compareToBaseline(result, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} stage(s) slower than the baseline by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""Shift register benchmark : element-by-element construction vs. template-and-clone in makeshiftRegister.
+
+    python benchmarks/bench_shift_register.py --wph 160 500 1000
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+from lxml import etree
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_plant import makeSyntheticProject
+
+def elementwiseShiftRegister(parser, shiftRegisterName, dfinformationModel, wphCount, nestCount, dfStation=None):
+    """Reference builder : every da:Wph, da:Nest and Primitive created from scratch."""
+    NAMESPACES = parser.NAMESPACES
+    plconfig = parser.PLC_CONFIG[dfinformationModel['AutomationDevice'].values[0]]
+    row = parser.tagRowFrom(dfinformationModel.iloc[0])
+
+    daShiftRegister = etree.Element(f"{{{NAMESPACES['da']}}}ShiftRegister")
+    daShiftRegister.attrib['name'] = shiftRegisterName
+    daShiftRegister.attrib['scopeId'] = shiftRegisterName
+    daShiftRegister.attrib['hmiId'] = f'{random.randint(10000,99999)}'
+    daShiftRegister.attrib['tags'] = "Type/ShiftRegister"
+
+    if dfStation is not None:
+        tagType, tagAddress = plconfig.get_tag(key='shift_register_Station_StationID',dfInformationModelRow=row)
+        daShiftRegister.append(parser.makePrimitive(name="StationId", dataType=tagType, plcTag=f"//{tagAddress}"))
+
+    if dfStation is not None:
+        wphKey = 'shift_register_Station_WPHID'
+        prefix = 'shift_register_Station_Nest_'
+    else:
+        wphKey = 'shift_register_Loop_WPHID'
+        prefix = 'shift_register_Loop_Nest_'
+
+    tags = iter(plconfig.tagResolver.resolveMany(
+        request for i in range(1,wphCount+1) for request in
+            [(wphKey, row, i, None)] + [(f'{prefix}{nestTag}', row, i, j) for j in range(1,nestCount+1) for nestTag in parser.SHIFT_REGISTER_NEST_TAGS]))
+
+    for i in range(1,wphCount+1):
+        daWph = etree.Element(f"{{{NAMESPACES['da']}}}Wph")
+        daShiftRegister.append(daWph)
+        daWph.attrib['name'] = f"WPH_{i}"
+        daWph.attrib['scopeId'] = f"WPH_{i}"
+        daWph.attrib['hmiId'] = f'{random.randint(10000,99999)}'
+
+        tagType, tagAddress = next(tags)
+        daWph.append(parser.makePrimitive(name="WphId", dataType=tagType, plcTag=f"//{tagAddress}"))
+
+        for j in range(1,nestCount+1):
+            daNest = etree.Element(f"{{{NAMESPACES['da']}}}Nest")
+            daWph.append(daNest)
+            daNest.attrib['name'] = f"{j}"
+            daNest.attrib['hmiId'] = f'{random.randint(10000,99999)}'
+
+            for nestTag in parser.SHIFT_REGISTER_NEST_TAGS:
+                tagType, tagAddress = next(tags)
+                daNest.append(parser.makePrimitive(name=nestTag, dataType=tagType, plcTag=f"//{tagAddress}"))
+
+    return daShiftRegister
+
+def withoutHmiIds(element) -> bytes:
+    return re.sub(rb' hmiId="[0-9]*"', b'', etree.tostring(element))
+
+def timeit(function, repeat : int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    argParser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argParser.add_argument('--wph', type=int, nargs='+', default=[160, 500, 1000])
+    argParser.add_argument('--nests', type=int, default=4)
+    argParser.add_argument('--repeat', type=int, default=5)
+    args = argParser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        makeSyntheticProject(root, plcs=1, machines=1, stations=1, actuators=1, alarms=1)
+        os.chdir(root)
+        import parser
+
+        dfinformationModel, _, _ = parser.excelConfigFilesToDataFrames(os.path.join(root, 'InputFiles'))
+        machine = parser.makeModelIndex(dfinformationModel)[0].children[0]
+
+        print(f"{'WPH':>6} {'elements':>9} {'element-wise':>13} {'clone':>9} {'speedup':>8}")
+        for wphCount in args.wph:
+            reference = elementwiseShiftRegister(parser, 'Loop01', dfinformationModel, wphCount, args.nests)
+            cloned = parser.makeshiftRegister(shiftRegisterName='Loop01', row=machine.row,
+                                              wphCount=wphCount, nestCount=args.nests)
+            assert withoutHmiIds(reference) == withoutHmiIds(cloned), "template-and-clone output differs from the reference"
+
+            elementwise = timeit(lambda: elementwiseShiftRegister(parser, 'Loop01', dfinformationModel, wphCount, args.nests), args.repeat)
+            clone = timeit(lambda: parser.makeshiftRegister(shiftRegisterName='Loop01', row=machine.row,
+                                                            wphCount=wphCount, nestCount=args.nests), args.repeat)
+            elements = sum(1 for _ in cloned.iter())
+            print(f"{wphCount:>6} {elements:>9} {elementwise * 1000:>11.1f}ms {clone * 1000:>7.1f}ms {elementwise / clone:>7.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Split output benchmark : MainInformationModel.xml as one file vs. include files per PLC and per machine.
+
+    python benchmarks/bench_split_output.py --plcs 4 --machines 3 --stations 10 --threads 1 4
+
+The model is built once, then written in every mode with every thread count into an empty output folder,
+best of --repeat runs. Reports the file count, the largest and the mean file size, and the write time.
+The largest file is what the HMI server parses, and what is redeployed, when one PLC or machine changes.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_plant import makeSyntheticProject, registerPlcConfigs
+
+def writeOnce(parser, maininformationmodelFile) -> float:
+    shutil.rmtree(parser.PROJECT.dataFolder, ignore_errors=True)
+    os.makedirs(parser.PROJECT.dataFolder)
+    start = time.perf_counter()
+    parser.writeMainInformationModel(maininformationmodelFile)
+    return time.perf_counter() - start
+
+def outputSizes(parser) -> list[int]:
+    return [os.path.getsize(os.path.join(folder, name)) for folder, _, names in os.walk(parser.PROJECT.dataFolder) for name in names]
+
+def main():
+    argParser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argParser.add_argument('--plcs', type=int, default=4)
+    argParser.add_argument('--machines', type=int, default=3)
+    argParser.add_argument('--stations', type=int, default=10)
+    argParser.add_argument('--actuators', type=int, default=8)
+    argParser.add_argument('--threads', type=int, nargs='+', default=[1, 4])
+    argParser.add_argument('--repeat', type=int, default=3)
+    args = argParser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        makeSyntheticProject(root, plcs=args.plcs, machines=args.machines, stations=args.stations,
+                             actuators=args.actuators, alarms=100)
+        os.chdir(root)
+        import parser
+
+        registerPlcConfigs(parser, args.plcs)
+        parser.INSTRUMENTATION.enabled = False
+        parser.PROJECT.makeOutputFolders()
+        dfinformationModel, dfParameters, dfAlarms = parser.excelConfigFilesToDataFrames(parser.PROJECT.inputFolder, workers=1)
+        parser.generateMainInformationModelFromDataFrames(dfinformationModel=dfinformationModel, dfParameters=dfParameters, dfAlarms=dfAlarms)
+        maininformationmodelFile = parser.etree.parse(parser.PROJECT.mainInformationModelFile)
+
+        print(f"{'mode':<10} {'threads':>7} {'files':>6} {'largest':>12} {'mean':>12} {'total':>12} {'write':>10}")
+        for mode in [None, 'device', 'machine']:
+            parser.SPLIT_OUTPUT = mode
+            for threads in args.threads if mode else [1]:
+                parser.OUTPUT_WORKERS = threads
+                best = min(writeOnce(parser, maininformationmodelFile) for _ in range(args.repeat))
+                sizes = outputSizes(parser)
+                print(f"{mode or 'single':<10} {threads:>7} {len(sizes):>6} {max(sizes) / 1e3:>9.1f} kB {sum(sizes) / len(sizes) / 1e3:>9.1f} kB "
+                      f"{sum(sizes) / 1e3:>9.1f} kB {best:>8.3f} s")
+
+if __name__ == '__main__':
+    main()
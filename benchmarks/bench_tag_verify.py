@@ -0,0 +1,77 @@
+"""plcTag verification benchmark : tags per second against stand-in OPC UA servers.
+
+    python benchmarks/bench_tag_verify.py --plcs 2 --machines 2 --stations 10 --concurrency 1 8 32 --batch-size 100 500
+
+The model of a synthetic plant is generated once and its plcTags served by one stand-in server per PLC,
+--missing of them left out. Every concurrency and batch size is run with an empty tag cache, best of
+--repeat runs, then once with the cache of the previous run. The missing tags reported must be the ones
+left out.
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from opcua_standin import StandInServers, dropTags
+from synthetic_plant import makeSyntheticProject, registerPlcConfigs
+
+def main():
+    argParser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argParser.add_argument('--plcs', type=int, default=2)
+    argParser.add_argument('--machines', type=int, default=2)
+    argParser.add_argument('--stations', type=int, default=10)
+    argParser.add_argument('--actuators', type=int, default=8)
+    argParser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+    argParser.add_argument('--batch-size', type=int, nargs='+', default=[100, 500])
+    argParser.add_argument('--missing', type=float, default=0.01)
+    argParser.add_argument('--port', type=int, default=48400, help="port of the first stand-in server")
+    argParser.add_argument('--repeat', type=int, default=3)
+    args = argParser.parse_args()
+
+    # asyncua logs every session and every unknown node
+    logging.basicConfig(level=logging.ERROR)
+    with tempfile.TemporaryDirectory() as root:
+        makeSyntheticProject(root, plcs=args.plcs, machines=args.machines, stations=args.stations,
+                             actuators=args.actuators, alarms=100)
+        os.chdir(root)
+        import parser
+        import tagverify
+
+        registerPlcConfigs(parser, args.plcs)
+        parser.INSTRUMENTATION.enabled = False
+        parser.PROJECT.makeOutputFolders()
+        parser.generateMainInformationModelFromDataFrames(*parser.excelConfigFilesToDataFrames(parser.PROJECT.inputFolder, workers=1))
+
+        devices : dict[str, tuple[parser.OpcuaConfig, dict[str, str]]] = {}
+        for reference in parser.MODEL_TAG_REFERENCES:
+            devices.setdefault(reference.device, (parser.PLC_CONFIG[reference.device], {}))[1].setdefault(reference.plcTag, reference.path)
+        endpoints : dict[int, tuple[str, list[str]]] = {}
+        dropped : set[tuple[str, str]] = set()
+        for number, (deviceName, (plcConfig, plcTags)) in enumerate(sorted(devices.items())):
+            plcConfig.address, plcConfig.port = '127.0.0.1', args.port + number
+            deviceDropped = dropTags(list(plcTags), args.missing)
+            endpoints[plcConfig.port] = (plcConfig.defaultNamespaceUri, [plcTag for plcTag in plcTags if plcTag not in deviceDropped])
+            dropped |= {(deviceName, plcTag) for plcTag in deviceDropped}
+        tagCount = sum(len(plcTags) for _, plcTags in devices.values())
+        print(f"{tagCount} plcTags on {len(devices)} PLCs, {len(dropped)} left out")
+
+        with StandInServers(endpoints):
+            print(f"{'concurrency':>11} {'batch':>6} {'requests':>8} {'seconds':>8} {'tags/s':>10} {'missing':>8}")
+            for concurrency in args.concurrency:
+                for batchSize in args.batch_size:
+                    runs = [tagverify.TagVerifier(concurrency=concurrency, batchSize=batchSize).verify(devices) for _ in range(args.repeat)]
+                    best = min(runs, key=lambda verification: verification.seconds)
+                    if {(check.device, check.plcTag) for check in best.missing} != dropped or best.errors:
+                        print(f"Error {len(best.missing)} missing and {len(best.errors)} errors, {len(dropped)} tags left out")
+                    print(f"{concurrency:>11} {batchSize:>6} {best.requests:>8} {best.seconds:>8.3f} {best.tagsPerSecond:>10.0f} {len(best.missing):>8}")
+
+            verifier = tagverify.TagVerifier(concurrency=args.concurrency[-1], batchSize=args.batch_size[-1])
+            verifier.verify(devices)
+            print(f"cached : {verifier.verify(devices).summary()}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Workbook loading benchmark : single-pass loader vs. one pd.read_excel per tab and extractor.
+
+    python benchmarks/bench_workbook_loading.py --stations 40 --actuators 20 --alarms 3000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_plant import makeSyntheticProject
+
+def legacyExcelConfigFilesToDataFrames(parser, folderpath : str):
+    """Reference loader : what excelConfigFilesToDataFrames did before the single-pass reader,
+    every extractor re-reads its tab from the raw workbook bytes."""
+    dfInformationModel = pd.DataFrame(columns=['AutomationDevice', 'Machine', 'Station', 'StationName', 'Actuator','ActuatorType', 'ActuatorName'])
+    dfAlarms = pd.DataFrame(columns=['AutomationDevice', 'AlarmName', 'AlarmInput', 'AlarmAcknowledge', 'AlarmMessage'])
+
+    for file in sorted(os.listdir(folderpath)):
+        if not file.endswith(".xlsm") or file.startswith("~$"):
+            continue
+        with open(os.path.join(folderpath,file), "rb") as fh:
+            buf = BytesIO(fh.read())
+            tabs = pd.ExcelFile(buf).sheet_names
+            plcName = file.split('_')[1].replace(".xlsm","")
+            for tab in tabs:
+                if parser.isConfigSheet(tab) and tab != '_Alarms':
+                    dfInformationModel = pd.concat((dfInformationModel, parser.informationModelToDataFrame(
+                        tab=tab, plcName=plcName,
+                        df_Raw=pd.read_excel(buf, sheet_name=tab, header=None))), ignore_index=True)
+                if tab == '_Alarms':
+                    dfAlarms = pd.concat((dfAlarms, parser.alarmsToDataFrame(
+                        tab=tab, plcName=plcName,
+                        df_Raw=pd.read_excel(buf, sheet_name=tab, header=None))), ignore_index=True)
+    return dfInformationModel, dfAlarms
+
+def timeit(function, repeat : int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    argParser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argParser.add_argument('--plcs', type=int, default=1)
+    argParser.add_argument('--machines', type=int, default=2)
+    argParser.add_argument('--stations', type=int, default=20)
+    argParser.add_argument('--actuators', type=int, default=20)
+    argParser.add_argument('--alarms', type=int, default=3000)
+    argParser.add_argument('--repeat', type=int, default=3)
+    args = argParser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        makeSyntheticProject(root, plcs=args.plcs, machines=args.machines, stations=args.stations,
+                             actuators=args.actuators, alarms=args.alarms)
+        os.chdir(root)
+        import parser
+
+        inputFolder = os.path.join(root, 'InputFiles')
+        workbookSize = sum(os.path.getsize(os.path.join(inputFolder, f)) for f in os.listdir(inputFolder))
+        print(f"{args.plcs} workbook(s), {args.machines * args.stations} station sheets each, {workbookSize / 1e6:.1f} MB")
+
+        legacy = timeit(lambda: legacyExcelConfigFilesToDataFrames(parser, inputFolder), args.repeat)
+        singlePass = timeit(lambda: parser.excelConfigFilesToDataFrames(inputFolder), args.repeat)
+
+        print(f"per-tab read_excel : {legacy:8.3f} s")
+        print(f"single-pass loader : {singlePass:8.3f} s")
+        print(f"speedup            : {legacy / singlePass:8.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""Stand-in OPC UA servers for the plcTag verification.
+
+Serves the plcTags of a generated model, one server per OPC UA PLC of PlcConfig.json, on 127.0.0.1 and the
+port of the PLC, in the namespace of its defaultNamespaceUri. --missing leaves out a fraction of the tags,
+printed, to see them reported by the verification:
+
+    python cli.py --project /tmp/plant
+    python benchmarks/opcua_standin.py --project /tmp/plant --missing 0.01
+    python cli.py --project /tmp/plant --verify-tags
+
+Every plcTag is a variable node with the string identifier of the tag, the array elements Words[51] of a tag
+make one array node Words. The nodes are added in one pass without a parent, they can be read but not
+browsed : asyncua checks every sibling of an added node, a flat folder of 10k tags takes minutes. The index
+range of a Read is not applied by the asyncua server, an array element is found when its node is. The
+servers run in a thread with its own event loop, see StandInServers.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from typing import Iterable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from asyncua import Server, ua
+
+import projectconfig
+from projectconfig import ProjectPaths
+from tagverify import nodeAddress
+from validation import TagReference, modelViolations
+
+def standInNodes(plcTags : Iterable[str]) -> dict[str, int | list[int]]:
+    """Value of every node of the plcTags, by string identifier"""
+    nodes : dict[str, int | list[int]] = {}
+    for plcTag in plcTags:
+        identifier, index = nodeAddress(plcTag)
+        if index is None:
+            nodes.setdefault(identifier, 0)
+            continue
+        current = nodes.get(identifier)
+        nodes[identifier] = [0] * max(int(index) + 1, len(current) if isinstance(current, list) else 0)
+    return nodes
+
+def dropTags(plcTags : list[str], fraction : float, seed : int = 0) -> set[str]:
+    """`fraction` of the plcTags left out of a stand-in server, array elements are always served"""
+    candidates = [plcTag for plcTag in plcTags if nodeAddress(plcTag)[1] is None]
+    return set(random.Random(seed).sample(candidates, int(len(candidates) * fraction)))
+
+def addNodesItem(identifier : str, value : int | list[int], namespaceIndex : int) -> ua.AddNodesItem:
+    """Readable variable node `identifier`, without parent"""
+    variant = ua.Variant(value)
+    attributes = ua.VariableAttributes()
+    attributes.DisplayName = ua.LocalizedText(identifier)
+    attributes.Value = variant
+    attributes.DataType = ua.NodeId(variant.VariantType.value)
+    attributes.ValueRank = 1 if isinstance(value, list) else -1
+    attributes.AccessLevel = attributes.UserAccessLevel = ua.AccessLevel.CurrentRead.mask
+
+    item = ua.AddNodesItem()
+    item.RequestedNewNodeId = ua.NodeId(identifier, namespaceIndex, ua.NodeIdType.String)
+    item.BrowseName = ua.QualifiedName(identifier, namespaceIndex)
+    item.NodeClass = ua.NodeClass.Variable
+    item.TypeDefinition = ua.NodeId(ua.ObjectIds.BaseDataVariableType)
+    item.NodeAttributes = attributes
+    return item
+
+async def startServer(port : int, namespaceUri : str, nodes : dict[str, int | list[int]]) -> Server:
+    server = Server()
+    await server.init()
+    server.set_endpoint(f"opc.tcp://127.0.0.1:{port}")
+    namespaceIndex = await server.register_namespace(namespaceUri)
+    items = [addNodesItem(identifier, value, namespaceIndex) for identifier, value in nodes.items()]
+    for item in server.iserver.node_mgt_service.try_add_nodes(items, check=False):
+        print(f"Error node {item.RequestedNewNodeId.to_string()} not added")
+    await server.start()
+    return server
+
+class StandInServers:
+    """One stand-in server per {port : (namespaceUri, plcTags)}, started on enter and stopped on exit"""
+
+    def __init__(self, endpoints : dict[int, tuple[str, Iterable[str]]]) -> None:
+        self.endpoints = endpoints
+        self.servers : list[Server] = []
+
+    def __enter__(self) -> 'StandInServers':
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self.start(), self.loop).result()
+        return self
+
+    def __exit__(self, *exc_info):
+        asyncio.run_coroutine_threadsafe(self.stop(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    async def start(self):
+        self.servers = [await startServer(port, namespaceUri, standInNodes(plcTags))
+                            for port, (namespaceUri, plcTags) in self.endpoints.items()]
+
+    async def stop(self):
+        for server in self.servers:
+            await server.stop()
+
+def projectEndpoints(paths : ProjectPaths, missing : float = 0.0) -> (dict[int, tuple[str, list[str]]], set[str]):
+    """Stand-in endpoints of the OPC UA PLCs of a converted project, and the plcTags left out"""
+    references : list[TagReference] = []
+    modelViolations(paths.mainInformationModelFile, references)
+    endpoints : dict[int, tuple[str, list[str]]] = {}
+    dropped : set[str] = set()
+    for deviceName, settings in projectconfig.readPlcConfigFile(paths.plcConfigFile).items():
+        if settings.get('plcType') != 'OpcUa':
+            continue
+        deviceTags = list(dict.fromkeys(reference.plcTag for reference in references if reference.device == deviceName))
+        deviceDropped = dropTags(deviceTags, missing)
+        endpoints[settings.get('port', 4940)] = (settings['defaultNamespaceUri'], [plcTag for plcTag in deviceTags if plcTag not in deviceDropped])
+        dropped |= {f"{deviceName} {plcTag}" for plcTag in deviceDropped}
+    return endpoints, dropped
+
+def main():
+    argParser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argParser.add_argument('--project', default='.')
+    argParser.add_argument('--missing', type=float, default=0.0, help="fraction of the plcTags left out")
+    args = argParser.parse_args()
+
+    # asyncua logs every session and every unknown node
+    logging.basicConfig(level=logging.ERROR)
+    endpoints, dropped = projectEndpoints(ProjectPaths.fromRoot(args.project), missing=args.missing)
+    for tag in sorted(dropped):
+        print(f"left out {tag}")
+    with StandInServers(endpoints):
+        for port, (namespaceUri, plcTags) in endpoints.items():
+            print(f"opc.tcp://127.0.0.1:{port} {namespaceUri} : {len(plcTags)} plcTags", flush=True)
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+"""Synthetic plant generator used by the benchmarks.
+
+Writes a project folder laid out like the converter expects it:
+
+    <root>/InputFiles/<project>_<PLC>.xlsm
+    <root>/ConfigFIles/PlcTags.csv
+    <root>/BaseFiles/*.xml
+    <root>/OutputFiles/serverConfiguration/02_Application/...
+
+    python benchmarks/synthetic_plant.py /tmp/plant --plcs 2 --machines 2 --stations 10 --actuators 8 --alarms 500 --parameters 20
+
+With --parameters every station sheet gets a Pars block and every machine a `_MM` sheet with one.
+"""
+import argparse
+import os
+import random
+
+from openpyxl import Workbook
+
+ACTUATOR_TYPES = ['Act_Bin']
+
+PLC_TAGS = {
+    'actuator_node' : ('', '_{Machine_Number}_{Station_Number}_{Station_Name}.Act_{Actuator_Number}_{Actuator_Name}'),
+    'Station_PackMl_State' : ('Int32', '_{Machine_Number}_{Station_Number}_{Station_Name}.PackMl.Sts_State'),
+    'station_node' : ('', '_{Machine_Number}_{Station_Number}_{Station_Name}'),
+    'Machine_PackMl_State' : ('Int32', '_{Machine_Number}_Main.PackMl.Sts_State'),
+    'Machine_PackMl_Mode' : ('Int32', '_{Machine_Number}_Main.PackMl.Sts_Mode'),
+    'shift_register_Station_StationID' : ('Int64', 'M{Machine_Number}.GVLWPHsST{Station_Number}.Sts_StationID'),
+    'shift_register_Station_WPHID' : ('Int32', 'M{Machine_Number}.GVLWPHsST{Station_Number}[{Wph_Number}].Sts_MoverID'),
+    'shift_register_Loop_WPHID' : ('Int32', 'M{Machine_Number}.GVLWPHsLoop01[{Wph_Number}].Sts_MoverID'),
+    'Station_Parameter_Value' : ('Int32', '_{Machine_Number}_{Station_Number}_{Station_Name}.Pars.{Parameter_Name}'),
+    'Station_Parameter_Minimum' : ('Int32', '_{Machine_Number}_{Station_Number}_{Station_Name}.Pars.{Parameter_Name}_Min'),
+    'Station_Parameter_Maximum' : ('Int32', '_{Machine_Number}_{Station_Number}_{Station_Name}.Pars.{Parameter_Name}_Max'),
+    'Machine_Parameter_Value' : ('Int32', '_{Machine_Number}_Main.Pars.{Parameter_Name}'),
+    'Machine_Parameter_Minimum' : ('Int32', '_{Machine_Number}_Main.Pars.{Parameter_Name}_Min'),
+    'Machine_Parameter_Maximum' : ('Int32', '_{Machine_Number}_Main.Pars.{Parameter_Name}_Max'),
+}
+
+NEST_TAGS = {
+    'Sts_Bad' : ('Boolean', 'Sts_Bad'),
+    'Sts_Full' : ('Boolean', 'Sts_Full'),
+    'Sts_Good' : ('Boolean', 'Sts_Good'),
+    'Sts_Enable' : ('Boolean', 'Sts_Enable'),
+    'RejectCode' : ('Int32', 'Sts_SpecFailCode'),
+    'StationReject' : ('Int32', 'Sts_StationFailID'),
+}
+
+PLC_TYPES = ['Beckhoff', 'Siemens', 'OpcUa', 'Rockwell']
+
+MAIN_INFORMATION_MODEL_BASE = """<?xml version="1.0" encoding="utf-8"?>
+<InformationModel xmlns="http://www.ima.it/hmi/info-model" xmlns:da="http://www.ima.it/hmi/info-model/Automation" xmlns:t="http://www.ima.it/hmi/info-model/tags">
+    <TagsContainer/>
+    <da:Application name="Application"/>
+</InformationModel>
+"""
+
+ALARMS_BASE = """<?xml version="1.0" encoding="utf-8"?>
+<AlarmsContainer xmlns="http://www.ima.it/hmi/info-model" xmlns:da="http://www.ima.it/hmi/info-model/Automation"/>
+"""
+
+ALARMS_TRANSLATION_BASE = """<?xml version="1.0" encoding="utf-8"?>
+<Translations>
+    <Translation culture="en-US"/>
+</Translations>
+"""
+
+PROJECT_TAGS_BASE = """<?xml version="1.0" encoding="utf-8"?>
+<TagsContainer xmlns="http://www.ima.it/hmi/info-model" xmlns:t="http://www.ima.it/hmi/info-model/tags"/>
+"""
+
+def plcTagRows() -> dict[str, tuple[str, str]]:
+    rows = dict(PLC_TAGS)
+    for register, node in [('Station', 'M{Machine_Number}.GVLWPHsST{Station_Number}[{Wph_Number}]'),
+                           ('Loop', 'M{Machine_Number}.GVLWPHsLoop01[{Wph_Number}]')]:
+        for nestTag, (tagType, member) in NEST_TAGS.items():
+            rows[f'shift_register_{register}_Nest_{nestTag}'] = (tagType, f'{node}.Nest[{{Nest_Number}}].{member}')
+    return rows
+
+def writePlcTagsCsv(path : str):
+    with open(path, 'w', encoding='utf-8') as fh:
+        fh.write(';'.join(['Key'] + [f'{plcType} {column}' for plcType in PLC_TYPES for column in ['Type', 'Format']]) + '\n')
+        for key, (tagType, tagFormat) in plcTagRows().items():
+            fh.write(';'.join([key] + [value for _ in PLC_TYPES for value in [tagType, tagFormat]]) + '\n')
+
+def writeBaseFiles(folder : str):
+    os.makedirs(folder, exist_ok=True)
+    for fileName, content in [('MainInformationModelBase.xml', MAIN_INFORMATION_MODEL_BASE),
+                              ('Alarms.xml', ALARMS_BASE),
+                              ('en-US_Ima.Hmi.Module.Automation.Alarm.xml', ALARMS_TRANSLATION_BASE),
+                              ('ProjectTags.xml', PROJECT_TAGS_BASE)]:
+        with open(os.path.join(folder, fileName), 'w', encoding='utf-8') as fh:
+            fh.write(content)
+
+def parameterRows(parameters : int, rng : random.Random) -> list[list]:
+    rows = [[None],
+            ['Pars', 'Name', 'DataType', 'Minimum', 'Value', 'Maximum', 'Description']]
+    for parameter in range(1, parameters + 1):
+        dataType = rng.choice(['Int32', 'Real'])
+        rows.append([f'_{parameter:02d}', f'Par{parameter:02d}', dataType, 0, rng.randint(1, 100), 1000, f'Parameter {parameter}'])
+    rows.append(['Pars End'])
+    return rows
+
+def stationSheetRows(stationName : str, actuators : int, rng : random.Random, parameters : int = 0) -> list[list]:
+    rows = [['Station'],
+            ['NameL1', stationName],
+            ['NameL2', f'{stationName} description'],
+            [None],
+            ['Actuator', 'DataType', 'Name', 'Description']]
+    for actuator in range(1, actuators + 1):
+        rows.append([f'_{actuator:02d}', rng.choice(ACTUATOR_TYPES), f'Act{actuator:02d}', f'Actuator {actuator} of {stationName}'])
+    rows.append(['Actuator End'])
+    if parameters:
+        rows += parameterRows(parameters, rng)
+    return rows
+
+def writeWorkbook(path : str, machines : int, stations : int, actuators : int, alarms : int, seed : int = 0, parameters : int = 0):
+    """Write one <project>_<PLC>.xlsm with `_MM_SS` station sheets and an `_Alarms` sheet, `_MM` machine sheets with parameters."""
+    rng = random.Random(seed)
+    workbook = Workbook(write_only=True)
+
+    stationNames : list[tuple[int, int, str]] = []
+    for machine in range(1, machines + 1):
+        if parameters:
+            sheet = workbook.create_sheet(f'_{machine:02d}')
+            for row in parameterRows(parameters, rng):
+                sheet.append(row)
+        for station in range(1, stations + 1):
+            stationName = f'Station{machine:02d}{station:02d}'
+            stationNames.append((machine, station, stationName))
+            sheet = workbook.create_sheet(f'_{machine:02d}_{station:02d}')
+            for row in stationSheetRows(stationName, actuators, rng, parameters):
+                sheet.append(row)
+
+    sheet = workbook.create_sheet('_Alarms')
+    sheet.append(['Alarm name', 'Alm', 'Ack', 'en-US', 'Class'])
+    for alarm in range(alarms):
+        machine, station, stationName = stationNames[alarm % len(stationNames)]
+        word, bit = divmod(alarm // len(stationNames), 32)
+        sheet.append([f'Alarm_{alarm + 1}', f'_{machine:02d}_{station:02d}_Alms.L{word + 1}.{bit}',
+                      f'_{machine:02d}_{station:02d}_Alms.Ack', f'{stationName} alarm {alarm + 1}', 'Alarm'])
+
+    workbook.save(path)
+
+def makeSyntheticProject(root : str, plcs : int = 2, machines : int = 2, stations : int = 10, actuators : int = 8,
+                         alarms : int = 500, project : str = 'Synthetic', parameters : int = 0) -> str:
+    inputFolder = os.path.join(root, 'InputFiles')
+    configFolder = os.path.join(root, 'ConfigFIles')
+    os.makedirs(inputFolder, exist_ok=True)
+    os.makedirs(configFolder, exist_ok=True)
+    os.makedirs(os.path.join(root, 'OutputFiles', 'serverConfiguration', '02_Application', 'Data', 'Services'), exist_ok=True)
+    os.makedirs(os.path.join(root, 'OutputFiles', 'serverConfiguration', '02_Application', 'Translations'), exist_ok=True)
+
+    writePlcTagsCsv(os.path.join(configFolder, 'PlcTags.csv'))
+    writeBaseFiles(os.path.join(root, 'BaseFiles'))
+    for plc in range(1, plcs + 1):
+        writeWorkbook(os.path.join(inputFolder, f'{project}_PLC{plc}.xlsm'), machines=machines, stations=stations,
+                      actuators=actuators, alarms=alarms, seed=plc, parameters=parameters)
+    return root
+
+def registerPlcConfigs(parser, plcs : int):
+    """PLC_CONFIG entries for the synthetic PLCs the converter does not know about"""
+    for plc in range(1, plcs + 1):
+        parser.PLC_CONFIG.setdefault(f'PLC{plc}', parser.OpcuaConfig(address="127.0.0.1", defaultNamespaceUri=f"urn:Synthetic:PLC{plc}"))
+
+def main():
+    argParser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argParser.add_argument('root')
+    argParser.add_argument('--plcs', type=int, default=2)
+    argParser.add_argument('--machines', type=int, default=2)
+    argParser.add_argument('--stations', type=int, default=10)
+    argParser.add_argument('--actuators', type=int, default=8)
+    argParser.add_argument('--alarms', type=int, default=500)
+    argParser.add_argument('--parameters', type=int, default=0, help="parameters per station and per machine")
+    argParser.add_argument('--project', default='Synthetic')
+    args = argParser.parse_args()
+
+    makeSyntheticProject(args.root, plcs=args.plcs, machines=args.machines, stations=args.stations,
+                         actuators=args.actuators, alarms=args.alarms, project=args.project, parameters=args.parameters)
+    print(f"Synthetic project written to {args.root}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""
+    Content-hash build cache of the converter.
+
+    Entries are pickled values stored under the sha256 of everything they were built from, so a key can
+    never point to a stale value : a changed input simply gives a new key. The folder is kept under
+    maxBytes by evicting the least recently used entries.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import zipfile
+import xml.etree.ElementTree as ElementTree
+
+SPREADSHEET_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+RELATIONSHIPS_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PACKAGE_RELATIONSHIPS_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+def hashBytes(*parts : bytes | str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode('utf-8')
+        # length prefix, ('ab', 'c') and ('a', 'bc') must not collide
+        digest.update(len(part).to_bytes(8, 'little'))
+        digest.update(part)
+    return digest.hexdigest()
+
+def hashFile(path : str) -> str:
+    with open(path, 'rb') as fh:
+        return hashlib.sha256(fh.read()).hexdigest()
+
+def hashFolder(path : str) -> str:
+    """Hash of the relative names and contents of every file under `path`"""
+    parts : list[str] = []
+    for folder, _, files in sorted(os.walk(path)):
+        for file in sorted(files):
+            filepath = os.path.join(folder, file)
+            parts += [os.path.relpath(filepath, path), hashFile(filepath)]
+    return hashBytes(*parts)
+
+def sharedStrings(archive : zipfile.ZipFile) -> list[bytes]:
+    """Serialized items of the shared strings table, by index"""
+    if 'xl/sharedStrings.xml' not in archive.namelist():
+        return []
+    table = ElementTree.fromstring(archive.read('xl/sharedStrings.xml'))
+    return [ElementTree.tostring(item) for item in table.iter(f'{{{SPREADSHEET_NS}}}si')]
+
+def sheetHash(sheetXml : bytes, strings : list[bytes]) -> str:
+    """Hash of the sheet xml with its shared string cells resolved to their text"""
+    sheet = ElementTree.fromstring(sheetXml)
+    for cell in sheet.iter(f'{{{SPREADSHEET_NS}}}c'):
+        value = cell.find(f'{{{SPREADSHEET_NS}}}v')
+        if cell.get('t') == 's' and value is not None:
+            value.text = strings[int(value.text)].decode('utf-8')
+    return hashBytes(ElementTree.tostring(sheet))
+
+def workbookSheetHashes(filepath : str) -> dict[str, str]:
+    """
+        Hash of every sheet of an .xlsx/.xlsm, without loading it into frames. A sheet hash covers its own
+        xml with the shared strings it uses, a string added by another sheet leaves it unchanged.
+    """
+    with zipfile.ZipFile(filepath) as archive:
+        workbook = ElementTree.fromstring(archive.read('xl/workbook.xml'))
+        relationships = ElementTree.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+        strings = sharedStrings(archive)
+
+        targets : dict[str, str] = {}
+        for relationship in relationships.iter(f'{{{PACKAGE_RELATIONSHIPS_NS}}}Relationship'):
+            target = relationship.attrib['Target']
+            targets[relationship.attrib['Id']] = target.lstrip('/') if target.startswith('/') else f'xl/{target}'
+
+        hashes : dict[str, str] = {}
+        for sheet in workbook.iter(f'{{{SPREADSHEET_NS}}}sheet'):
+            member = targets[sheet.attrib[f'{{{RELATIONSHIPS_NS}}}id']]
+            hashes[sheet.attrib['name']] = sheetHash(archive.read(member), strings)
+        return hashes
+
+class CacheStatistics:
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.bytesWritten = 0
+
+    def merge(self, other : 'CacheStatistics'):
+        self.hits += other.hits
+        self.misses += other.misses
+        self.writes += other.writes
+        self.evictions += other.evictions
+        self.bytesWritten += other.bytesWritten
+
+    def __str__(self) -> str:
+        lookups = self.hits + self.misses
+        hitRate = 100 * self.hits / lookups if lookups else 0
+        return (f"Build cache : {self.hits} hits, {self.misses} misses ({hitRate:.0f}% hit rate), "
+                f"{self.writes} writes ({self.bytesWritten / 1e6:.1f} MB), {self.evictions} evictions")
+
+class BuildCache:
+
+    def __init__(self, folder : str, maxBytes : int = 512 * 1024 * 1024) -> None:
+        self.folder = folder
+        self.maxBytes = maxBytes
+        self.statistics = CacheStatistics()
+        os.makedirs(folder, exist_ok=True)
+        self.currentBytes = self.size()
+
+    def key(self, kind : str, *parts : bytes | str) -> str:
+        return hashBytes(kind, *parts)
+
+    def path(self, key : str) -> str:
+        return os.path.join(self.folder, key)
+
+    def get(self, key : str):
+        """Cached value of `key`, None when it is not cached"""
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as fh:
+                value = pickle.load(fh)
+        except Exception:
+            # missing, truncated, or pickled by other versions of pandas / lxml (AttributeError, ImportError, TypeError...)
+            self.statistics.misses += 1
+            return None
+        # the modification time orders entries for the LRU eviction
+        os.utime(path)
+        self.statistics.hits += 1
+        return value
+
+    def put(self, key : str, value):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        # write then rename, concurrent builds never read a partial entry
+        fd, tmpPath = tempfile.mkstemp(dir=self.folder, prefix='.tmp')
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(data)
+        os.replace(tmpPath, self.path(key))
+        self.statistics.writes += 1
+        self.statistics.bytesWritten += len(data)
+        self.currentBytes += len(data)
+        if self.currentBytes > self.maxBytes:
+            self.evict()
+
+    def size(self) -> int:
+        """Bytes of the entries, the temp files of interrupted writes are not entries"""
+        return sum(entry.stat().st_size for entry in os.scandir(self.folder) if entry.is_file() and not entry.name.startswith('.tmp'))
+
+    def evict(self):
+        """Remove the least recently used entries until the folder fits in maxBytes"""
+        entries = [(entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                    for entry in os.scandir(self.folder) if entry.is_file() and not entry.name.startswith('.tmp')]
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.maxBytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self.statistics.evictions += 1
+            total -= size
+        self.currentBytes = total
@@ -0,0 +1,204 @@
+"""
+    Command line entry point of the converter.
+
+        python cli.py --project D:/Projects/LineA
+        python cli.py --input-dir ./InputFiles --config-dir ./ConfigFIles --output-dir ./out --streaming
+        python cli.py --project D:/Projects/LineA --list-plcs
+        python cli.py --project D:/Projects/LineA --validate
+        python cli.py --project D:/Projects/LineA --verify-tags --verify-concurrency 16
+        python cli.py --project D:/Projects/LineA --find-tag _01_01_Station0101.Act_
+        python cli.py --project D:/Projects/LineA --watch
+        python cli.py --project D:/Projects/LineA --export-snapshot ./snapshot
+        python cli.py --project D:/Projects/LineA --from-snapshot ./snapshot
+        python cli.py --project D:/Projects/LineA --check
+        python cli.py --project D:/Projects/LineA --split machine
+        python cli.py --batch D:/Projects/projects.json --batch-workers 4
+
+    --list-plcs only reads the configuration files, pandas and lxml are imported by the conversion itself.
+    Outputs are only rewritten when their content changed, the changes are diffed by scope path into
+    OutputDiff.json. --check writes nothing and exits with 1 when an output would change.
+
+    Every conversion validates the generated model (duplicate scopeIds, plcTags and hmiIds, unsupported
+    actuators, unresolved alarms). --validate checks the configuration files, then builds and validates
+    the model without writing it and exits with 1 on any error. It costs a conversion without the writes :
+    every workbook is parsed, the sheets unchanged since the last run come from the build cache, and the
+    whole model is built. With --from-snapshot FOLDER the model is built from the snapshot frames instead.
+
+    --verify-tags reads every plcTag of the model on the OPC UA server of its PLC (asyncua is required) and
+    exits with 1 when one is missing or cannot be read. Found tags are cached in PlcTagCache.json.
+
+    Every conversion also writes TagIndex.sqlite, the elements of each plcTag and alarm AlarmInput.
+    --find-tag prints the elements of the tags starting with a prefix, from the index of the last conversion.
+
+    --batch converts every project of a manifest in one process, or --batch-workers processes, see batch.
+    It exits with 1 when a project failed, or when --check, --validate or --verify-tags would for one of them.
+"""
+import argparse
+import os
+import sys
+import time
+
+import projectconfig
+from projectconfig import ProjectPaths
+
+def projectPaths(args : argparse.Namespace) -> ProjectPaths:
+    defaults = ProjectPaths.fromRoot(args.project)
+    return ProjectPaths(inputFolder=args.input_dir or defaults.inputFolder,
+                        configFolder=args.config_dir or defaults.configFolder,
+                        baseFolder=args.base_dir or defaults.baseFolder,
+                        outputFolder=args.output_dir or defaults.outputFolder)
+
+def listPlcs(paths : ProjectPaths) -> int:
+    workbooks = paths.workbooks() if os.path.isdir(paths.inputFolder) else {}
+    plcConfig = projectconfig.readPlcConfigFile(paths.plcConfigFile)
+    for name in sorted(set(plcConfig) | set(workbooks)):
+        settings = plcConfig.get(name, {})
+        workbook = os.path.basename(workbooks[name]) if name in workbooks else '-'
+        print(f"{name:<12} {settings.get('plcType', '?'):<10} {settings.get('address', '-'):<18} {workbook}")
+    return 0
+
+def validate(paths : ProjectPaths) -> int:
+    errors = projectconfig.validateProject(paths)
+    for error in errors:
+        print(f"Error {error}")
+    print(f"{len(errors)} configuration error(s)" if errors else "Configuration OK")
+    return 1 if errors else 0
+
+def configureConverter(args : argparse.Namespace):
+    import parser
+
+    parser.STREAMING_OUTPUT = args.streaming
+    parser.PROFILE_MODE = args.profile
+    parser.RUN_REPORT = args.report
+    parser.BUILD_CACHE_FOLDER = None if args.no_cache else args.cache_dir
+    parser.DRY_RUN = args.check or args.validate
+    parser.VALIDATE_MODEL = args.validate or not args.no_validate
+    parser.TAG_INDEX = not args.no_tag_index
+    parser.VERIFY_TAGS = args.verify_tags
+    parser.VERIFY_CONCURRENCY = args.verify_concurrency
+    parser.VERIFY_BATCH_SIZE = args.verify_batch_size
+    parser.VERIFY_CACHE = not args.no_cache
+    parser.SPLIT_OUTPUT = args.split
+    parser.TAG_LIST_FILE = args.tag_list
+    if args.workers is not None:
+        parser.INGESTION_WORKERS = parser.GENERATION_WORKERS = args.workers
+
+def findTag(paths : ProjectPaths, prefix : str) -> int:
+    import tagindex
+
+    try:
+        index = tagindex.TagIndex(paths.tagIndexFile)
+    except FileNotFoundError as e:
+        print(f"Error {e}")
+        return 1
+    with index:
+        start = time.perf_counter()
+        entries = index.search(prefix)
+        milliseconds = (time.perf_counter() - start) * 1000
+    for entry in entries:
+        print(entry)
+    print(f"{len(entries)} elements for {prefix} ({milliseconds:.2f} ms)")
+    return 0 if entries else 1
+
+def convert(paths : ProjectPaths, args : argparse.Namespace) -> int:
+    import parser
+
+    parser.configureProject(paths)
+    configureConverter(args)
+    changes : dict[str, dict] = {}
+    if args.watch:
+        import watch
+        watch.watchProject(interval=args.interval)
+    elif args.export_snapshot:
+        import snapshot
+        frames = parser.excelConfigFilesToDataFrames(paths.inputFolder, workers=parser.INGESTION_WORKERS)
+        manifest = snapshot.writeSnapshot(args.export_snapshot, frames, paths.inputFolder)
+        rows = ', '.join(f"{name} {frame['rows']} rows" for name, frame in manifest['frames'].items())
+        print(f"Snapshot written to {args.export_snapshot} ({manifest['format']}, {rows})")
+    elif args.from_snapshot:
+        import snapshot
+        if os.path.isdir(paths.inputFolder):
+            for error in snapshot.snapshotErrors(args.from_snapshot, paths.inputFolder):
+                print(f"Warning snapshot {args.from_snapshot} is stale : {error}")
+        changes = parser.runConverter(frames=snapshot.readSnapshot(args.from_snapshot))
+    else:
+        changes = parser.runConverter()
+    if args.check and any(change['status'] != 'unchanged' for change in changes.values()):
+        return 1
+    if args.validate and parser.MODEL_VIOLATIONS:
+        return 1
+    if args.verify_tags and (parser.TAG_VERIFICATION is None or parser.TAG_VERIFICATION.missing or parser.TAG_VERIFICATION.errors):
+        return 1
+    return 0
+
+def convertBatch(args : argparse.Namespace) -> int:
+    import batch
+    import parser
+
+    projects = batch.readManifest(args.batch)
+    if args.validate and sum(validate(paths) for paths in projects.values()):
+        return 1
+    configureConverter(args)
+    start = time.perf_counter()
+    results = batch.runBatch(projects, {name : getattr(parser, name) for name in batch.CONVERTER_SETTINGS}, workers=args.batch_workers)
+    seconds = time.perf_counter() - start
+    print(batch.batchSummary(results, seconds))
+    batch.writeBatchReport(os.path.join(os.path.dirname(os.path.abspath(args.batch)), 'BatchReport.json'), results, seconds, args.batch_workers)
+    if any(result['status'] == 'failed' for result in results):
+        return 1
+    if args.check and any(result['outputsChanged'] for result in results):
+        return 1
+    if args.validate and any(result['violations'] for result in results):
+        return 1
+    if args.verify_tags and any(result.get('missingTags', 1) for result in results):
+        return 1
+    return 0
+
+def main(argv : list[str] = None) -> int:
+    argParser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argParser.add_argument('--project', default='.', help="project folder, default layout of the folders below")
+    argParser.add_argument('--input-dir', help="workbooks folder, <project>/InputFiles by default")
+    argParser.add_argument('--config-dir', help="PlcTags.csv and PlcConfig.json folder, <project>/ConfigFIles by default")
+    argParser.add_argument('--base-dir', help="template files folder, <project>/BaseFiles by default")
+    argParser.add_argument('--output-dir', help="generated files folder, <project>/OutputFiles by default")
+    argParser.add_argument('--batch', metavar='MANIFEST', help="convert every project of a JSON manifest, see batch")
+    argParser.add_argument('--batch-workers', type=int, default=1, help="processes converting the --batch projects")
+    argParser.add_argument('--list-plcs', action='store_true', help="list the configured PLCs and their workbooks")
+    argParser.add_argument('--validate', action='store_true', help="check the configuration, then build and validate the model without writing it "
+                                                                "(the cost of a conversion, see --from-snapshot)")
+    argParser.add_argument('--no-validate', action='store_true', help="do not validate the generated model")
+    argParser.add_argument('--find-tag', metavar='PREFIX', help="print the elements of the plcTags and AlarmInputs starting with PREFIX")
+    argParser.add_argument('--no-tag-index', action='store_true', help="do not write the plcTag index TagIndex.sqlite")
+    argParser.add_argument('--verify-tags', action='store_true', help="read every plcTag of the model on the OPC UA server of its PLC, exit code 1 when one is missing")
+    argParser.add_argument('--verify-concurrency', type=int, default=8, help="Read requests in flight during --verify-tags")
+    argParser.add_argument('--verify-batch-size', type=int, default=500, help="nodes per Read request during --verify-tags")
+    argParser.add_argument('--watch', action='store_true', help="stay resident and regenerate the outputs when a workbook is saved")
+    argParser.add_argument('--interval', type=float, default=1.0, help="watch mode polling interval in seconds")
+    argParser.add_argument('--export-snapshot', metavar='FOLDER', help="parse the workbooks and write the frames snapshot, without converting")
+    argParser.add_argument('--from-snapshot', metavar='FOLDER', help="convert from a frames snapshot instead of the workbooks")
+    argParser.add_argument('--check', action='store_true', help="build and diff the outputs without writing them, exit code 1 when one would change")
+    argParser.add_argument('--split', choices=['device', 'machine'], help="write each PLC, or each machine, to an include file of MainInformationModel.xml")
+    argParser.add_argument('--tag-list', metavar='FILE', help="also write every PLC tag of the model to a CSV file, or Parquet with a .parquet name")
+    argParser.add_argument('--streaming', action='store_true', help="write MainInformationModel.xml subtree by subtree")
+    argParser.add_argument('--workers', type=int, help="ingestion and generation processes, the CPU count by default")
+    argParser.add_argument('--cache-dir', default='./.buildcache', help="build cache folder")
+    argParser.add_argument('--no-cache', action='store_true', help="disable the build cache and the verified plcTags cache")
+    argParser.add_argument('--report', action='store_true', help="write the stage timers and counters to RunReport.json")
+    argParser.add_argument('--profile', choices=['cprofile', 'pyinstrument'], help="profile the conversion")
+    args = argParser.parse_args(argv)
+    if args.batch and (args.watch or args.export_snapshot or args.from_snapshot or args.list_plcs or args.find_tag):
+        argParser.error("--batch cannot be combined with --watch, --export-snapshot, --from-snapshot, --list-plcs or --find-tag")
+
+    if args.batch:
+        return convertBatch(args)
+    paths = projectPaths(args)
+    if args.list_plcs:
+        return listPlcs(paths)
+    if args.find_tag:
+        return findTag(paths, args.find_tag)
+    if args.validate and validate(paths):
+        return 1
+    return convert(paths, args)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+    Deterministic hmiId allocation.
+
+    An element hmiId is derived from its scope path (the scopeId, or name, of the element and of its
+    ancestors under da:Application, e.g. PLC1/M01/ST01/ShiftRegisterST01/WPH_3/2) so regenerating the same
+    model gives the same ids. Collisions are resolved by probing the next free id, uniqueness is checked
+    against the set of ids already handed out. An id map saved from a previous run keeps the ids of the
+    elements that still exist, even when new elements would have collided with them.
+
+    Ids are in [HMI_ID_MIN, HMI_ID_MAX) = [100000, 2^31-1), six to ten digits where the former random ids
+    had five (10000-99999) : a consumer of the HMI model that stores hmiIds on five digits or in 16 bits
+    must be widened. The range is large enough for probing to stay rare on plant-scale models.
+"""
+import hashlib
+import json
+import os
+
+from lxml import etree
+
+DA_NAMESPACE = "http://www.ima.it/hmi/info-model/Automation"
+
+HMI_ID_MIN = 100000
+HMI_ID_MAX = 2**31 - 1
+
+def scopeSegment(element : etree.Element) -> str:
+    return element.get('scopeId') or element.get('name') or etree.QName(element).localname
+
+class HmiIdAllocator:
+
+    def __init__(self, idMap : dict[str, int] = None) -> None:
+        self.previous : dict[str, int] = dict(idMap or {})
+        # ids of the previous map stay reserved for their path, new elements never take them
+        self.reserved : dict[int, str] = {hmiId : path for path, hmiId in self.previous.items()}
+        self.used : set[int] = set()
+        self.assigned : dict[str, int] = {}
+
+    def hashedId(self, path : str) -> int:
+        digest = hashlib.blake2b(path.encode('utf-8'), digest_size=8).digest()
+        return HMI_ID_MIN + int.from_bytes(digest, 'little') % (HMI_ID_MAX - HMI_ID_MIN)
+
+    def allocate(self, path : str) -> int:
+        # a path seen twice (siblings with the same scopeId) gets an occurrence suffix
+        key = path
+        occurrence = 1
+        while key in self.assigned:
+            occurrence += 1
+            key = f"{path}#{occurrence}"
+
+        hmiId = self.previous.get(key)
+        if hmiId is None or hmiId in self.used:
+            hmiId = self.hashedId(key)
+            while hmiId in self.used or self.reserved.get(hmiId, key) != key:
+                hmiId = hmiId + 1 if hmiId < HMI_ID_MAX else HMI_ID_MIN
+
+        self.used.add(hmiId)
+        self.assigned[key] = hmiId
+        return hmiId
+
+    def save(self, path : str):
+        with open(path, 'w', encoding='utf-8') as fh:
+            json.dump(self.assigned, fh, indent=0, sort_keys=True)
+
+def loadHmiIdAllocator(path : str = None) -> HmiIdAllocator:
+    """Allocator seeded with the id map saved at `path`, if there is one"""
+    if path is None or not os.path.exists(path):
+        return HmiIdAllocator()
+    with open(path, encoding='utf-8') as fh:
+        return HmiIdAllocator(json.load(fh))
+
+def assignHmiIds(element : etree.Element, allocator : HmiIdAllocator, parentPath : str = ''):
+    """Set the hmiId of every da element of the subtree, in document order"""
+    stack = [(element, parentPath)]
+    while stack:
+        node, parent = stack.pop()
+        path = f"{parent}/{scopeSegment(node)}" if parent else scopeSegment(node)
+        if node.tag.startswith(f"{{{DA_NAMESPACE}}}"):
+            node.attrib['hmiId'] = str(allocator.allocate(path))
+        stack.extend((child, path) for child in reversed(node) if isinstance(child.tag, str))
@@ -0,0 +1,166 @@
+"""
+    Stage timers and counters of the converter.
+
+    Functions decorated with @timed('stage') add their wall time and call count to the stage, count(...)
+    increments a named counter (tags resolved, cache hits, bytes written...). Nothing is recorded while
+    INSTRUMENTATION.enabled is False, which is the default. Stages run in worker processes are not recorded,
+    profile with one worker for the complete picture. Stages and counters can be recorded from threads, the
+    time of a stage run by several threads at once is the sum of their times.
+
+    profiled() wraps a run in cProfile, or pyinstrument when it is installed.
+"""
+import cProfile
+import functools
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows, peak RSS is then not reported
+    resource = None
+
+try:
+    import pyinstrument
+except ImportError:
+    pyinstrument = None
+
+def maxRssBytes() -> int:
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    maxRss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxRss if sys.platform == 'darwin' else maxRss * 1024
+
+class StageStatistics:
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0
+        self.peakRssGrowthBytes = None
+        self.processPeakRssBytes = None
+
+    def toDict(self) -> dict:
+        return {'calls' : self.calls, 'seconds' : round(self.seconds, 6),
+                'peakRssGrowthBytes' : self.peakRssGrowthBytes, 'processPeakRssBytes' : self.processPeakRssBytes}
+
+class Instrumentation:
+
+    def __init__(self, enabled : bool = False) -> None:
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.stages : dict[str, StageStatistics] = {}
+        self.counters : Counter = Counter()
+        self.start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name : str):
+        if not self.enabled:
+            yield
+            return
+        startRss = maxRssBytes()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            # ru_maxrss only grows: the growth is how far the stage raised the process peak, 0 when it stayed
+            # below an earlier peak, the process peak is the peak so far when the stage ended
+            endRss = maxRssBytes()
+            with self.lock:
+                statistics = self.stages.get(name)
+                if statistics is None:
+                    statistics = self.stages[name] = StageStatistics()
+                statistics.calls += 1
+                statistics.seconds += time.perf_counter() - start
+                if endRss is not None:
+                    statistics.peakRssGrowthBytes = max(statistics.peakRssGrowthBytes or 0, endRss - startRss)
+                    statistics.processPeakRssBytes = endRss
+
+    def count(self, name : str, value : int = 1):
+        """Add `value` to the counter, hot loops keep their own count and add it once"""
+        if self.enabled:
+            with self.lock:
+                self.counters[name] += value
+
+    def report(self, **extra) -> dict:
+        """Machine readable run report, stages sorted by decreasing time"""
+        stages = sorted(self.stages.items(), key=lambda item: item[1].seconds, reverse=True)
+        return {'seconds' : round(time.perf_counter() - self.start, 6),
+                'maxRssBytes' : maxRssBytes(),
+                'stages' : {name : statistics.toDict() for name, statistics in stages},
+                'counters' : dict(sorted(self.counters.items())),
+                **extra}
+
+    def writeReport(self, path : str, **extra):
+        with open(path, 'w', encoding='utf-8') as fh:
+            json.dump(self.report(**extra), fh, indent=4)
+
+    def summary(self, limit : int = 15) -> str:
+        lines = [f"{name:<45} {statistics.calls:>7} calls {statistics.seconds:9.3f} s"
+                 + (f" {statistics.peakRssGrowthBytes / 1e6:+9.1f} MB peak RSS" if statistics.peakRssGrowthBytes is not None else "")
+                    for name, statistics in sorted(self.stages.items(), key=lambda item: item[1].seconds, reverse=True)[:limit]]
+        lines += [f"{name:<45} {value:>13}" for name, value in sorted(self.counters.items())]
+        return '\n'.join(lines)
+
+INSTRUMENTATION = Instrumentation()
+
+def stage(name : str):
+    return INSTRUMENTATION.stage(name)
+
+def count(name : str, value : int = 1):
+    INSTRUMENTATION.count(name, value)
+
+def timed(name : str = None):
+    """Record the calls of the decorated function under the stage `name`, its own name by default"""
+    def decorator(function):
+        stageName = name or function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not INSTRUMENTATION.enabled:
+                return function(*args, **kwargs)
+            with INSTRUMENTATION.stage(stageName):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+@contextmanager
+def profiled(mode : str, path : str):
+    """
+        Profile the block with mode 'cprofile' (pstats file `path`.prof) or 'pyinstrument' (`path`.html),
+        None runs it unprofiled.
+    """
+    if mode is None:
+        yield
+        return
+
+    if mode == 'pyinstrument':
+        if pyinstrument is None:
+            print("Error pyinstrument is not installed, profiling with cProfile")
+        else:
+            profiler = pyinstrument.Profiler()
+            profiler.start()
+            try:
+                yield
+            finally:
+                profiler.stop()
+                with open(f"{path}.html", 'w', encoding='utf-8') as fh:
+                    fh.write(profiler.output_html())
+            return
+    elif mode != 'cprofile':
+        print(f"Error profile mode {mode} is not supported, profiling with cProfile")
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(f"{path}.prof")
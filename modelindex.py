@@ -0,0 +1,84 @@
+"""
+    Hierarchical index of the information model frame.
+
+    The AutomationDevice -> Machine -> Station -> Actuator hierarchy the builders walk is made once from
+    the frame, in the order and with the groups the nested groupby calls gave : keys sorted (categories in
+    category order), rows with a missing key left out of that level, (Actuator, ActuatorName) groups
+    for the actuators. The frame is sorted once and every row is visited once, no group DataFrame is made.
+
+    Each node keeps the first row of its group in frame order, the row the builders read, and the hash of
+    its rows, equal to hashFrame of the group, for the build cache keys.
+"""
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from buildcache import hashBytes
+
+class ModelRow(NamedTuple):
+    """One row of the information model frame"""
+    AutomationDevice : str
+    Machine : str
+    Station : str
+    StationName : str
+    Actuator : str
+    ActuatorType : str
+    ActuatorName : str
+
+# group keys of each level, from the AutomationDevice down to the actuators
+MODEL_LEVELS = [['AutomationDevice'], ['Machine'], ['Station'], ['Actuator', 'ActuatorName']]
+
+class ModelNode:
+    """An AutomationDevice, Machine, Station or Actuator group, its children in groupby order"""
+    __slots__ = ('key', 'row', 'rowsHash', 'children')
+
+    def __init__(self, key, row : ModelRow = None, rowsHash : str = None) -> None:
+        self.key = key
+        self.row = row
+        self.rowsHash = rowsHash
+        self.children : list[ModelNode] = []
+
+    def __repr__(self) -> str:
+        return f"ModelNode({self.key!r}, {len(self.children)} children)"
+
+def isMissing(value) -> bool:
+    return value is None or value != value
+
+def modelIndex(dfinformationModel : pd.DataFrame) -> list['ModelNode']:
+    """The AutomationDevice nodes of the frame"""
+    columns = [column for level in MODEL_LEVELS for column in level]
+    order : np.ndarray = dfinformationModel.reset_index(drop=True).sort_values(columns, kind='stable', na_position='last').index.to_numpy()
+    keyColumns = [dfinformationModel[column].astype(object).to_numpy()[order] for column in columns]
+
+    devices : list[ModelNode] = []
+    nodeRows : dict[int, list[int]] = {}
+    nodes : list[ModelNode] = []
+    path : list[ModelNode] = [None] * len(MODEL_LEVELS)
+    for position, *values in zip(order, *keyColumns):
+        keys = [values[0], values[1], values[2], (values[3], values[4])]
+        newParent = False
+        for level, key in enumerate(keys):
+            if any(isMissing(value) for value in (key if level == 3 else (key,))):
+                path[level:] = [None] * (len(MODEL_LEVELS) - level)
+                break
+            node : ModelNode = path[level]
+            if newParent or node is None or node.key != key:
+                node = ModelNode(key)
+                (devices if level == 0 else path[level-1].children).append(node)
+                nodes.append(node)
+                nodeRows[id(node)] = []
+                path[level] = node
+                path[level+1:] = [None] * (len(MODEL_LEVELS) - level - 1)
+                newParent = True
+            nodeRows[id(node)].append(position)
+
+    rows : list[ModelRow] = [ModelRow._make(values) for values in
+                                zip(*(dfinformationModel[field].astype(object).to_numpy() for field in ModelRow._fields))]
+    rowHashes : np.ndarray = pd.util.hash_pandas_object(dfinformationModel, index=False).to_numpy()
+    columnsKey = repr(list(dfinformationModel.columns))
+    for node in nodes:
+        positions : np.ndarray = np.sort(np.asarray(nodeRows[id(node)]))
+        node.row = rows[positions[0]]
+        node.rowsHash = hashBytes(columnsKey, rowHashes[positions].tobytes())
+    return devices
@@ -0,0 +1,80 @@
+"""
+    Structural diff of two versions of an output file.
+
+    Every element is keyed by its scope path, the scopeId (else name, textId, Include file or local name)
+    of the element and of its ancestors, e.g. InformationModel/Application/PLC1/M01/ST01/Act_01_Act01/Sts_Inp.
+    Siblings with the same key get an occurrence suffix (#2, #3...). An element is changed when its tag,
+    attributes or text changed, a change below it is reported on the descendant only.
+
+    Both files are read with iterparse into one {path : signature} dict each and compared with set
+    operations, time and memory are linear in the element count.
+"""
+import hashlib
+
+from lxml import etree
+
+def diffSegment(element : etree.Element) -> str:
+    return element.get('scopeId') or element.get('name') or element.get('textId') or element.get('file') or etree.QName(element).localname
+
+def scopeSignatures(source) -> dict[str, str]:
+    """{scope path : hash of tag, attributes and text} of every element of an XML file or file object"""
+    signatures : dict[str, str] = {}
+    stack : list[tuple[str, dict[str, int]]] = []
+    for event, element in etree.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            parentPath, siblings = stack[-1] if stack else ('', {})
+            segment = diffSegment(element)
+            siblings[segment] = siblings.get(segment, 0) + 1
+            if siblings[segment] > 1:
+                segment = f"{segment}#{siblings[segment]}"
+            path = f"{parentPath}/{segment}" if parentPath else segment
+            stack.append((path, {}))
+            continue
+
+        path, _ = stack.pop()
+        digest = hashlib.blake2b(element.tag.encode('utf-8'), digest_size=16)
+        for name, value in sorted(element.attrib.items()):
+            digest.update(f"\x00{name}\x01{value}".encode('utf-8'))
+        digest.update(f"\x02{(element.text or '').strip()}".encode('utf-8'))
+        signatures[path] = digest.hexdigest()
+        # the element is hashed, its content and the previous siblings are not needed anymore
+        element.clear(keep_tail=True)
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+    return signatures
+
+def topmost(paths : set[str]) -> list[str]:
+    """Paths whose parent is not in `paths`, an added or removed subtree is reported once"""
+    return sorted(path for path in paths if path.rpartition('/')[0] not in paths)
+
+class OutputDiff:
+
+    def __init__(self, old : dict[str, str], new : dict[str, str]) -> None:
+        self.addedElements = new.keys() - old.keys()
+        self.removedElements = old.keys() - new.keys()
+        self.changed = sorted(path for path in new.keys() & old.keys() if new[path] != old[path])
+        self.added = topmost(self.addedElements)
+        self.removed = topmost(self.removedElements)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def counts(self) -> dict[str, int]:
+        return {'added' : len(self.addedElements), 'removed' : len(self.removedElements), 'changed' : len(self.changed)}
+
+    def toDict(self) -> dict:
+        return {**self.counts(), 'addedPaths' : self.added, 'removedPaths' : self.removed, 'changedPaths' : self.changed}
+
+    def summary(self, limit : int = 10) -> str:
+        if not self:
+            return "formatting only, no element changed"
+        lines = [f"{len(self.addedElements)} added, {len(self.removedElements)} removed, {len(self.changed)} changed elements"]
+        for label, paths in [('+', self.added), ('-', self.removed), ('~', self.changed)]:
+            lines += [f"    {label} {path}" for path in paths[:limit]]
+            if len(paths) > limit:
+                lines.append(f"    {label} ... {len(paths) - limit} more")
+        return '\n'.join(lines)
+
+def diffXml(oldSource, newSource) -> OutputDiff:
+    """Diff of two XML files (paths or file objects)"""
+    return OutputDiff(scopeSignatures(oldSource), scopeSignatures(newSource))
@@ -1,12 +1,119 @@
+import hashlib
+import json
 import os
-import random
 import re
+import string
+import sys
 import pandas as pd
-from io import BytesIO
 from lxml import etree
 from enum import Enum
-
-CONFIG_FILE_FOLDER = './InputFiles'
+from copy import deepcopy
+from collections import Counter
+from importlib import metadata
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import functools
+from typing import Callable, Iterable, NamedTuple
+
+import buildcache
+import modelindex
+from buildcache import BuildCache, CacheStatistics, hashBytes, hashFile, hashFolder, workbookSheetHashes
+from hmiids import HmiIdAllocator, assignHmiIds, loadHmiIdAllocator, scopeSegment
+from instrumentation import INSTRUMENTATION, count, profiled, stage, timed
+from modelindex import ModelNode, ModelRow, modelIndex
+from outputdiff import OutputDiff, diffXml
+from tagverify import TAG_CACHE_MAX_AGE, TagVerification, TagVerifier, loadTagCache
+from tagindex import TagEntry, writeTagIndex
+from validation import ModelWalk, OpenElement, TagReference, Violation
+import projectconfig
+from projectconfig import ProjectPaths
+
+# folders of the converted project, every input and output path derives from them, see configureProject
+PROJECT : ProjectPaths = ProjectPaths()
+
+# keep the scope path -> hmiId map of the last generation in PROJECT.hmiIdMapFile, False starts from scratch
+PERSIST_HMI_IDS = True
+
+# outputs are only replaced when their content changed, the previous version is diffed by scope path
+OUTPUT_DIFF = True
+# build the outputs and diff them without writing any file
+DRY_RUN = False
+# output path -> status ('created', 'changed', 'unchanged') and diff counts of the last run
+OUTPUT_CHANGES : dict[str, dict] = {}
+OUTPUT_DIFFS : dict[str, OutputDiff] = {}
+
+# MainInformationModel.xml split into include files : None, 'device' (one file per da:AutomationDevice) or
+# 'machine' (one more file per da:Machine), see writeMainInformationModel
+SPLIT_OUTPUT : str = None
+# include files folder, relative to the Data folder like the Include file attribute
+INCLUDE_FOLDER = 'AutomationDevices'
+# threads writing the include files
+OUTPUT_WORKERS = os.cpu_count() or 1
+
+# check the generated model for duplicate scopeIds, plcTags and hmiIds and the rows it leaves out, see validateModel
+VALIDATE_MODEL = True
+# violations found by the last validateModel
+MODEL_VIOLATIONS : list[Violation] = []
+# elements with a plcTag of the last walked model, see walkModel
+MODEL_TAG_REFERENCES : list[TagReference] = []
+
+# write the plcTag and AlarmInput -> element index of the model to PROJECT.tagIndexFile, see tagindex
+TAG_INDEX = True
+
+# read the plcTags of the model on the OPC UA server of each PLC, see verifyPlcTags
+VERIFY_TAGS = False
+# Read requests in flight over all the PLCs, nodes per request, connection and request timeout in seconds
+VERIFY_CONCURRENCY = 8
+VERIFY_BATCH_SIZE = 500
+VERIFY_TIMEOUT = 5.0
+# keep the tags found on each PLC in PROJECT.tagCacheFile, they are read again after TAG_CACHE_MAX_AGE seconds
+VERIFY_CACHE = True
+# result of the last verifyPlcTags
+TAG_VERIFICATION : TagVerification = None
+
+# write the tag list of every PLC tag of the model, shift registers included, to this CSV or .parquet file
+TAG_LIST_FILE : str = None
+
+# write MainInformationModel.xml station by station instead of building the whole tree in memory
+STREAMING_OUTPUT = False
+
+# parsed sheets and generated station fragments are cached by content hash, None disables the cache
+BUILD_CACHE_FOLDER = './.buildcache'
+BUILD_CACHE_MAX_BYTES = 512 * 1024 * 1024
+BUILD_CACHE : BuildCache = None
+# station and loop subtrees of the previous build kept in memory by the watch mode, None disables it
+SUBTREE_MEMO : 'SubtreeMemo' = None
+
+# modules and packages whose code shapes the cached values, part of every cache key, see sourceFingerprint
+CACHE_SOURCE_MODULES = [sys.modules[__name__], buildcache, modelindex]
+CACHE_PACKAGES = ['pandas', 'numpy', 'openpyxl', 'lxml']
+
+# number of processes used to parse the workbooks, 1 parses them one after the other
+INGESTION_WORKERS = os.cpu_count() or 1
+
+# WPH of the station and loop shift registers, each WPH holds SHIFT_REGISTER_NEST_COUNT nests
+STATION_WPH_COUNT = 2
+LOOP_WPH_COUNT = 160
+SHIFT_REGISTER_NEST_COUNT = 4
+
+# stage timers and counters of the run, written to PROJECT.runReportFile when RUN_REPORT is True
+RUN_REPORT = False
+# 'cprofile' or 'pyinstrument' profile of the whole run, written to PROJECT.profileFile .prof / .html
+PROFILE_MODE = None
+
+# number of processes used to build the AutomationDevice (or Machine) subtrees, 1 builds them in-process
+GENERATION_WORKERS = os.cpu_count() or 1
+# settings of this module a generation worker gets from the parent, a spawned worker imports the module afresh
+GENERATION_WORKER_SETTINGS = ['STATION_WPH_COUNT', 'LOOP_WPH_COUNT', 'SHIFT_REGISTER_NEST_COUNT', 'BUILD_CACHE_FOLDER', 'BUILD_CACHE_MAX_BYTES',
+                              'RUN_REPORT', 'VALIDATE_MODEL']
+
+# column dtypes of the frames returned by excelConfigFilesToDataFrames, the repeated keys are categoricals
+INFORMATION_MODEL_DTYPES = {'AutomationDevice' : 'category', 'Machine' : 'category', 'Station' : 'category', 'StationName' : 'object',
+                            'Actuator' : 'object', 'ActuatorType' : 'category', 'ActuatorName' : 'object'}
+ALARMS_DTYPES = {'AutomationDevice' : 'category', 'AlarmName' : 'object', 'AlarmInput' : 'object', 'AlarmAcknowledge' : 'object',
+                 'AlarmMessage' : 'object'}
+PARAMETERS_DTYPES = {'AutomationDevice' : 'category', 'Machine' : 'category', 'Station' : 'category', 'Actuator' : 'object',
+                     'ParameterName' : 'object', 'DataType' : 'object', 'Minimum' : 'object', 'Maximum' : 'object'}
 
 NAMESPACES = {'t':"http://www.ima.it/hmi/info-model/tags",
                 'da':"http://www.ima.it/hmi/info-model/Automation",
@@ -18,26 +125,124 @@ class PlcType(Enum):
     OPCUA = 'OpcUa'
     ROCKWELL = 'Rockwell'
 
-PLCTAG_DATAFRAME : pd.DataFrame = pd.read_csv('./ConfigFIles/PlcTags.csv', sep=';', header=0,index_col=0)
+# PlcTags.csv frames by content hash, shared by the projects converted in one process
+PLC_TAG_FRAMES : dict[str, pd.DataFrame] = {}
+
+@functools.cache
+def plcTagsHash() -> str:
+    """Hash of PlcTags.csv of the project, the tag resolvers and WPH templates are shared by equal files"""
+    return hashFile(PROJECT.plcTagsFile)
+
+def plcTagDataFrame() -> pd.DataFrame:
+    """PlcTags.csv of the project, read on first use"""
+    if plcTagsHash() not in PLC_TAG_FRAMES:
+        count('PlcTags files parsed')
+        PLC_TAG_FRAMES[plcTagsHash()] = pd.read_csv(PROJECT.plcTagsFile, sep=';', header=0,index_col=0)
+    return PLC_TAG_FRAMES[plcTagsHash()]
+
+class TagRow(NamedTuple):
+    """Information model values available to the PlcTags.csv formats"""
+    Machine : str
+    Station : str = None
+    StationName : str = None
+    Actuator : str = None
+    ActuatorName : str = None
+    ParameterName : str = None
+
+def tagRowFrom(row) -> TagRow:
+    """TagRow from a pd.Series, an itertuples() row or a plain tuple"""
+    if isinstance(row, TagRow):
+        return row
+    if isinstance(row, pd.Series):
+        return TagRow(*(row.get(field) for field in TagRow._fields))
+    if hasattr(row, 'Machine'):
+        return TagRow(*(getattr(row, field, None) for field in TagRow._fields))
+    return TagRow(*row)
+
+class TagResolver:
+    """Tag types and address formats of one PlcType, compiled once from PlcTags.csv"""
+
+    def __init__(self, plcType : PlcType, dfPlcTags : pd.DataFrame) -> None:
+        self.plcType = plcType
+        self.templates : dict[str, tuple[str, Callable[..., str]]] = {
+            key : (tagType, tagFormat.format) for key, tagType, tagFormat in
+                zip(dfPlcTags.index, dfPlcTags[f'{plcType.value} Type'], dfPlcTags[f'{plcType.value} Format'])}
+        self.formats : dict[str, list[tuple[str, str, str, str]]] = {
+            key : list(string.Formatter().parse(tagFormat)) for key, tagFormat in zip(dfPlcTags.index, dfPlcTags[f'{plcType.value} Format'])}
+        # plain attribute counts, added to the run counters by flushTagCounts
+        self.tagsResolved = 0
+        self.getTagCalls = 0
+
+    def resolve(self, key : str, row : TagRow, wphNumber : int = None, nestNumber : int = None) -> tuple[str,str]:
+        self.tagsResolved += 1
+        tagType, formatter = self.templates[key]
+        return tagType, formatter(
+            Machine_Number = row.Machine,
+            Station_Number = row.Station,
+            Station_Name = row.StationName,
+            Actuator_Number = row.Actuator,
+            Actuator_Name = row.ActuatorName,
+            Parameter_Name = row.ParameterName,
+            Wph_Number = wphNumber,
+            Nest_Number = nestNumber
+            )
+
+    def resolveMany(self, requests : Iterable[tuple[str, TagRow, int, int]]) -> list[tuple[str,str]]:
+        """Resolve a batch of (key, row, wphNumber, nestNumber) requests, in order"""
+        resolve = self.resolve
+        return [resolve(key, row, wphNumber, nestNumber) for key, row, wphNumber, nestNumber in requests]
+
+    def resolveColumns(self, key : str, fields : pd.DataFrame) -> tuple[str, pd.Series]:
+        """
+            Type and addresses of `key` for every row of `fields`, whose columns are the format fields
+            (Machine_Number, Station_Name...). Plain fields are concatenated column-wise, a format with a
+            conversion, a format spec or a field that is not a plain name ({0}, {Station.Name}, {Nest[1]})
+            falls back to str.format row by row.
+        """
+        self.tagsResolved += len(fields)
+        tagType, formatter = self.templates[key]
+        parts = self.formats[key]
+        if any(conversion or spec or not field.isidentifier() for _, field, spec, conversion in parts if field is not None):
+            return tagType, pd.Series([formatter(**row) for row in fields.to_dict('records')], index=fields.index, dtype=object)
+
+        addresses = pd.Series('', index=fields.index, dtype=object)
+        for literal, field, _, _ in parts:
+            addresses = addresses + literal
+            if field is not None:
+                # str of each value like str.format, astype(str) would keep None and NaN missing
+                addresses = addresses + fields[field].map(str)
+        return tagType, addresses
+
+# compiled resolvers by PlcType and PlcTags.csv hash
+TAG_RESOLVERS : dict[tuple[PlcType, str], TagResolver] = {}
+
+def getTagResolver(plcType : PlcType) -> TagResolver:
+    resolverKey = (plcType, plcTagsHash())
+    if resolverKey not in TAG_RESOLVERS:
+        count('tag resolvers compiled')
+        TAG_RESOLVERS[resolverKey] = TagResolver(plcType, plcTagDataFrame())
+    return TAG_RESOLVERS[resolverKey]
+
+def flushTagCounts():
+    """Add the tag resolver counts to the run counters and restart them from 0"""
+    for resolver in TAG_RESOLVERS.values():
+        count('tags resolved', resolver.tagsResolved)
+        count('get_tag calls', resolver.getTagCalls)
+        resolver.tagsResolved = resolver.getTagCalls = 0
 
 class PlcConfig:
     def __init__(self, plcType : PlcType, address : str) -> None:
         self.plcType = plcType
         self.address = address
 
-    def get_tag(self, key : str, dfInformationModelRow : pd.Series, wphNumber : int = None, nestNumber : int = None) -> tuple[str,str]:
-        
-        tagData  = PLCTAG_DATAFRAME.loc[key]
-        stringFormater : str = tagData[f'{self.plcType.value} Format']
-        return tagData[f'{self.plcType.value} Type'] , stringFormater.format(
-            Machine_Number = dfInformationModelRow['Machine'],
-            Station_Number = dfInformationModelRow['Station'],
-            Station_Name = dfInformationModelRow['StationName'],
-            Actuator_Number = dfInformationModelRow['Actuator'],
-            Actuator_Name = dfInformationModelRow['ActuatorName'],
-            Wph_Number = wphNumber,
-            Nest_Number = nestNumber
-            )
+    @property
+    def tagResolver(self) -> TagResolver:
+        return getTagResolver(self.plcType)
+
+    def get_tag(self, key : str, dfInformationModelRow : pd.Series | TagRow, wphNumber : int = None, nestNumber : int = None) -> tuple[str,str]:
+        tagResolver = self.tagResolver
+        tagResolver.getTagCalls += 1
+        return tagResolver.resolve(key, tagRowFrom(dfInformationModelRow), wphNumber, nestNumber)
 
 
 class OpcuaConfig(PlcConfig):
@@ -60,15 +265,28 @@ class RockwellConfig(PlcConfig):
     def __init__(self, address: str) -> None:
         super().__init__(PlcType.ROCKWELL, address)
 
-PLC_CONFIG : dict[str, BeckhoffConfig | OpcuaConfig]= {
-    # 'PLC1' : BeckhoffConfig(rootAddress="MAIN_PRG", address="172.16.224.79", 
-    #                 remoteAmsNetId="172.16.224.79.1.1", localAmsNetId="172.27.192.1.1.1"),
-    # 'PLC1' : OpcuaConfig(rootAddress="DefaultMachine", address="127.0.0.1", defaultNamespaceUri="http://0.0.0.0"),
-    # 'PLC1' : OpcuaConfig(address="172.16.224.68", defaultNamespaceUri="http://0.0.0.0"),
-    # 
-    'PLC1' : OpcuaConfig(address="172.16.224.80", defaultNamespaceUri="urn:BeckhoffAutomation:Ua:PLC1"),
-    'PLC2' : OpcuaConfig(address="172.16.224.80", defaultNamespaceUri="urn:BeckhoffAutomation:Ua:PLC2"),
-}
+PLC_CONFIG_CLASSES : dict[PlcType, type] = {PlcType.BECKHOFF : BeckhoffConfig, PlcType.OPCUA : OpcuaConfig, PlcType.ROCKWELL : RockwellConfig}
+
+def plcConfigFromSettings(settings : dict) -> PlcConfig:
+    """PlcConfig of one PlcConfig.json entry : its plcType and the constructor arguments of that type"""
+    settings = dict(settings)
+    plcType = PlcType(settings.pop('plcType'))
+    if plcType not in PLC_CONFIG_CLASSES:
+        return PlcConfig(plcType, **settings)
+    return PLC_CONFIG_CLASSES[plcType](**settings)
+
+@functools.cache
+def plcConfigs() -> dict[str, BeckhoffConfig | OpcuaConfig]:
+    """PLC_CONFIG of the project, read from PlcConfig.json on first use"""
+    return {name : plcConfigFromSettings(settings) for name, settings in projectconfig.readPlcConfigFile(PROJECT.plcConfigFile).items()}
+
+def __getattr__(name : str):
+    # PLCTAG_DATAFRAME and PLC_CONFIG are loaded on first use, importing the module reads no file
+    if name == 'PLCTAG_DATAFRAME':
+        return plcTagDataFrame()
+    if name == 'PLC_CONFIG':
+        return plcConfigs()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 class Primitive:
 
@@ -93,6 +311,201 @@ Actuator_CONFIG = {
 }
 
 
+# PlcTags.csv format fields and the information model columns they are read from, see TagResolver.resolve
+TAG_FIELD_COLUMNS = {'Machine_Number' : 'Machine', 'Station_Number' : 'Station', 'Station_Name' : 'StationName',
+                     'Actuator_Number' : 'Actuator', 'Actuator_Name' : 'ActuatorName', 'Parameter_Name' : 'ParameterName'}
+
+TAG_TABLE_COLUMNS = ['AutomationDevice', 'Element', 'Name', 'DataType', 'PlcTag']
+
+# element scope path -> [(name, dataType, plcTag)] of the tag table of the frames being converted, see useTagTable
+TAG_TABLE : dict[str, list[tuple[str, str, str]]] = {}
+
+# PlcTags.csv keys of the parameter value, minimum and maximum addresses, prefixed with Machine_ or Station_
+# for the parameters of a machine or a station sheet. The minimum and maximum are optional
+PARAMETER_TAG_KEYS = {'PlcTag' : 'Parameter_Value', 'Minimum' : 'Parameter_Minimum', 'Maximum' : 'Parameter_Maximum'}
+
+PARAMETER_TABLE_COLUMNS = ['AutomationDevice', 'Element', 'Name', 'DataType', 'PlcTag', 'Minimum', 'Maximum']
+
+# machine or station scope path -> ([(name, dataType, plcTag, minimum, maximum)], hash of these rows) of the
+# parameters of the frames being converted, see useTagTable
+PARAMETER_INDEX : dict[str, tuple[list[tuple[str, str, str, str, str]], str]] = {}
+
+def tagFields(df : pd.DataFrame, wphNumbers : pd.Series = None, nestNumbers : pd.Series = None) -> pd.DataFrame:
+    fields = pd.DataFrame({field : df[column].astype(object) if column in df.columns else None for field, column in TAG_FIELD_COLUMNS.items()}, index=df.index)
+    fields['Wph_Number'] = wphNumbers if wphNumbers is not None else None
+    fields['Nest_Number'] = nestNumbers if nestNumbers is not None else None
+    return fields
+
+def tagRows(resolver : TagResolver, key : str, df : pd.DataFrame, elements : pd.Series, name : str, dataType : str = None,
+            member : str = None, fields : pd.DataFrame = None) -> pd.DataFrame:
+    """Tag table rows of the `key` address, or of one of its members, for every row of `df`"""
+    tagType, addresses = resolver.resolveColumns(key, fields if fields is not None else tagFields(df))
+    return pd.DataFrame({'AutomationDevice' : df['AutomationDevice'].astype(object), 'Element' : elements, 'Name' : name,
+                         'DataType' : dataType if dataType is not None else tagType,
+                         'PlcTag' : addresses + f".{member}" if member is not None else addresses}, index=df.index)
+
+def shiftRegisterTagRows(resolver : TagResolver, df : pd.DataFrame, registers : pd.Series, wphKey : str, prefix : str,
+                         wphCount : int, nestCount : int) -> list[pd.DataFrame]:
+    """WPH and nest rows of the shift registers `registers` of the rows of `df`, one row per (register, WPH, nest) combination"""
+    wphs = df.assign(Register=registers).merge(pd.DataFrame({'Wph' : range(1, wphCount+1)}), how='cross')
+    wphElements = wphs['Register'] + '/WPH_' + wphs['Wph'].astype(str)
+    frames = [tagRows(resolver, wphKey, wphs, wphElements, 'WphId', fields=tagFields(wphs, wphNumbers=wphs['Wph']))]
+
+    nests = wphs.assign(WphElement=wphElements).merge(pd.DataFrame({'Nest' : range(1, nestCount+1)}), how='cross')
+    nestFields = tagFields(nests, wphNumbers=nests['Wph'], nestNumbers=nests['Nest'])
+    nestElements = nests['WphElement'] + '/' + nests['Nest'].astype(str)
+    frames += [tagRows(resolver, f'{prefix}{nestTag}', nests, nestElements, nestTag, fields=nestFields) for nestTag in SHIFT_REGISTER_NEST_TAGS]
+    return frames
+
+@timed()
+def makeParameterTable(dfinformationModel : pd.DataFrame, dfParameters : pd.DataFrame) -> pd.DataFrame:
+    """
+        One row per parameter, Element being the scope path of its machine or station. The value, minimum and
+        maximum addresses of the machine or station parameters of a PLC are resolved at once, the DataType of
+        the Pars block wins over the type of the value key. Parameters of a machine or station without
+        actuator rows in the information model are reported and left out.
+    """
+    frames : list[pd.DataFrame] = []
+    keys = ['AutomationDevice', 'Machine', 'Station']
+    stations = dfinformationModel.drop_duplicates(keys)[keys + ['StationName']].astype(object)
+    dfParameters = dfParameters.astype({column : object for column in keys})
+    # machine sheet parameters have no Station and are joined on the machine only
+    machineParameters = dfParameters['Station'].isna()
+    dfParameters = pd.concat([
+        dfParameters[~machineParameters].merge(stations, on=keys, how='left', indicator=True).assign(Level='Station'),
+        dfParameters[machineParameters].merge(stations.drop_duplicates(keys[:2])[keys[:2]], on=keys[:2], how='left', indicator=True).assign(Level='Machine')],
+        ignore_index=True)
+
+    for (deviceName, machine, station), _ in dfParameters[dfParameters['_merge'] == 'left_only'].groupby(keys, dropna=False, sort=False):
+        print(f"Error parameters of {deviceName} M{machine}{'' if pd.isna(station) else f' ST{station}'} : no such machine or station in the information model")
+    dfParameters = dfParameters[dfParameters['_merge'] == 'both']
+
+    for (deviceName, level), levelParameters in dfParameters.groupby(['AutomationDevice', 'Level'], sort=False):
+        resolver : TagResolver = plcConfigs()[deviceName].tagResolver
+        tagKeys = {column : f"{level}_{key}" for column, key in PARAMETER_TAG_KEYS.items()}
+        if tagKeys['PlcTag'] not in resolver.templates:
+            print(f"Error PlcTags.csv has no {tagKeys['PlcTag']} key, the {level.lower()} parameters of {deviceName} are left out")
+            continue
+
+        fields = tagFields(levelParameters)
+        tagType, plcTags = resolver.resolveColumns(tagKeys['PlcTag'], fields)
+        owners = f"{deviceName}/M" + levelParameters['Machine'].astype(str)
+        if level == 'Station':
+            owners = owners + '/ST' + levelParameters['Station'].astype(str)
+        limits = {column : resolver.resolveColumns(key, fields)[1] if key in resolver.templates else None
+                    for column, key in tagKeys.items() if column != 'PlcTag'}
+        frames.append(pd.DataFrame({'AutomationDevice' : deviceName, 'Element' : owners, 'Name' : levelParameters['ParameterName'].astype(str),
+                                    'DataType' : levelParameters['DataType'].where(levelParameters['DataType'].notna(), tagType),
+                                    'PlcTag' : plcTags, **limits}, index=levelParameters.index))
+
+    if not frames:
+        return pd.DataFrame(columns=PARAMETER_TABLE_COLUMNS)
+    return pd.concat(frames)[PARAMETER_TABLE_COLUMNS].sort_index(ignore_index=True)
+
+def parameterTagRows(parameterTable : pd.DataFrame) -> list[pd.DataFrame]:
+    """Tag table rows of the parameters, the value is the Data primitive, the minimum and maximum are its limits"""
+    elements = parameterTable['Element'] + '/Parameters/' + parameterTable['Name']
+    return [pd.DataFrame({'AutomationDevice' : parameterTable['AutomationDevice'], 'Element' : elements, 'Name' : name,
+                          'DataType' : parameterTable['DataType'], 'PlcTag' : parameterTable[column]}).dropna(subset=['PlcTag'])
+            for name, column in [('Data', 'PlcTag'), ('Minimum', 'Minimum'), ('Maximum', 'Maximum')]]
+
+@timed()
+def makeTagTable(dfinformationModel : pd.DataFrame, dfParameters : pd.DataFrame = None, shiftRegisters : bool = False) -> pd.DataFrame:
+    """
+        Every PLC tag of the information model, one row per (AutomationDevice, Element, Name, DataType, PlcTag),
+        Element being the scope path of the element below da:Application (PLC1/M01/ST01/_01_01_01_Act01). The
+        addresses of a PlcTags.csv key are resolved for all the machines, stations or actuators of a PLC at
+        once. The parameters and the shift register WPHs and nests are only added for the tag list export.
+    """
+    frames : list[pd.DataFrame] = []
+    if dfParameters is not None and len(dfParameters) > 0:
+        frames += parameterTagRows(makeParameterTable(dfinformationModel, dfParameters))
+    for deviceName, deviceDataFrame in dfinformationModel.groupby('AutomationDevice', observed=True):
+        resolver : TagResolver = plcConfigs()[deviceName].tagResolver
+        deviceDataFrame = deviceDataFrame.astype({column : object for column in ['Machine', 'Station', 'ActuatorType']})
+
+        # the first row of each group, the one the builders read
+        machines = deviceDataFrame.drop_duplicates('Machine')
+        machineElements = f"{deviceName}/M" + machines['Machine'].astype(str)
+        frames += [tagRows(resolver, 'Machine_PackMl_State', machines, machineElements, 'PackMlState'),
+                   tagRows(resolver, 'Machine_PackMl_Mode', machines, machineElements, 'PackMlMode')]
+
+        stations = deviceDataFrame.drop_duplicates(['Machine', 'Station'])
+        stationElements = f"{deviceName}/M" + stations['Machine'].astype(str) + '/ST' + stations['Station'].astype(str)
+        frames += [tagRows(resolver, 'Station_PackMl_State', stations, stationElements, 'PackMlState')]
+        frames += [tagRows(resolver, 'station_node', stations, stationElements, member, dataType='Boolean', member=member)
+                    for member in ['Sts_Idle', 'Sts_NoAlm']]
+
+        actuators = deviceDataFrame.drop_duplicates(['Machine', 'Station', 'Actuator', 'ActuatorName'])
+        actuators = actuators[actuators['ActuatorType'].isin(list(Actuator_CONFIG))]
+        for actuatorType, typeDataFrame in actuators.groupby('ActuatorType', sort=False):
+            machineNumbers, stationNumbers = typeDataFrame['Machine'].astype(str), typeDataFrame['Station'].astype(str)
+            actuatorElements = (f"{deviceName}/M" + machineNumbers + '/ST' + stationNumbers + '/_' + machineNumbers + '_' + stationNumbers + '_'
+                                + typeDataFrame['Actuator'].astype(str) + '_' + typeDataFrame['ActuatorName'].astype(str))
+            # the actuator node is resolved once, every primitive is a member of it, the ones without PlcTag have no address
+            _, nodes = resolver.resolveColumns('actuator_node', tagFields(typeDataFrame))
+            frames += [pd.DataFrame({'AutomationDevice' : deviceName, 'Element' : actuatorElements, 'Name' : primitive.Name,
+                                     'DataType' : primitive.DataType, 'PlcTag' : nodes + f".{primitive.PlcTag}" if primitive.PlcTag else None})
+                        for primitive in Actuator_CONFIG[actuatorType]]
+
+        if shiftRegisters:
+            stationRegisters = stationElements + '/ShiftRegisterST' + stations['Station'].astype(str)
+            frames += [tagRows(resolver, 'shift_register_Station_StationID', stations, stationRegisters, 'StationId')]
+            frames += shiftRegisterTagRows(resolver, stations, stationRegisters, 'shift_register_Station_WPHID', 'shift_register_Station_Nest_',
+                                           STATION_WPH_COUNT, SHIFT_REGISTER_NEST_COUNT)
+            frames += shiftRegisterTagRows(resolver, machines, machineElements + '/Loop01', 'shift_register_Loop_WPHID', 'shift_register_Loop_Nest_',
+                                           LOOP_WPH_COUNT, SHIFT_REGISTER_NEST_COUNT)
+
+    if not frames:
+        return pd.DataFrame(columns=TAG_TABLE_COLUMNS)
+    return pd.concat(frames, ignore_index=True)[TAG_TABLE_COLUMNS].sort_values(['AutomationDevice', 'Element'], kind='stable', ignore_index=True)
+
+@timed()
+def makeModelIndex(dfinformationModel : pd.DataFrame) -> list[ModelNode]:
+    """AutomationDevice -> Machine -> Station -> Actuator index the builders walk, see modelindex"""
+    return modelIndex(dfinformationModel)
+
+def useTagTable(dfinformationModel : pd.DataFrame, dfParameters : pd.DataFrame = None):
+    """Make the tag table and the parameters of the frames being converted the ones the builders read"""
+    tagTable : pd.DataFrame = makeTagTable(dfinformationModel)
+    TAG_TABLE.clear()
+    for element, name, dataType, plcTag in zip(*(tagTable[column].tolist() for column in ['Element', 'Name', 'DataType', 'PlcTag'])):
+        TAG_TABLE.setdefault(element, []).append((name, dataType, plcTag))
+
+    PARAMETER_INDEX.clear()
+    if dfParameters is None or len(dfParameters) == 0:
+        return
+    parameterTable : pd.DataFrame = makeParameterTable(dfinformationModel, dfParameters)
+    parameters = list(zip(*(parameterTable[column].astype(object).where(parameterTable[column].notna(), None).tolist()
+                            for column in ['Name', 'DataType', 'PlcTag', 'Minimum', 'Maximum'])))
+    rowHashes = pd.util.hash_pandas_object(parameterTable, index=False).to_numpy()
+    for element, positions in parameterTable.groupby('Element', sort=False).indices.items():
+        PARAMETER_INDEX[element] = ([parameters[position] for position in positions], hashBytes(rowHashes[positions].tobytes()))
+
+def elementParameters(element : str) -> tuple[list[tuple[str, str, str, str, str]], str]:
+    """(name, dataType, plcTag, minimum, maximum) of the parameters of a machine or station and the hash of them"""
+    return PARAMETER_INDEX.get(element, ([], ''))
+
+def elementTags(element : str) -> list[tuple[str, str, str]]:
+    """(name, dataType, plcTag) of an element in TAG_TABLE"""
+    return TAG_TABLE[element]
+
+def deviceTags(deviceName : str) -> tuple[dict, dict]:
+    """The part of TAG_TABLE and of PARAMETER_INDEX of one PLC, for a worker process"""
+    return ({element : tags for element, tags in TAG_TABLE.items() if element.split('/', 1)[0] == deviceName},
+            {element : parameters for element, parameters in PARAMETER_INDEX.items() if element.split('/', 1)[0] == deviceName})
+
+@timed()
+def writeTagList(tagTable : pd.DataFrame, path : str):
+    """Tag list for commissioning, a Parquet file when `path` ends with .parquet (pyarrow), else CSV"""
+    with stage('write'):
+        if path.endswith('.parquet'):
+            tagTable.to_parquet(f"{path}.tmp", index=False)
+        else:
+            tagTable.to_csv(f"{path}.tmp", sep=';', index=False)
+        os.replace(f"{path}.tmp", path)
+    count('bytes written', os.path.getsize(path))
+
 def getPath(element : etree.Element)->str:
     if"AutomationDevice" in element.tag:
         return element.attrib["name"]
@@ -111,69 +524,51 @@ def findRange(df: pd.DataFrame,column: str, keyWord: any):
         return None,None
     return iStart,iEnd
 
-def parametersToDataFrame(dfParameters : pd.DataFrame, tab : str, plcName, buf : BytesIO) -> pd.DataFrame:
-
-    df_Raw = pd.read_excel(buf, sheet_name=tab, header=None)
-    df_Camsparam = None
-    df_Params = None
-
-    # start, end = findRange(df=df_Raw,column=0,keyWord="Cams")
-
-    # if not start == None:
-    #     df_Camsparam =  df_Raw[start: end]
-    #     df_Camsparam.columns = df_Camsparam.iloc[0]
-    #     df_Camsparam=df_Camsparam[1:]
-    #     df_Camsparam.dropna(how='all', inplace=True)
+def parametersToDataFrame(tab : str, plcName, df_Raw : pd.DataFrame) -> pd.DataFrame:
+    """
+        Rows of the `Pars` ... `Pars End` block of a `_MM` machine or `_MM_SS` station sheet, None without one.
+        The Value column is not read : the HMI reads the value from the PLC through the Parameter_Value key and
+        has no initial value attribute, and every parameter is written visible and settable.
+    """
+    sheetRe = re.search(r"^_([0-9]{2})(_([0-9]{2}))?$", tab )
+    if sheetRe is None:
+        return
 
     start, end = findRange(df=df_Raw,column=0,keyWord="Pars")
-    
-    if not start == None:
-        df_Params =  df_Raw[start: end]
-        df_Params.columns = df_Params.iloc[0]
-        df_Params=df_Params[1:]
-        df_Params.dropna(how='all', inplace=True)
-
-    if df_Params is not None and len(df_Params) > 0:
-    
-        df_Raw = df_Params
-
-        dfParameters : pd.DataFrame = pd.DataFrame(columns=['Plc', 'Machine', 'Station', 'Minimum', 'Value', 'Maximum', 'ConfigAnte'])
-
-        machineRe = re.search(r"^_([0-9]{2})$", tab )
-    
-        if machineRe is not None:
-            df_Raw['Machine'] = machineRe.group(1)
-
-        stationRe = re.search(r"^_([0-9]{2})_([0-9]{2})$", tab )
-
-        if stationRe is not None:
-            df_Raw['Machine'] = machineRe.group(1)
-            df_Raw['Station'] = stationRe.group(2)    
+    if start is None:
+        return
 
-        df_Raw['AutomationDevice'] = plcName        
+    # the Pars row holds the column names, the columns without a name are not part of the block
+    df_Params = df_Raw.loc[start+1:end-1].set_axis(df_Raw.loc[start], axis='columns')
+    df_Params = df_Params.loc[:, df_Params.columns.notna()].dropna(how='all')
+    df_Params = df_Params.rename(columns={'Name' : 'ParameterName', 'Min' : 'Minimum', 'Max' : 'Maximum'})
+    if 'ParameterName' not in df_Params.columns:
+        print(f"Error sheet {tab} of {plcName} : Pars block without a Name column")
+        return
+    df_Params = df_Params[df_Params['ParameterName'].notna()]
+    if len(df_Params) == 0:
+        return
 
-        df_Raw.rename(columns={'Alarm name':'AlarmName', 'Alm' : 'AlarmInput', 'Ack' : 'AlarmAcknowledge', 
-                        'en-US' : 'AlarmMessage', 'Class' : 'AlarmClass' },inplace=True)
-        
-        
-        
-        return df_Raw[dfParameters.columns]
+    # machine sheet parameters have no Station
+    df_Params = df_Params.assign(AutomationDevice=plcName, Machine=sheetRe.group(1), Station=sheetRe.group(3))
+    return df_Params.reindex(columns=list(PARAMETERS_DTYPES)).reset_index(drop=True)
 
-def alarmsToDataFrame(dfAlarms : pd.DataFrame,tab : str, plcName, buf : BytesIO) -> pd.DataFrame:
+def alarmsToDataFrame(tab : str, plcName, df_Raw : pd.DataFrame) -> pd.DataFrame:
 
     if not tab == '_Alarms':
         return
     
-    df_Raw = pd.read_excel(buf, sheet_name=tab)
+    # sheets are loaded without header, the first row holds the column names
+    df_Raw = df_Raw.iloc[1:].set_axis(df_Raw.iloc[0], axis='columns').reset_index(drop=True).infer_objects()
 
     df_Raw.rename(columns={'Alarm name':'AlarmName', 'Alm' : 'AlarmInput', 'Ack' : 'AlarmAcknowledge', 
                     'en-US' : 'AlarmMessage' },inplace=True)
     
     df_Raw['AutomationDevice'] = plcName
     
-    return df_Raw[dfAlarms.columns]
+    return df_Raw[list(ALARMS_DTYPES)]
 
-def informationModelToDataFrame(dfInformationModel : pd.DataFrame, tab : str, plcName, buf : BytesIO) -> pd.DataFrame:
+def informationModelToDataFrame(tab : str, plcName, df_Raw : pd.DataFrame) -> pd.DataFrame:
     # Handle InformationModel
     machineRe = re.search(r"^_([0-9]{2})_([0-9]{2})$", tab )
     
@@ -183,7 +578,6 @@ def informationModelToDataFrame(dfInformationModel : pd.DataFrame, tab : str, pl
     
     machineStr = machineRe.group(1)
     stationNumberStr = machineRe.group(2)
-    df_Raw = pd.read_excel(buf, sheet_name=tab, header=None)
     
     stationNameStr = df_Raw[df_Raw[0]=='NameL1'][1].values[0]
 
@@ -200,38 +594,210 @@ def informationModelToDataFrame(dfInformationModel : pd.DataFrame, tab : str, pl
     df_actuator['Actuator'] = df_actuator['Actuator'].str.replace('_','')
 
     df_actuator.rename(columns={'DataType':'ActuatorType', 'Name' : 'ActuatorName' },inplace=True)
-    df_actuator = df_actuator[dfInformationModel.columns]
+    df_actuator = df_actuator[list(INFORMATION_MODEL_DTYPES)]
 
     return df_actuator
 
-def excelConfigFilesToDataFrames(folderpath : str) -> (pd.DataFrame,pd.DataFrame,pd.DataFrame):
+def isConfigSheet(tab : str) -> bool:
+    """Sheets read by the extractors : `_MM` machine sheets, `_MM_SS` station sheets and `_Alarms`"""
+    return tab == '_Alarms' or re.search(r"^_([0-9]{2})(_([0-9]{2}))?$", tab ) is not None
 
-    dfInformationModel : pd.DataFrame = pd.DataFrame(columns=['AutomationDevice', 'Machine', 'Station', 'StationName', 'Actuator','ActuatorType', 'ActuatorName'])
-    dfAlarms : pd.DataFrame = pd.DataFrame(columns=['AutomationDevice', 'AlarmName', 'AlarmInput', 'AlarmAcknowledge', 'AlarmMessage'])
-    dfParameters : pd.DataFrame = pd.DataFrame(columns=['AutomationDevice', 'Machine', 'Station', 'Actuator', 'ParameterName', 'Minimum', 'Value', 'Maximum'])
-    
-    # iterate over fil e in folder
-    for file in os.listdir(folderpath):
+@timed()
+def loadWorkbookSheets(filepath : str, tabs : list[str] = None) -> dict[str, pd.DataFrame]:
+    """Open the workbook once and parse every config sheet (or only `tabs`) once, in read-only mode.
 
-        # only handle .xlsm file and not currently opened one
-        if not file.endswith(".xlsm") or file.startswith("~$"):
-            continue
-        
-        with open(os.path.join(folderpath,file), "rb") as fh:
-            buf = BytesIO(fh.read())
-            tabs = pd.ExcelFile(buf).sheet_names
-
-            plcName = file.split('_')[1].replace(".xlsm","")
-            
-            for tab in tabs:
-                dfInformationModel = pd.concat((dfInformationModel, informationModelToDataFrame(dfInformationModel=dfInformationModel, tab=tab, plcName=plcName, buf=buf)), ignore_index=True)
-                dfAlarms = pd.concat((dfAlarms, alarmsToDataFrame(dfAlarms=dfAlarms, tab=tab,plcName=plcName, buf=buf)), ignore_index=True)
-                #dfParameters = pd.concat((dfParameters, parametersToDataFrame(dfParameters=dfParameters, tab=tab,plcName=plcName, buf=buf)))
-            
+    Sheets are returned raw (header=None), each extractor picks its own header row.
+    """
+    with pd.ExcelFile(filepath, engine='openpyxl') as workbook:
+        if tabs is None:
+            tabs = [tab for tab in workbook.sheet_names if isConfigSheet(tab)]
+        if not tabs:
+            return {}
+        count('sheets parsed', len(tabs))
+        return workbook.parse(sheet_name=tabs, header=None)
+
+@timed()
+def extractSheet(tab : str, plcName : str, df_Raw : pd.DataFrame) -> (pd.DataFrame,pd.DataFrame,pd.DataFrame):
+    """Information model, parameters and alarms batches of one sheet, None when the sheet has none"""
+    return (informationModelToDataFrame(tab=tab, plcName=plcName, df_Raw=df_Raw),
+            parametersToDataFrame(tab=tab, plcName=plcName, df_Raw=df_Raw),
+            alarmsToDataFrame(tab=tab, plcName=plcName, df_Raw=df_Raw))
+
+@timed()
+def workbookToRecordBatches(filepath : str, cache : BuildCache = None) -> (list[pd.DataFrame],list[pd.DataFrame],list[pd.DataFrame]):
+    """Parse one <project>_<PLC>.xlsm into information model, parameters and alarms record batches, one batch per sheet.
+
+    With a cache, the batches of unchanged sheets are reused and only the changed sheets are parsed.
+    """
+
+    plcName = os.path.basename(filepath).split('_')[1].replace(".xlsm","")
+
+    if cache is None:
+        extracted = {tab : extractSheet(tab=tab, plcName=plcName, df_Raw=df_Raw) for tab, df_Raw in loadWorkbookSheets(filepath).items()}
+    else:
+        keys = {tab : cache.key('sheet', sourceFingerprint(), plcName, tab, sheetHash)
+                    for tab, sheetHash in workbookSheetHashes(filepath).items() if isConfigSheet(tab)}
+        extracted = {tab : cache.get(key) for tab, key in keys.items()}
+        dirtyTabs = [tab for tab, batches in extracted.items() if batches is None]
+        if dirtyTabs:
+            for tab, df_Raw in loadWorkbookSheets(filepath, tabs=dirtyTabs).items():
+                extracted[tab] = extractSheet(tab=tab, plcName=plcName, df_Raw=df_Raw)
+                cache.put(keys[tab], extracted[tab])
+
+    informationModelBatches : list[pd.DataFrame] = []
+    parametersBatches : list[pd.DataFrame] = []
+    alarmsBatches : list[pd.DataFrame] = []
+
+    for sheetBatches in extracted.values():
+        for batches, batch in zip([informationModelBatches, parametersBatches, alarmsBatches], sheetBatches):
+            if batch is not None and len(batch) > 0:
+                batches.append(batch)
+
+    return informationModelBatches, parametersBatches, alarmsBatches
+
+def workbookToRecordBatchesWorker(filepath : str, cache : BuildCache = None):
+    """workbookToRecordBatches in a pool process, also returns the cache statistics of this call"""
+    if cache is None:
+        return workbookToRecordBatches(filepath=filepath), None
+    # the cache is a copy of the parent one, only count what this call does
+    cache.statistics = CacheStatistics()
+    return workbookToRecordBatches(filepath=filepath, cache=cache), cache.statistics
+
+@timed()
+def concatRecordBatches(batches : list[pd.DataFrame], dtypes : dict[str, str]) -> pd.DataFrame:
+    """Single concat of the record batches, cast to the frame dtypes"""
+    if not batches:
+        return pd.DataFrame(columns=list(dtypes)).astype(dtypes)
+    return pd.concat(batches, ignore_index=True)[list(dtypes)].astype(dtypes)
+
+@timed()
+def excelConfigFilesToDataFrames(folderpath : str, workers : int = 1, cache : BuildCache = None) -> (pd.DataFrame,pd.DataFrame,pd.DataFrame):
+    """Parse every workbook of the folder, with `workers` > 1 each workbook is parsed in its own process.
+
+    Workbooks are handled in file name order and their record batches are concatenated once, in that
+    order, so serial and parallel runs return the same frames.
+    """
+
+    # only handle .xlsm file and not currently opened one
+    files = [os.path.join(folderpath,file) for file in sorted(os.listdir(folderpath))
+                if file.endswith(".xlsm") and not file.startswith("~$")]
+
+    if workers > 1 and len(files) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(files))) as executor:
+            workbooks = []
+            for batches, statistics in executor.map(workbookToRecordBatchesWorker, files, [cache] * len(files)):
+                workbooks.append(batches)
+                if statistics is not None:
+                    cache.statistics.merge(statistics)
+    else:
+        workbooks = [workbookToRecordBatches(filepath, cache=cache) for filepath in files]
+
+    dfInformationModel : pd.DataFrame = concatRecordBatches([batch for workbook in workbooks for batch in workbook[0]], INFORMATION_MODEL_DTYPES)
+    dfParameters : pd.DataFrame = concatRecordBatches([batch for workbook in workbooks for batch in workbook[1]], PARAMETERS_DTYPES)
+    dfAlarms : pd.DataFrame = concatRecordBatches([batch for workbook in workbooks for batch in workbook[2]], ALARMS_DTYPES)
 
     return dfInformationModel, dfParameters, dfAlarms
 
 
+def packageVersion(package : str) -> str:
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return None
+
+@functools.cache
+def sourceFingerprint() -> str:
+    """
+        Hash of the converter modules and of the versions of the libraries shaping the cached batches and
+        fragments, any code change or upgrade invalidates them
+    """
+    return hashBytes(*[hashFile(module.__file__) for module in CACHE_SOURCE_MODULES],
+                     *[f"{package} {packageVersion(package)}" for package in CACHE_PACKAGES])
+
+@functools.cache
+def buildFingerprint() -> str:
+    """Hash of everything the generated fragments depend on besides the information model rows"""
+    return hashBytes(sourceFingerprint(),
+                     plcTagsHash(),
+                     hashFolder(PROJECT.baseFolder),
+                     repr({name : sorted(vars(plcConfig).items()) for name, plcConfig in sorted(plcConfigs().items())}),
+                     repr({name : [sorted(vars(primitive).items()) for primitive in primitives] for name, primitives in sorted(Actuator_CONFIG.items())}))
+
+# parsed BaseFiles by content hash, every use gets a copy
+BASE_TREES : dict[str, etree._ElementTree] = {}
+
+def baseTree(name : str) -> etree._ElementTree:
+    """Copy of the template file `name` of PROJECT.baseFolder, parsed once per content"""
+    path = PROJECT.baseFile(name)
+    fileHash = hashFile(path)
+    if fileHash not in BASE_TREES:
+        count('base files parsed')
+        BASE_TREES[fileHash] = etree.parse(path)
+    return deepcopy(BASE_TREES[fileHash])
+
+def hashFrame(df : pd.DataFrame) -> str:
+    return hashBytes(repr(list(df.columns)), pd.util.hash_pandas_object(df, index=False).values.tobytes())
+
+class SubtreeMemo:
+    """
+        Subtrees of the previous build by input hash. A build takes the unchanged ones and moves them into its
+        tree, the subtrees it did not take (removed stations) are dropped when the build is finished.
+    """
+
+    def __init__(self) -> None:
+        self.previous : dict[str, etree.Element] = {}
+        self.current : dict[str, etree.Element] = {}
+        self.built = 0
+        self.reused = 0
+
+    def startBuild(self):
+        # a failed build did not finish, what it took is still available to the next one
+        self.previous.update(self.current)
+        self.current = {}
+        self.built = self.reused = 0
+
+    def finishBuild(self):
+        self.previous = {}
+
+    def take(self, key : str) -> etree.Element:
+        element = self.previous.pop(key, None)
+        if element is not None:
+            self.current[key] = element
+            self.reused += 1
+        return element
+
+    def keep(self, key : str, element : etree.Element):
+        self.current[key] = element
+        self.built += 1
+
+def buildCached(kind : str, keyParts : list[str], build : Callable[[], etree.Element]) -> etree.Element:
+    """Element of the previous build (SUBTREE_MEMO) or rebuilt from BUILD_CACHE when its inputs did not change, else built"""
+    if SUBTREE_MEMO is None:
+        return buildStored(kind, keyParts, build)
+
+    key = hashBytes(kind, *keyParts)
+    element : etree.Element = SUBTREE_MEMO.take(key)
+    if element is None:
+        element = buildStored(kind, keyParts, build)
+        SUBTREE_MEMO.keep(key, element)
+    return element
+
+def buildStored(kind : str, keyParts : list[str], build : Callable[[], etree.Element]) -> etree.Element:
+    """Element rebuilt from BUILD_CACHE when its inputs did not change, else built and stored"""
+    if BUILD_CACHE is None:
+        return build()
+
+    key = BUILD_CACHE.key(kind, buildFingerprint(), *keyParts)
+    fragment : bytes = BUILD_CACHE.get(key)
+    if fragment is not None:
+        count(f'build cache {kind} hits')
+        return etree.fromstring(fragment)
+    count(f'build cache {kind} misses')
+
+    element : etree.Element = build()
+    BUILD_CACHE.put(key, etree.tostring(element))
+    return element
+
 def makePrimitive(name : str, dataType : str, plcTag: str = None, canSet : str = None):
     """
         <Primitive name="Data" plcTag="//Application.ModBus_Array.MDD_a_bArrB0000[1]" canSet="{path:{GeneralData}/PackML_ProductionMode_Enable/Data}" isVisible="true" dataType="Boolean" behaviour="Switch" />
@@ -254,7 +820,6 @@ def makeGenericOutbound(name : str, dataType : str, plcTag: str = None, canSet :
     daGenericOutbound :etree.Element = etree.Element(f"{{{NAMESPACES['da']}}}GenericOutbound")
     daGenericOutbound.attrib["name"] = name
     daGenericOutbound.attrib['scopeId'] = name    
-    daGenericOutbound.attrib['hmiId'] = f'{random.randint(10000,99999)}'
 
     daGenericOutbound.append(makePrimitive(name="Data",dataType=dataType,plcTag=plcTag, canSet = canSet))
     return daGenericOutbound
@@ -267,87 +832,117 @@ def makeGenericOutboundFromPrimitive(primitive : Primitive, GenericOutboundPLcTa
         return makeGenericOutbound(name=primitive.Name, dataType=primitive.DataType)
     
 
-def makeActuator(daStationElement : etree.Element, dfinformationModel : pd.DataFrame):
-    
-    #ignore actuator type alias
-    if dfinformationModel['ActuatorType'].values[0] not in Actuator_CONFIG:
-        print(f"Error : actuator type unsuported : {dfinformationModel['ActuatorType'].values[0]} ")
+@timed()
+def makeActuator(daStationElement : etree.Element, actuator : ModelNode):
+    row : ModelRow = actuator.row
+
+    #ignore actuator type alias, reported by validateModel
+    if row.ActuatorType not in Actuator_CONFIG:
         return
 
-    daActuator : etree.Element = etree.Element(f"{{{NAMESPACES['da']}}}{dfinformationModel['ActuatorType'].values[0]}")
+    daActuator : etree.Element = etree.Element(f"{{{NAMESPACES['da']}}}{row.ActuatorType}")
     daStationElement.append(daActuator)
-    daActuator.attrib['name'] =f"ACT{dfinformationModel['Actuator'].values[0]}" 
-    daActuator.attrib['scopeId'] = f"_{dfinformationModel['Machine'].values[0]}_{dfinformationModel['Station'].values[0]}_{dfinformationModel['Actuator'].values[0]}_{dfinformationModel['ActuatorName'].values[0]}" 
-    daActuator.attrib['hmiId'] = f'{random.randint(10000,99999)}'
-
-    primitiveList : list[Primitive] = Actuator_CONFIG[dfinformationModel['ActuatorType'].values[0]]
-    
-    plconfig = PLC_CONFIG[dfinformationModel['AutomationDevice'].values[0]]
+    daActuator.attrib['name'] =f"ACT{row.Actuator}" 
+    daActuator.attrib['scopeId'] = f"_{row.Machine}_{row.Station}_{row.Actuator}_{row.ActuatorName}" 
 
-    for primitive in primitiveList:
-        _, tagAddress = plconfig.get_tag(key='actuator_node',dfInformationModelRow=dfinformationModel.iloc[0])
-        if primitive.Name == 'Cmd_Out':
-            daActuator.append(makeGenericOutbound(name=primitive.Name,dataType=primitive.DataType,
-                plcTag=f"//{tagAddress}.{primitive.PlcTag}",
+    for name, dataType, tagAddress in elementTags(f"{row.AutomationDevice}/M{row.Machine}/ST{row.Station}/{daActuator.attrib['scopeId']}"):
+        if name == 'Cmd_Out':
+            daActuator.append(makeGenericOutbound(name=name,dataType=dataType,
+                plcTag=f"//{tagAddress}" if tagAddress else None,
                 canSet="{path:{Rights}/ManualActionEnable}"))
         else:
-            daActuator.append(makeGenericOutbound(name=primitive.Name,dataType=primitive.DataType,
-                    plcTag=f"//{tagAddress}.{primitive.PlcTag}"))
+            daActuator.append(makeGenericOutbound(name=name,dataType=dataType,
+                    plcTag=f"//{tagAddress}" if tagAddress else None))
 
-def makeStation(daMachineElement : etree.Element, dfinformationModel : pd.DataFrame, dfParameters: pd.DataFrame):
+@timed()
+def makeStation(daMachineElement : etree.Element, station : ModelNode):
+    row : ModelRow = station.row
     daStation : etree.Element = etree.Element(f"{{{NAMESPACES['da']}}}Station")
     daMachineElement.append(daStation)
-    daStation.attrib['name'] = f"ST{dfinformationModel['Station'].values[0]}"
-    daStation.attrib['scopeId'] = f"ST{dfinformationModel['Station'].values[0]}"
-    daStation.attrib['hmiId'] = f'{random.randint(10000,99999)}'
+    daStation.attrib['name'] = f"ST{row.Station}"
+    daStation.attrib['scopeId'] = f"ST{row.Station}"
     
-    plconfig = PLC_CONFIG[dfinformationModel['AutomationDevice'].values[0]]
-    tagType, tagAddress = plconfig.get_tag(key='Station_PackMl_State',dfInformationModelRow=dfinformationModel.iloc[0])
-    daStation.append(makeGenericOutbound(name='PackMlState',dataType=tagType,
-                    plcTag=f"//{tagAddress}"))
-    
-        
-    for i in ['Sts_Idle', 'Sts_NoAlm']:
-        tagType, tagAddress = plconfig.get_tag(key=f'station_node',dfInformationModelRow=dfinformationModel.iloc[0])
-        daStation.append(makeGenericOutbound(name=i, dataType='Boolean', 
-                                plcTag=f"//{tagAddress}.{i}"))
+    # PackMlState, Sts_Idle and Sts_NoAlm
+    for name, dataType, tagAddress in elementTags(f"{row.AutomationDevice}/M{row.Machine}/{daStation.attrib['scopeId']}"):
+        daStation.append(makeGenericOutbound(name=name, dataType=dataType,
+                                plcTag=f"//{tagAddress}"))
         
     daStation.append(makeParameters(parametersName=f"Parameters",
-                                dfParameters=dfParameters,
-                                dfStation=dfinformationModel))
+                                element=f"{row.AutomationDevice}/M{row.Machine}/{daStation.attrib['scopeId']}"))
     
     daStation.append(makeshiftRegister(shiftRegisterName=f"ShiftRegister{daStation.attrib['name']}",
-                                dfinformationModel=dfinformationModel,
-                                wphCount=2,
-                                nestCount=4,
-                                dfStation=dfinformationModel))
+                                row=row,
+                                wphCount=STATION_WPH_COUNT,
+                                nestCount=SHIFT_REGISTER_NEST_COUNT,
+                                station=True))
 
-    for groupName, groupeDataFrame in dfinformationModel.groupby(["Actuator",'ActuatorName']):
-        makeActuator(daStationElement=daStation, dfinformationModel=groupeDataFrame)
+    for actuator in station.children:
+        makeActuator(daStationElement=daStation, actuator=actuator)
 
-def makeParameters(parametersName : str, dfParameters : pd.DataFrame,  dfStation: pd.DataFrame = None) -> etree.Element:
+@timed()
+def makeParameters(parametersName : str, element : str) -> etree.Element:
     """
         <Folder name="Parameters">
-            <da:GenericOutbound name="WaitingTime" scopeId="M01" hmiId="34294" tags="Type/Parameter">
-                <Primitive name="Data" dataType="Int32" canSet="true" isVisible="true" plcTag="//WaitingTime" min="//WaitingTimeMin" max="//WaitingTimeMax"/>
+            <da:GenericOutbound name="WaitingTime" scopeId="WaitingTime" hmiId="34294" tags="Type/Parameter">
+                <Primitive name="Data" dataType="Int32" plcTag="//WaitingTime" canSet="true" isVisible="true" min="//WaitingTimeMin" max="//WaitingTimeMax"/>
             </da:GenericOutbound>
         </Folder>		
     """
-    plconfig : PlcConfig = PLC_CONFIG[dfStation['AutomationDevice'].values[0]]
     daParameters : etree.Element = etree.Element(f"Folder")
     daParameters.attrib['name'] = parametersName
-    if dfParameters is not None:
-        for primitive in dfParameters['ParameterName']:
-            """<da:GenericOutbound  name="WaitingTime" scopeId="M01" hmiId="34294" tags="Type/Parameter"""
-            tagType, tagAddress = plconfig.get_tag(key=f'primitive.Name',dfInformationModelRow=dfParameters.iloc[0])
-            daParam : makeGenericOutbound(name=primitive.Name, dataType= tagType if tagType else primitive.DataType, 
-                    plcTag=tagAddress)
-            daParam.attrib['tags'] = f"Type/Parameter"
-            daParameters.append(daParam)
+    for name, dataType, plcTag, minimum, maximum in elementParameters(element)[0]:
+        daParam : etree.Element = makeGenericOutbound(name=name, dataType=dataType, plcTag=f"//{plcTag}", canSet="true")
+        daParam.attrib['tags'] = f"Type/Parameter"
+        daParam[0].attrib['isVisible'] = "true"
+        if minimum is not None:
+            daParam[0].attrib['min'] = f"//{minimum}"
+        if maximum is not None:
+            daParam[0].attrib['max'] = f"//{maximum}"
+        daParameters.append(daParam)
     return daParameters
 
     
-def makeshiftRegister(shiftRegisterName : str, dfinformationModel : pd.DataFrame, wphCount : int,  nestCount : int, dfStation: pd.DataFrame = None) -> etree.Element:
+SHIFT_REGISTER_NEST_TAGS = ['Sts_Bad','Sts_Full','Sts_Good','Sts_Enable','RejectCode', 'StationReject']
+
+# da:Wph prototypes stamped by makeshiftRegister, keyed by (PlcType, PlcTags.csv hash, WPH tag key, nest tag prefix, nest count)
+WPH_TEMPLATES : dict[tuple[PlcType, str, str, str, int], etree.Element] = {}
+
+def getWphTemplate(plconfig : PlcConfig, wphKey : str, prefix : str, nestCount : int) -> etree.Element:
+    """
+        da:Wph prototype with its nests and primitives. Only the WPH name, scopeId and the plcTags depend
+        on the indexes, they are left empty and filled on each copy.
+    """
+    templateKey = (plconfig.plcType, plcTagsHash(), wphKey, prefix, nestCount)
+    if templateKey in WPH_TEMPLATES:
+        count('wph template hits')
+        return WPH_TEMPLATES[templateKey]
+    count('wph template misses')
+
+    resolver : TagResolver = plconfig.tagResolver
+
+    daWph : etree.Element = etree.Element(f"{{{NAMESPACES['da']}}}Wph")
+    daWph.attrib['name'] = ""
+    daWph.attrib['scopeId'] = ""
+
+    daWph.append(makePrimitive(name="WphId", dataType=resolver.templates[wphKey][0]))
+    daWph[0].attrib['plcTag'] = ""
+
+    for j in range(1,nestCount+1):
+        """<da:Nest name="4" hmiId="965447">"""
+        daNest : etree.Element = etree.Element(f"{{{NAMESPACES['da']}}}Nest")
+        daWph.append(daNest)
+        daNest.attrib['name'] = f"{j}"
+
+        for nestTag in SHIFT_REGISTER_NEST_TAGS:
+            primitive : etree.Element = makePrimitive(name=nestTag, dataType=resolver.templates[f'{prefix}{nestTag}'][0])
+            primitive.attrib['plcTag'] = ""
+            daNest.append(primitive)
+
+    WPH_TEMPLATES[templateKey] = daWph
+    return daWph
+
+@timed()
+def makeshiftRegister(shiftRegisterName : str, row : ModelRow, wphCount : int,  nestCount : int, station : bool = False) -> etree.Element:
     """
         <da:ShiftRegister name="Loop_ShiftRegister_001" scopeId="Loop_ShiftRegister_001" hmiId="965247" tags="Type/ShiftRegister">
             <Primitive name="StationId" dataType="Int64" plcTag="////M{dfinformationModel['Machine'].values[0]}.GVLWPHsLoop01[0].Sts_MoverID" hmiId="9651447"/>
@@ -364,56 +959,91 @@ def makeshiftRegister(shiftRegisterName : str, dfinformationModel : pd.DataFrame
             </da:Wph>
         </da:ShiftRegister>
     """
-    plconfig : PlcConfig = PLC_CONFIG[dfinformationModel['AutomationDevice'].values[0]]
+    plconfig : PlcConfig = plcConfigs()[row.AutomationDevice]
+    row : TagRow = tagRowFrom(row)
 
     daShiftRegister : etree.Element = etree.Element(f"{{{NAMESPACES['da']}}}ShiftRegister")
 
     daShiftRegister.attrib['name'] = shiftRegisterName
     daShiftRegister.attrib['scopeId'] = shiftRegisterName
-    daShiftRegister.attrib['hmiId'] = f'{random.randint(10000,99999)}'
     daShiftRegister.attrib['tags'] = "Type/ShiftRegister"
     
-    if dfStation is not None:
-        tagType, tagAddress = plconfig.get_tag(key='shift_register_Station_StationID',dfInformationModelRow=dfinformationModel.iloc[0])
+    if station:
+        tagType, tagAddress = plconfig.get_tag(key='shift_register_Station_StationID',dfInformationModelRow=row)
         daShiftRegister.append(makePrimitive(name="StationId", dataType=tagType, 
                 plcTag=f"//{tagAddress}"))
 
+    if station:
+        wphKey = 'shift_register_Station_WPHID'
+        prefix = 'shift_register_Station_Nest_'
+    else:
+        wphKey = 'shift_register_Loop_WPHID'
+        prefix = 'shift_register_Loop_Nest_'
+
+    # resolve every WPH and nest tag of the register in one batch, in the order they are stamped
+    tags = iter(plconfig.tagResolver.resolveMany(
+        request for i in range(1,wphCount+1) for request in
+            [(wphKey, row, i, None)] + [(f'{prefix}{nestTag}', row, i, j) for j in range(1,nestCount+1) for nestTag in SHIFT_REGISTER_NEST_TAGS]))
+
+    wphTemplate : etree.Element = getWphTemplate(plconfig=plconfig, wphKey=wphKey, prefix=prefix, nestCount=nestCount)
+
     for i in range(1,wphCount+1):
-        """<da:Wph name="1" scopeId="Wph1" hmiId="965147">"""
-        daWph : etree.Element = etree.Element(f"{{{NAMESPACES['da']}}}Wph")
+        daWph : etree.Element = deepcopy(wphTemplate)
         daShiftRegister.append(daWph)
         daWph.attrib['name'] = f"WPH_{i}"
         daWph.attrib['scopeId'] = f"WPH_{i}"
-        daWph.attrib['hmiId'] = f'{random.randint(10000,99999)}'
 
-        if dfStation is not None:            
-            tagType, tagAddress = plconfig.get_tag(key='shift_register_Station_WPHID',dfInformationModelRow=dfinformationModel.iloc[0], wphNumber=i)
-        else:            
-            tagType, tagAddress = plconfig.get_tag(key='shift_register_Loop_WPHID',dfInformationModelRow=dfinformationModel.iloc[0], wphNumber=i)
-        
-        daWph.append(makePrimitive(name="WphId", dataType=tagType,
-                                plcTag=f"//{tagAddress}"))
+        wphId, *nests = daWph
+        wphId.attrib['plcTag'] = f"//{next(tags)[1]}"
 
-        for j in range(1,nestCount+1):
-            """<da:Nest name="4" hmiId="965447">"""
-            daNest : etree.Element = etree.Element(f"{{{NAMESPACES['da']}}}Nest")
-            daWph.append(daNest)
-            daNest.attrib['name'] = f"{j}"
-            daNest.attrib['hmiId'] = f'{random.randint(10000,99999)}'
+        for daNest in nests:
+            for primitive in daNest:
+                primitive.attrib['plcTag'] = f"//{next(tags)[1]}"
 
-            if dfStation is not None:  
-                prefix = 'shift_register_Station_Nest_'                    
-            else:
-                prefix = 'shift_register_Loop_Nest_'
+    return daShiftRegister
 
-            for nestTag in ['Sts_Bad','Sts_Full','Sts_Good','Sts_Enable','RejectCode', 'StationReject']:
-                tagType, tagAddress = plconfig.get_tag(key=f'{prefix}{nestTag}',dfInformationModelRow=dfinformationModel.iloc[0], wphNumber=i, nestNumber=j)
-                daNest.append(makePrimitive(name=nestTag, dataType=tagType, 
-                        plcTag=f"//{tagAddress}"))
+def makeMachineElement(machine : ModelNode) -> etree.Element:
+    """da:Machine with its PackMl state and mode and its parameters if it has some, the stations and the loop shift register are added by the caller"""
+    row : ModelRow = machine.row
+    daMachine : etree.Element = etree.Element(f"{{{NAMESPACES['da']}}}Machine")
 
-    return daShiftRegister
+    #daMachine.attrib['name'] = f"{getPath(daMachine)}.M{row.Machine}"
+    daMachine.attrib['name'] = f"M{row.Machine}"
+    daMachine.attrib['scopeId'] = f"M{row.Machine}"    
+
+    # PackMlState and PackMlMode
+    machinePath = f"{row.AutomationDevice}/{daMachine.attrib['scopeId']}"
+    for name, dataType, tagAddress in elementTags(machinePath):
+        daMachine.append(makeGenericOutbound(name=name, dataType=dataType, 
+                            plcTag=f"//{tagAddress}"))
+
+    # parameters of the machine sheet
+    if elementParameters(machinePath)[0]:
+        daMachine.append(makeParameters(parametersName=f"Parameters", element=machinePath))
+
+    return daMachine
+
+@timed()
+def makeLoopShiftRegister(machine : ModelNode) -> etree.Element:
+    """The loop shift register only depends on the first row of the machine"""
+    return buildCached('loop', [repr(tuple(machine.row)), str(LOOP_WPH_COUNT), str(SHIFT_REGISTER_NEST_COUNT)],
+        lambda: makeshiftRegister(shiftRegisterName='Loop01', row=machine.row,wphCount=LOOP_WPH_COUNT,nestCount=SHIFT_REGISTER_NEST_COUNT))
 
-def makeMachine(daAutomationDeviceElement : etree.Element, dfinformationModel : pd.DataFrame, dfParameters : pd.DataFrame):
+@timed()
+def makeStationElement(station : ModelNode) -> etree.Element:
+    """da:Station of one station rows and parameters, reused from the build cache when the station did not change"""
+    def build() -> etree.Element:
+        container : etree.Element = etree.Element("Container")
+        makeStation(daMachineElement=container, station=station)
+        return container[0]
+
+    return buildCached('station', [station.rowsHash, stationParametersHash(station), str(STATION_WPH_COUNT), str(SHIFT_REGISTER_NEST_COUNT)], build)
+
+def stationParametersHash(station : ModelNode) -> str:
+    return elementParameters(f"{station.row.AutomationDevice}/M{station.row.Machine}/ST{station.row.Station}")[1]
+
+@timed()
+def makeMachine(daAutomationDeviceElement : etree.Element, machine : ModelNode):
     """
     <da:Machine name="Machine01" hmiId="29245" tags="Type/MachineState">        
         <da:GenericOutbound name="PackMlState" hmiId="59608">
@@ -424,31 +1054,16 @@ def makeMachine(daAutomationDeviceElement : etree.Element, dfinformationModel :
                 </da:GenericOutbound>
     </da:Machine>
     """
-    daMachine : etree.Element = etree.Element(f"{{{NAMESPACES['da']}}}Machine")
+    daMachine : etree.Element = makeMachineElement(machine=machine)
     daAutomationDeviceElement.append(daMachine)
 
-    #daMachine.attrib['name'] = f"{getPath(daMachine)}.M{dfinformationModel['Machine'].values[0]}"
-    daMachine.attrib['name'] = f"M{dfinformationModel['Machine'].values[0]}"
-    daMachine.attrib['scopeId'] = f"M{dfinformationModel['Machine'].values[0]}"    
-    daMachine.attrib['hmiId'] = f'{random.randint(10000,99999)}'
-    plconfig = PLC_CONFIG[dfinformationModel['AutomationDevice'].values[0]]
-    
-    tagType, tagAddress = plconfig.get_tag(key=f'Machine_PackMl_State',dfInformationModelRow=dfinformationModel.iloc[0])
-
-    daMachine.append(makeGenericOutbound(name='PackMlState', dataType=tagType, 
-                            plcTag=f"//{tagAddress}"))
-    tagType, tagAddress = plconfig.get_tag(key=f'Machine_PackMl_Mode',dfInformationModelRow=dfinformationModel.iloc[0])
-    daMachine.append(makeGenericOutbound(name='PackMlMode', dataType=tagType, 
-                            plcTag=f"//{tagAddress}"))
-
-    for groupName, groupeDataFrame in dfinformationModel.groupby('Station'):
-        makeStation(daMachineElement=daMachine, dfinformationModel=groupeDataFrame, dfParameters=dfParameters)
+    for station in machine.children:
+        daMachine.append(makeStationElement(station=station))
 
     #makeShiftRegisterLoop
-créé:    daMachine.append(makeshiftRegister(shiftRegisterName='Loop01', dfinformationModel=dfinformationModel,wphCount=160,nestCount=4))
-git@gitlab:Development/tr88/utilities/parsers.git
+    daMachine.append(makeLoopShiftRegister(machine=machine))
 
-def makeTwinCatComProtocol(daAutomationDeviceElement: etree.Element, dfinformationModel : pd.DataFrame):
+def makeTwinCatComProtocol(daAutomationDeviceElement: etree.Element, device : ModelRow):
     """
     <da:TwinCatCommProtocol name="TwinCATCommProtocol" simulationEnable="false" disableVitalityCheck="true" >
 				<TwinCat name="PlcComm" port="851" ipAddress="172.16.224.115" remoteAmsNetId="172.16.224.115.1.1" localAmsNetId="172.16.224.115.1.2" />
@@ -456,111 +1071,240 @@ def makeTwinCatComProtocol(daAutomationDeviceElement: etree.Element, dfinformati
     """
 
     daTwinCatCommProtocol : etree.Element = etree.Element(f"{{{NAMESPACES['da']}}}TwinCatCommProtocol")
-    daTwinCatCommProtocol.attrib['name'] = f"TwinCatProtocol{dfinformationModel['AutomationDevice'].values[0]}"
+    daTwinCatCommProtocol.attrib['name'] = f"TwinCatProtocol{device.AutomationDevice}"
     daTwinCatCommProtocol.attrib['simulationEnable'] = "false"
     daTwinCatCommProtocol.attrib['disableVitalityCheck'] = "true"
-    daTwinCatCommProtocol.attrib['hmiId'] = f'{random.randint(10000,99999)}'
 
     twincat : etree.Element = etree.Element("TwinCat")
-    twincat.attrib['name'] = f"PlcComm{dfinformationModel['AutomationDevice'].values[0]}"
+    twincat.attrib['name'] = f"PlcComm{device.AutomationDevice}"
     twincat.attrib['port'] = "851"
-    twincat.attrib['ipAddress'] = PLC_CONFIG[dfinformationModel['AutomationDevice'].values[0]].address
-    twincat.attrib['remoteAmsNetId'] = PLC_CONFIG[dfinformationModel['AutomationDevice'].values[0]].remoteAmsNetId
-    twincat.attrib['localAmsNetId'] = PLC_CONFIG[dfinformationModel['AutomationDevice'].values[0]].localAmsNetId
+    twincat.attrib['ipAddress'] = plcConfigs()[device.AutomationDevice].address
+    twincat.attrib['remoteAmsNetId'] = plcConfigs()[device.AutomationDevice].remoteAmsNetId
+    twincat.attrib['localAmsNetId'] = plcConfigs()[device.AutomationDevice].localAmsNetId
 
     daTwinCatCommProtocol.append(twincat)
     daAutomationDeviceElement.append(daTwinCatCommProtocol)
 
 
-def makeOpcUaComProtocol(daAutomationDeviceElement: etree.Element, dfinformationModel : pd.DataFrame):
+def makeOpcUaComProtocol(daAutomationDeviceElement: etree.Element, device : ModelRow):
 # <da:OpcUaCommProtocol name="opcUaCommProtocol"  ipAddress="192.168.100.100" port="4840"
 # simulationEnable="false" disableVitalityCheck="false" plcVitality="Application.ModBus_Array.MDD_a_bArrW4000[5209]" 
 # hmiVitality="Application.ModBus_Array.MDD_a_bArrW4000[51]" defaultNamespaceUri="OpcUaServer" logging="true" />
     daOpcUAProtocol : etree.Element = etree.Element(f"{{{NAMESPACES['da']}}}OpcUaCommProtocol")
-    daOpcUAProtocol.attrib['name'] = f"OpcUaProtocol{dfinformationModel['AutomationDevice'].values[0]}"
-    daOpcUAProtocol.attrib['port'] = str(PLC_CONFIG[dfinformationModel['AutomationDevice'].values[0]].port)    
-    daOpcUAProtocol.attrib['ipAddress'] = PLC_CONFIG[dfinformationModel['AutomationDevice'].values[0]].address
-    daOpcUAProtocol.attrib['defaultNamespaceUri'] = PLC_CONFIG[dfinformationModel['AutomationDevice'].values[0]].defaultNamespaceUri
+    daOpcUAProtocol.attrib['name'] = f"OpcUaProtocol{device.AutomationDevice}"
+    daOpcUAProtocol.attrib['port'] = str(plcConfigs()[device.AutomationDevice].port)    
+    daOpcUAProtocol.attrib['ipAddress'] = plcConfigs()[device.AutomationDevice].address
+    daOpcUAProtocol.attrib['defaultNamespaceUri'] = plcConfigs()[device.AutomationDevice].defaultNamespaceUri
     daOpcUAProtocol.attrib['logging'] = "true"
     daOpcUAProtocol.attrib['simulationEnable'] = "false"
     daOpcUAProtocol.attrib['disableVitalityCheck'] = "true"
-    daOpcUAProtocol.attrib['hmiId'] = f'{random.randint(10000,99999)}'
 
     daAutomationDeviceElement.append(daOpcUAProtocol)
 
-def makeEthernetIpComProtocol(daAutomationDeviceElement: etree.Element, dfinformationModel : pd.DataFrame):
+def makeEthernetIpComProtocol(daAutomationDeviceElement: etree.Element, device : ModelRow):
 # #<da:EthernetIPCommProtocol name="EthernetIPCommProtocol" simulationEnable="false" disableVitalityCheck="true" plcVitality="0:50:0" hmiVitality="0:51:0"> 
 #     <EthernetIP name="Machine" ipAddress="192.168.1.1"/> 
 # </da:EthernetIPCommProtocol>
     daEthernetIpComProtocol : etree.Element = etree.Element(f"{{{NAMESPACES['da']}}}EthernetIPCommProtocol")
-    daEthernetIpComProtocol.attrib['name'] = f"EthernetIPCommProtocol{dfinformationModel['AutomationDevice'].values[0]}"
+    daEthernetIpComProtocol.attrib['name'] = f"EthernetIPCommProtocol{device.AutomationDevice}"
     daEthernetIpComProtocol.attrib['simulationEnable'] = "false"
     daEthernetIpComProtocol.attrib['disableVitalityCheck'] = "true"
-    daEthernetIpComProtocol.attrib['hmiId'] = f'{random.randint(10000,99999)}'
 
     ethernetIp : etree.Element = etree.Element("EthernetIP")
-    ethernetIp.attrib['name'] = f"PlcComm{dfinformationModel['AutomationDevice'].values[0]}"
-    ethernetIp.attrib['ipAddress'] = PLC_CONFIG[dfinformationModel['AutomationDevice'].values[0]].address
+    ethernetIp.attrib['name'] = f"PlcComm{device.AutomationDevice}"
+    ethernetIp.attrib['ipAddress'] = plcConfigs()[device.AutomationDevice].address
     daEthernetIpComProtocol.append(ethernetIp)
 
     daAutomationDeviceElement.append(daEthernetIpComProtocol)
 
-def makeComProtocol(daAutomationDeviceElement: etree.Element, dfinformationModel : pd.DataFrame):
-    if dfinformationModel['AutomationDevice'].values[0] in PLC_CONFIG:
+def makeComProtocol(daAutomationDeviceElement: etree.Element, device : ModelRow):
+    if device.AutomationDevice in plcConfigs():
         
-        match PLC_CONFIG[dfinformationModel['AutomationDevice'].values[0]].plcType :
+        match plcConfigs()[device.AutomationDevice].plcType :
             case PlcType.BECKHOFF:
-                makeTwinCatComProtocol(daAutomationDeviceElement=daAutomationDeviceElement, dfinformationModel=dfinformationModel)
+                makeTwinCatComProtocol(daAutomationDeviceElement=daAutomationDeviceElement, device=device)
 
             case PlcType.OPCUA:
-                makeOpcUaComProtocol(daAutomationDeviceElement=daAutomationDeviceElement, dfinformationModel=dfinformationModel)
+                makeOpcUaComProtocol(daAutomationDeviceElement=daAutomationDeviceElement, device=device)
 
             case PlcType.ROCKWELL:
-                makeEthernetIpComProtocol(daAutomationDeviceElement=daAutomationDeviceElement, dfinformationModel=dfinformationModel)
+                makeEthernetIpComProtocol(daAutomationDeviceElement=daAutomationDeviceElement, device=device)
 
             case _:
-                print(f"Error PlcType {PLC_CONFIG[dfinformationModel['AutomationDevice'].values[0]].plcType} have no driver specified")
+                print(f"Error PlcType {plcConfigs()[device.AutomationDevice].plcType} have no driver specified")
 
     else:
-        print(f"Error the PLC {dfinformationModel['AutomationDevice'].values[0]} is not present in the CONFIG_PLC structure")
+        print(f"Error the PLC {device.AutomationDevice} is not present in the CONFIG_PLC structure")
 
+@timed()
 def makeAlarmsTextFiles(dfAlarms : pd.DataFrame):
 
     #openFile
-    alarmListXml = etree.parse("./BaseFiles/Alarms.xml")
+    alarmListXml = baseTree('Alarms.xml')
     alarmListEtree : etree.Element = alarmListXml.getroot()
 
-    alarmTranslationXml = etree.parse("./BaseFiles/en-US_Ima.Hmi.Module.Automation.Alarm.xml")
+    alarmTranslationXml = baseTree('en-US_Ima.Hmi.Module.Automation.Alarm.xml')
     alarmTranslationEtree : etree.Element = alarmTranslationXml.getroot().find('.//Translation')
     
-    for index, alarm in dfAlarms.iterrows():
-        #<da:Alarm name="_11_00_Alms.L2.0" scopeId="1" hmiId="1" displayName="Ima.Hmi.Module.Automation&gt;Alarm_5" severity="Alarm" />
-        daAlarm : etree.Element = etree.Element(f"{{{NAMESPACES['da']}}}Alarm")
-        daAlarm.attrib['name'] = alarm['AlarmInput']
-        daAlarm.attrib['scopeId'] = str(index +1)
-        daAlarm.attrib['hmiId'] = str(index +1)
-        daAlarm.attrib['displayName'] = f"Ima.Hmi.Module.Automation>{alarm['AlarmName']}"
-        """ Info = 1;
-        public const ushort Warning = 401;
-        public const ushort Anomaly = 601;
-        public const ushort Alarm = 801;
-        """
-        daAlarm.attrib['severity'] = "Alarm"
-        alarmListEtree.append(daAlarm)
+    #<da:Alarm name="_11_00_Alms.L2.0" scopeId="1" hmiId="1" displayName="Ima.Hmi.Module.Automation&gt;Alarm_5" severity="Alarm" />
+    """ Info = 1;
+    public const ushort Warning = 401;
+    public const ushort Anomaly = 601;
+    public const ushort Alarm = 801;
+    """
+    alarmTag = f"{{{NAMESPACES['da']}}}Alarm"
+    for alarmId, alarmInput, alarmName, alarmMessage in zip((dfAlarms.index + 1).astype(str), dfAlarms['AlarmInput'].values,
+                                                           dfAlarms['AlarmName'].values, dfAlarms['AlarmMessage'].values):
+        etree.SubElement(alarmListEtree, alarmTag, {'name' : alarmInput, 'scopeId' : alarmId, 'hmiId' : alarmId,
+                                                    'displayName' : f"Ima.Hmi.Module.Automation>{alarmName}", 'severity' : "Alarm"})
 
-        daItem : etree.Element = etree.Element(f"Item")
-        daItem.attrib['textId'] = f"{alarm['AlarmName']}"
-        daItem.text = alarm['AlarmMessage']
-        alarmTranslationEtree.append(daItem)
+        daItem : etree.Element = etree.SubElement(alarmTranslationEtree, "Item", {'textId' : f"{alarmName}"})
+        daItem.text = alarmMessage if isinstance(alarmMessage, str) else None
 
-    etree.indent(alarmListXml, '    ')
-    etree.indent(alarmTranslationXml, '    ')
+    writeXml(alarmListXml, PROJECT.alarmsFile)
+    writeXml(alarmTranslationXml, PROJECT.alarmsTranslationFile)
 
-    alarmListXml.write("./OutputFiles/serverConfiguration/02_Application/Data/Services/Alarms.xml", encoding="utf-8", xml_declaration=True)
-    alarmTranslationXml.write("./OutputFiles/serverConfiguration/02_Application/Translations/en-US_Ima.Hmi.Module.Automation.Alarm.xml", encoding="utf-8", xml_declaration=True)
 
+def stationNameIndex(device : ModelNode) -> dict[tuple[str, str], str]:
+    """(Machine, Station) -> StationName, the first row of each station wins"""
+    return {(str(station.row.Machine), str(station.row.Station)) : station.row.StationName for machine in device.children for station in machine.children}
 
-def makeAlarms(daAutomationDeviceElement: etree.Element, dfAlarms : pd.DataFrame, dfInformationModel : pd.DataFrame):
+def alarmWordTags(dfAlarms : pd.DataFrame, device : ModelNode) -> list[tuple[str, str]]:
+    """
+        (alarm word, plcTag) of the distinct alarm words, in order of first use. The bit is dropped from
+        the alarm input and the word is parsed in one pass over the column :
+            _01_Alms.L1     -> MAIN_PRG._01_Main.Alms.L1
+            _01_02_Alms.L1  -> MAIN_PRG._01_02_<StationName>.Alms.L1
+        the plcTag is None when the station is not in the information model.
+    """
+    alarmWords : pd.Series = pd.Series(dfAlarms['AlarmInput'].astype(str).str.rpartition('.')[0].unique(), dtype=object)
+    parts : pd.Series = alarmWords.str.split('_')
+    machines, seconds, members = parts.str[1].values, parts.str[2].fillna('').values, parts.str[-1].values
+
+    stationNames = stationNameIndex(device)
+    tags : list[tuple[str, str]] = []
+    for alarmWord, machine, second, member in zip(alarmWords.values, machines, seconds, members):
+        if not alarmWord:
+            continue
+        if "Alms" in second:
+            tags.append((alarmWord, f"MAIN_PRG._{machine}_Main.{member}"))
+            continue
+        stationName = stationNames.get((machine, second))
+        tags.append((alarmWord, None if stationName is None else f"MAIN_PRG._{machine}_{second}_{stationName}.{member}"))
+    return tags
+
+def unresolvedAlarmReason(alarmWord : str) -> str:
+    """Why alarmWordTags found no plcTag for an alarm word"""
+    parts : list[str] = alarmWord.split('_')
+    if len(parts) < 3:
+        return f"alarm input {alarmWord} is not _<Machine>_<Station>_<word> or _<Machine>_Alms.<word>"
+    return f"no station {parts[2]} in machine M{parts[1]}"
+
+def inputViolations(devices : list[ModelNode], dfAlarms : pd.DataFrame) -> list[Violation]:
+    """Actuators of a type without Actuator_CONFIG entry and alarm words without a station, the generation leaves them out"""
+    violations : list[Violation] = [
+        Violation('unsupported actuator', f"{row.AutomationDevice}/M{row.Machine}/ST{row.Station}/_{row.Machine}_{row.Station}_{row.Actuator}_{row.ActuatorName}",
+                  f"actuator type {row.ActuatorType} is not in Actuator_CONFIG")
+        for device in devices for machine in device.children for station in machine.children for actuator in station.children
+            if (row := actuator.row).ActuatorType not in Actuator_CONFIG]
+
+    for device in devices:
+        deviceAlarms = dfAlarms[dfAlarms['AutomationDevice'] == device.row.AutomationDevice]
+        violations += [Violation('unresolved alarm', f"{device.row.AutomationDevice}/Alarms/{alarmWord}", unresolvedAlarmReason(alarmWord))
+                        for alarmWord, alarmTag in alarmWordTags(dfAlarms=deviceAlarms, device=device) if alarmTag is None]
+    deviceNames = {device.row.AutomationDevice for device in devices}
+    violations += [Violation('unresolved alarm', f"{deviceName}/Alarms", f"{alarmCount} alarms of a PLC without information model rows")
+                    for deviceName, alarmCount in dfAlarms['AutomationDevice'].astype(object).value_counts(sort=False).items() if deviceName not in deviceNames]
+    return violations
+
+def modelWalked() -> bool:
+    """The generated model is walked by walkModel, for its validation, tag index or tag verification"""
+    return VALIDATE_MODEL or TAG_INDEX or VERIFY_TAGS
+
+@timed()
+def walkModel(source, devices : list[ModelNode], dfAlarms : pd.DataFrame):
+    """
+        Walk the generated model once, an element or a written file (see validation) : its elements with a
+        plcTag are kept in MODEL_TAG_REFERENCES and it is validated when VALIDATE_MODEL.
+    """
+    walk : ModelWalk = startModelWalk()
+    walk.walk(source)
+    finishModelWalk(walk, devices=devices, dfAlarms=dfAlarms)
+
+def startModelWalk() -> ModelWalk:
+    """Walk keeping the elements with a plcTag in MODEL_TAG_REFERENCES, fed by walkModel or the streaming writer"""
+    MODEL_TAG_REFERENCES.clear()
+    return ModelWalk(MODEL_TAG_REFERENCES)
+
+def finishModelWalk(walk : ModelWalk, devices : list[ModelNode], dfAlarms : pd.DataFrame):
+    if VALIDATE_MODEL:
+        validateModel(walk.violations + inputViolations(devices, dfAlarms))
+
+def validateModel(violations : list[Violation]) -> list[Violation]:
+    """Violations of the generated model and of the rows it was generated from, kept in MODEL_VIOLATIONS"""
+    MODEL_VIOLATIONS.clear()
+    MODEL_VIOLATIONS.extend(violations)
+    for violation in MODEL_VIOLATIONS:
+        print(f"Error {violation}")
+    count('validation errors', len(MODEL_VIOLATIONS))
+    return MODEL_VIOLATIONS
+
+@timed()
+def verifyPlcTags() -> TagVerification:
+    """
+        Read the plcTags of the last walked model on the OPC UA server of their PLC, kept in TAG_VERIFICATION.
+        The PLCs of another type are not verified, see tagverify.
+    """
+    global TAG_VERIFICATION
+
+    devices : dict[str, tuple[OpcuaConfig, dict[str, str]]] = {}
+    for reference in MODEL_TAG_REFERENCES:
+        plcConfig = plcConfigs().get(reference.device)
+        if plcConfig is not None and plcConfig.plcType == PlcType.OPCUA:
+            devices.setdefault(reference.device, (plcConfig, {}))[1].setdefault(reference.plcTag, reference.path)
+    for deviceName in sorted({reference.device for reference in MODEL_TAG_REFERENCES} - devices.keys()):
+        print(f"Warning the plcTags of {deviceName} are not verified, only the OPC UA PLCs are")
+
+    cache = loadTagCache(PROJECT.tagCacheFile if VERIFY_CACHE else None, maxAge=TAG_CACHE_MAX_AGE)
+    verifier = TagVerifier(concurrency=VERIFY_CONCURRENCY, batchSize=VERIFY_BATCH_SIZE, timeout=VERIFY_TIMEOUT, cache=cache)
+    try:
+        TAG_VERIFICATION = verifier.verify(devices)
+    except ImportError as e:
+        print(f"Error {e}")
+        TAG_VERIFICATION = None
+        return None
+
+    for check in TAG_VERIFICATION.missing:
+        print(f"Error missing plcTag {check}")
+    # a PLC that cannot be reached fails all its tags with the same message, reported once
+    errors = Counter((check.device, check.message) for check in TAG_VERIFICATION.errors)
+    for (deviceName, message), tagCount in errors.items():
+        print(f"Error {tagCount} plcTags of {deviceName} not verified : {message}")
+
+    if VERIFY_CACHE and not DRY_RUN:
+        cache.save(PROJECT.tagCacheFile)
+    count('plcTags verified', len(TAG_VERIFICATION.checks))
+    count('plcTags missing', len(TAG_VERIFICATION.missing))
+    print(TAG_VERIFICATION.summary())
+    return TAG_VERIFICATION
+
+@timed()
+def makeTagIndex(dfAlarms : pd.DataFrame):
+    """
+        plcTag and AlarmInput -> element index of the last walked model, written to PROJECT.tagIndexFile.
+        An alarm is the da:Alarm of Alarms.xml, its scopeId and hmiId are its row number.
+    """
+    entries : list[TagEntry] = [TagEntry(reference.plcTag, reference.device, reference.path,
+                                         int(reference.hmiId) if reference.hmiId else None, 'plcTag')
+                                    for reference in MODEL_TAG_REFERENCES]
+    entries += [TagEntry(alarmInput, deviceName, f"Alarms/{alarmId}", alarmId, 'alarm')
+                    for alarmId, alarmInput, deviceName in zip((dfAlarms.index + 1).tolist(), dfAlarms['AlarmInput'].tolist(),
+                                                               dfAlarms['AutomationDevice'].astype(object).tolist())
+                        if isinstance(alarmInput, str)]
+    count('tag index entries', writeTagIndex(PROJECT.tagIndexFile, entries))
+
+@timed()
+def makeAlarms(daAutomationDeviceElement: etree.Element, dfAlarms : pd.DataFrame, device : ModelNode):
 
     """ <Folder name="Alarms">
             <Primitive name="_01_00_Alms.L1" dataType="Int32" plcTag="_01_00_Alms.L1" />
@@ -573,7 +1317,7 @@ def makeAlarms(daAutomationDeviceElement: etree.Element, dfAlarms : pd.DataFrame
 
     datatype = "None"
     #depending on the com protocols the datatype of the alarms can change
-    match PLC_CONFIG[dfInformationModel['AutomationDevice'].values[0]].plcType :
+    match plcConfigs()[device.row.AutomationDevice].plcType :
             case PlcType.BECKHOFF:
                 datatype = "Int32"
 
@@ -587,99 +1331,516 @@ def makeAlarms(daAutomationDeviceElement: etree.Element, dfAlarms : pd.DataFrame
                 datatype = "Int32"
 
             case _:
-                print(f"Error PlcType {PLC_CONFIG[dfInformationModel['AutomationDevice'].values[0]].plcType} have no driver specified")
+                print(f"Error PlcType {plcConfigs()[device.row.AutomationDevice].plcType} have no driver specified")
     
-    for alarmAddress  in dfAlarms["AlarmInput"].apply(lambda x : x[0:x.rindex(".")]).unique():
-        try:
-            alarmSplited : list[str] = alarmAddress.split('_')[1:]
-            alarmAddr : str = ""
-            if "Alms" in alarmSplited[1]  :
-                alarmAddr = f"MAIN_PRG._{infoModelRow['Machine']}_Main.{alarmSplited[-1]}"        
-            else:
-                infoModelRow = dfInformationModel.loc[(dfInformationModel['Machine'] == alarmSplited[0]) & (dfInformationModel['Station'] == alarmSplited[1])].head(1).to_dict(orient="records")[0]
-                alarmAddr = f"MAIN_PRG._{infoModelRow['Machine']}_{infoModelRow['Station']}_{infoModelRow['StationName']}.{alarmSplited[-1]}"        
-            folder.append(makePrimitive(name=alarmAddress, dataType=datatype, plcTag=alarmAddr))
-        except Exception as e:
-            print(f"Error during Alarm creation : {e}")
+    for alarmAddress, alarmAddr in alarmWordTags(dfAlarms=dfAlarms, device=device):
+        if alarmAddr is None:
+            # with VALIDATE_MODEL the validation reports it with the other violations
+            if not VALIDATE_MODEL:
+                print(f"Error during Alarm creation : {device.row.AutomationDevice} {alarmAddress} {unresolvedAlarmReason(alarmAddress)}")
+            continue
+        folder.append(makePrimitive(name=alarmAddress, dataType=datatype, plcTag=alarmAddr))
 
     daAutomationDeviceElement.append(folder)
 
-def makeAutomationDevice(daApplicationElement : etree.Element, dfinformationModel : pd.DataFrame, dfAlarms : pd.DataFrame, dfParameters : pd.DataFrame):
+def makeAutomationDeviceElement(device : ModelNode) -> etree.Element:
+    """da:AutomationDevice with its com protocol, the machines and the alarms are added by the caller"""
+    row : ModelRow = device.row
     daAutomationDevice : etree.Element = etree.Element(f"{{{NAMESPACES['da']}}}AutomationDevice")
-    daAutomationDevice.attrib['name'] = dfinformationModel['AutomationDevice'].values[0]    
-    daAutomationDevice.attrib['shortcut'] = dfinformationModel['AutomationDevice'].values[0]        
-    daAutomationDevice.attrib['hmiId'] = f'{random.randint(10000,99999)}'
+    daAutomationDevice.attrib['name'] = row.AutomationDevice    
+    daAutomationDevice.attrib['shortcut'] = row.AutomationDevice        
+
+    if row.AutomationDevice in plcConfigs():
+        daAutomationDevice.attrib['rootAddress'] = row.AutomationDevice
+
+    makeComProtocol(daAutomationDeviceElement=daAutomationDevice, device=row)    
 
-    if dfinformationModel['AutomationDevice'].values[0] in PLC_CONFIG:
-        daAutomationDevice.attrib['rootAddress'] = dfinformationModel['AutomationDevice'].values[0]
+    return daAutomationDevice
 
-    makeComProtocol(daAutomationDeviceElement=daAutomationDevice, dfinformationModel=dfinformationModel)    
+@timed()
+def makeAutomationDevice(daApplicationElement : etree.Element, device : ModelNode, dfAlarms : pd.DataFrame):
+    daAutomationDevice : etree.Element = makeAutomationDeviceElement(device=device)
 
-    for groupName, groupeDataFrame in dfinformationModel.groupby('Machine'):
-        makeMachine(daAutomationDeviceElement=daAutomationDevice, dfinformationModel=groupeDataFrame, dfParameters=dfParameters)
+    for machine in device.children:
+        makeMachine(daAutomationDeviceElement=daAutomationDevice, machine=machine)
 
-    makeAlarms(daAutomationDeviceElement=daAutomationDevice, dfAlarms=dfAlarms, dfInformationModel=dfinformationModel)
+    makeAlarms(daAutomationDeviceElement=daAutomationDevice, dfAlarms=dfAlarms, device=device)
 
     daApplicationElement.append(daAutomationDevice)
 
+def useWorkerCache(cache : BuildCache):
+    """Build cache of a worker process, its statistics are counted from zero and returned to the parent"""
+    global BUILD_CACHE
+    BUILD_CACHE = cache
+    if cache is not None:
+        cache.statistics = CacheStatistics()
+
+def useWorkerProject(paths : ProjectPaths, settings : dict[str, object], configs : dict[str, PlcConfig]):
+    """
+        Generation worker initializer : the project, settings and PLC configs of the parent. With the spawn
+        start method (Windows, macOS) the worker starts from the defaults of the module, the project folder
+        of the current directory.
+    """
+    global SUBTREE_MEMO
+    globals().update(settings)
+    configureProject(paths)
+    plcConfigs().update(configs)
+    # a forked worker has a copy of the memo of the parent, the subtrees it builds go back through the parent
+    SUBTREE_MEMO = None
+
+def useWorkerTags(tags : tuple[dict, dict]):
+    """Tag table and parameters of the PLC of a worker, see deviceTags"""
+    TAG_TABLE.clear()
+    TAG_TABLE.update(tags[0])
+    PARAMETER_INDEX.clear()
+    PARAMETER_INDEX.update(tags[1])
+
+def automationDeviceWorker(device : ModelNode, tags : tuple[dict, dict], dfAlarms : pd.DataFrame, cache : BuildCache = None) -> (bytes, CacheStatistics):
+    useWorkerCache(cache)
+    useWorkerTags(tags)
+    container : etree.Element = etree.Element("Container")
+    makeAutomationDevice(daApplicationElement=container, device=device, dfAlarms=dfAlarms)
+    return etree.tostring(container[0]), cache.statistics if cache is not None else None
+
+def machineWorker(machine : ModelNode, tags : tuple[dict, dict], cache : BuildCache = None) -> (bytes, CacheStatistics):
+    useWorkerCache(cache)
+    useWorkerTags(tags)
+    container : etree.Element = etree.Element("Container")
+    makeMachine(daAutomationDeviceElement=container, machine=machine)
+    return etree.tostring(container[0]), cache.statistics if cache is not None else None
+
+@timed()
+def makeAutomationDevicesParallel(daApplicationElement : etree.Element, devices : list[ModelNode], dfAlarms : pd.DataFrame, workers : int):
+    """
+        Build the AutomationDevice subtrees in `workers` processes. With fewer PLCs than workers the
+        machines are the unit of work and the parent assembles each device around them. Workers get the
+        index nodes and their part of the tag table, and return serialized subtrees which are spliced in
+        index order, the tree is the one of the serial build.
+    """
+    devices = [(device, deviceTags(device.row.AutomationDevice), dfAlarms[dfAlarms['AutomationDevice'] == device.row.AutomationDevice])
+                for device in devices]
+
+    def collect(future) -> etree.Element:
+        data, statistics = future.result()
+        if statistics is not None:
+            BUILD_CACHE.statistics.merge(statistics)
+        return etree.fromstring(data)
+
+    settings = {name : globals()[name] for name in GENERATION_WORKER_SETTINGS}
+    with ProcessPoolExecutor(max_workers=workers, initializer=useWorkerProject, initargs=(PROJECT, settings, plcConfigs())) as executor:
+        if len(devices) >= workers:
+            futures = [executor.submit(automationDeviceWorker, device, tags, deviceAlarms, BUILD_CACHE)
+                        for device, tags, deviceAlarms in devices]
+            for future in futures:
+                daApplicationElement.append(collect(future))
+            return
+
+        machineFutures = [[executor.submit(machineWorker, machine, tags, BUILD_CACHE) for machine in device.children]
+                                for device, tags, _ in devices]
+
+        for (device, _, deviceAlarms), futures in zip(devices, machineFutures):
+            daAutomationDevice : etree.Element = makeAutomationDeviceElement(device=device)
+            for future in futures:
+                daAutomationDevice.append(collect(future))
+            makeAlarms(daAutomationDeviceElement=daAutomationDevice, dfAlarms=deviceAlarms, device=device)
+            daApplicationElement.append(daAutomationDevice)
+
+def makeInclude(file : str, ignoreIfMissing : bool = False) -> etree.Element:
+    """Include element of the HMI server, `file` is relative to the Data folder"""
+    includeElement : etree.Element = etree.Element(f"{{{NAMESPACES['']}}}Include")
+    includeElement.attrib['file'] = file
+    if ignoreIfMissing:
+        includeElement.attrib['ignoreIfMissing'] = "true"
+    return includeElement
+
 def addIncludeProjectTags(maininformationmodelElement : etree.Element):
 
     tagsContainer : etree.Element = maininformationmodelElement.find('.//TagsContainer',NAMESPACES)
     
-    includeElement : etree.Element = etree.Element(f"{{{NAMESPACES['']}}}Include")
-    #daAutomationDevice.attrib['name'] = dfinformationModel['AutomationDevice'].values[0]
-    includeElement.attrib['file'] = "Services/ProjectTags.xml"
-    includeElement.attrib['ignoreIfMissing'] = "true"
+    includeElement : etree.Element = makeInclude("Services/ProjectTags.xml", ignoreIfMissing=True)
 
     tagsContainer.append(includeElement)
 
     #maininformationmodelElement.append(tagsContainer)
 
-def generateMainInformationModelFromDataFrames(dfinformationModel : pd.DataFrame, dfParameters : pd.DataFrame, dfAlarms : pd.DataFrame) -> etree.Element:
-    
+@timed()
+def generateMainInformationModelFromDataFrames(dfinformationModel : pd.DataFrame, dfParameters : pd.DataFrame, dfAlarms : pd.DataFrame, allocator : HmiIdAllocator = None, workers : int = 1,
+                                               alarmsTextFiles : bool = True) -> etree.Element:
+    """
+        With `workers` > 1 the AutomationDevice subtrees are built in worker processes, the written file is the same.
+        The alarms text files are written too unless `alarmsTextFiles` is False.
+    """
+
     etree.register_namespace('da',NAMESPACES['da'])
     etree.register_namespace('xlink',"http://www.w3.org/1999/xlink")
 
-    maininformationmodelFile = etree.parse("./BaseFiles/MainInformationModelBase.xml")
+    maininformationmodelFile = baseTree('MainInformationModelBase.xml')
 
     maininformationmodel : etree.Element = maininformationmodelFile.getroot()
     
     daApplicationElement : etree.Element = maininformationmodel.find('.//da:Application', NAMESPACES)
 
-    for group_name, group_dataframe in  dfinformationModel.groupby('AutomationDevice'):
+    useTagTable(dfinformationModel, dfParameters)
+    devices : list[ModelNode] = makeModelIndex(dfinformationModel)
 
-        subDfAlarms = dfAlarms[dfAlarms['AutomationDevice'] == group_name]
-        #make automation device for this PLC
-        makeAutomationDevice(daApplicationElement=daApplicationElement,
-                            dfinformationModel=group_dataframe,
-                            dfAlarms=subDfAlarms,
-                            dfParameters=dfParameters)
+    if workers > 1 and sum(len(device.children) for device in devices) > 1:
+        makeAutomationDevicesParallel(daApplicationElement=daApplicationElement, devices=devices,
+                                      dfAlarms=dfAlarms, workers=workers)
+    else:
+        for device in devices:
+
+            subDfAlarms = dfAlarms[dfAlarms['AutomationDevice'] == device.row.AutomationDevice]
+            #make automation device for this PLC
+            makeAutomationDevice(daApplicationElement=daApplicationElement,
+                                device=device,
+                                dfAlarms=subDfAlarms)
+
+    # hmiIds from the scope paths, once the whole application is built
+    allocator = allocator if allocator is not None else HmiIdAllocator()
+    with stage('assignHmiIds'):
+        for daAutomationDevice in daApplicationElement:
+            assignHmiIds(element=daAutomationDevice, allocator=allocator)
 
-    makeAlarmsTextFiles(dfAlarms=dfAlarms)
+    if alarmsTextFiles:
+        makeAlarmsTextFiles(dfAlarms=dfAlarms)
 
     # add the include of the ProjectTagsFile in tagsManager
     addIncludeProjectTags(maininformationmodelElement=maininformationmodel)
 
-    etree.indent(maininformationmodel, '    ')
-    maininformationmodelFile.write("./OutputFiles/serverConfiguration/02_Application/Data/MainInformationModel.xml", encoding="utf-8", xml_declaration=True)
+    if modelWalked():
+        walkModel(maininformationmodel, devices=devices, dfAlarms=dfAlarms)
+
+    writeMainInformationModel(maininformationmodelFile)
 
     return maininformationmodel
 
+def copyWithIncludes(element : etree.Element, parent : etree.Element, includes : dict[etree.Element, str], containers : set[etree.Element]):
+    """Append a copy of `element` to `parent`, the `includes` elements below it replaced by their Include element"""
+    if element in includes:
+        parent.append(makeInclude(includes[element]))
+    elif element not in containers:
+        parent.append(deepcopy(element))
+    else:
+        copy : etree.Element = etree.SubElement(parent, element.tag, element.attrib)
+        copy.text = element.text
+        for child in element:
+            copyWithIncludes(child, copy, includes, containers)
+
+def splitIncludeFiles(maininformationmodel : etree.Element, mode : str) -> dict[str, etree._ElementTree]:
+    """
+        The da:AutomationDevice subtrees, and with mode 'machine' their da:Machine subtrees, as include files
+        {file : tree}, main file first. In its file a subtree is replaced by an Include element, its own file
+        has a root of its parent's tag like Services/ProjectTags.xml has a TagsContainer root. The trees are
+        copies, removing subtrees of a large document is much slower and the caller keeps the whole model.
+    """
+    includes : dict[etree.Element, str] = {}
+    daApplicationElement : etree.Element = maininformationmodel.find('.//da:Application', NAMESPACES)
+    for daAutomationDevice in daApplicationElement.findall('da:AutomationDevice', NAMESPACES):
+        deviceName : str = daAutomationDevice.get('name')
+        includes[daAutomationDevice] = f"{INCLUDE_FOLDER}/{deviceName}.xml"
+        if mode == 'machine':
+            for daMachine in daAutomationDevice.findall('da:Machine', NAMESPACES):
+                includes[daMachine] = f"{INCLUDE_FOLDER}/{deviceName}/{daMachine.get('name')}.xml"
+    containers : set[etree.Element] = {ancestor for element in includes for ancestor in element.iterancestors()}
+
+    mainRoot : etree.Element = etree.Element(maininformationmodel.tag, maininformationmodel.attrib, nsmap=maininformationmodel.nsmap)
+    mainRoot.text = maininformationmodel.text
+    for child in maininformationmodel:
+        copyWithIncludes(child, mainRoot, includes, containers)
+    trees : dict[str, etree._ElementTree] = {None : etree.ElementTree(mainRoot)}
+
+    for element, file in includes.items():
+        parent : etree.Element = element.getparent()
+        includeRoot : etree.Element = etree.Element(parent.tag, nsmap=parent.nsmap)
+        copy : etree.Element = etree.SubElement(includeRoot, element.tag, element.attrib)
+        copy.text = element.text
+        for child in element:
+            copyWithIncludes(child, copy, includes, containers)
+        trees[file] = etree.ElementTree(includeRoot)
+    return trees
+
+def removeStaleIncludeFiles(files : set[str]):
+    """
+        Include files of a previous run that are not part of this one, removed devices or machines or every
+        file once the output is not split anymore. The folders left empty are removed too.
+    """
+    includeFolder : str = os.path.join(PROJECT.dataFolder, INCLUDE_FOLDER)
+    for folder, _, names in os.walk(includeFolder, topdown=False):
+        for name in names:
+            path : str = os.path.join(folder, name)
+            if os.path.relpath(path, PROJECT.dataFolder).replace(os.sep, '/') not in files:
+                OUTPUT_CHANGES[path] = {'status' : 'removed'}
+                if not DRY_RUN:
+                    os.remove(path)
+        if not DRY_RUN and not os.listdir(folder):
+            os.rmdir(folder)
+
+@timed()
+def writeMainInformationModel(maininformationmodelFile : etree._ElementTree):
+    """
+        Write MainInformationModel.xml, with SPLIT_OUTPUT as a main file of Include elements and one file per
+        PLC (and machine) the HMI server can load, and we can redeploy, independently. hmiIds are already
+        assigned, they are the ones of the single file. The files are written by OUTPUT_WORKERS threads, lxml
+        releases the GIL while serializing.
+    """
+    if not SPLIT_OUTPUT:
+        writeXml(maininformationmodelFile, PROJECT.mainInformationModelFile)
+        removeStaleIncludeFiles(set())
+        return
 
-def recursiveDiscoverCreateTags(element : etree.Element, tagsDataFrame : pd.DataFrame):
+    trees : dict[str, etree._ElementTree] = splitIncludeFiles(maininformationmodelFile.getroot(), SPLIT_OUTPUT)
+    outputs : list[tuple[etree._ElementTree, str]] = [(tree, os.path.join(PROJECT.dataFolder, *file.split('/')) if file else PROJECT.mainInformationModelFile)
+                                                        for file, tree in trees.items()]
+    if not DRY_RUN:
+        for folder in {os.path.dirname(path) for _, path in outputs}:
+            os.makedirs(folder, exist_ok=True)
+
+    with ThreadPoolExecutor(max_workers=OUTPUT_WORKERS) as executor:
+        for future in [executor.submit(writeXml, tree, path) for tree, path in outputs]:
+            future.result()
+
+    count('include files', len(trees) - 1)
+    removeStaleIncludeFiles({file for file in trees if file})
+
+def writeXml(xmlTree : etree._ElementTree, path : str):
+    """Indent and serialize an output file, with its declaration, see commitOutput"""
+    with stage('indent'):
+        etree.indent(xmlTree, '    ')
+    with stage('serialize'):
+        data : bytes = etree.tostring(xmlTree, encoding="UTF-8", xml_declaration=True)
+    commitOutput(path, data=data)
+
+def commitOutput(path : str, data : bytes = None, tmpPath : str = None):
+    """
+        Replace the output `path` with `data`, or the file `tmpPath` written next to it, when the content
+        hash differs. The file is replaced atomically, a reader never sees it half written, and an unchanged
+        output keeps its modification time.
+    """
+    with stage('compare'):
+        newHash = hashlib.sha256(data).hexdigest() if data is not None else hashFile(tmpPath)
+        oldHash = hashFile(path) if os.path.exists(path) else None
+
+    if newHash == oldHash:
+        OUTPUT_CHANGES[path] = {'status' : 'unchanged'}
+        count('outputs unchanged')
+        if tmpPath is not None:
+            os.remove(tmpPath)
+        return
 
-    for children in element.getchildren():
-        index = 0
-        try:
-            index = children.tag.rindex('}')+1
-        except:
-            pass
-        tagsDataFrame.loc[len(tagsDataFrame)] ={'name': children.tag[index:], 'displayName' : f"Ima.Hmi.Module.Automation>Type_{children.tag[index:]}"}
-        
-        recursiveDiscoverCreateTags(element=children,tagsDataFrame=tagsDataFrame)
+    OUTPUT_CHANGES[path] = {'status' : 'created' if oldHash is None else 'changed'}
+    if oldHash is not None and OUTPUT_DIFF:
+        with stage('diff'):
+            diff : OutputDiff = diffXml(path, BytesIO(data) if data is not None else tmpPath)
+        OUTPUT_DIFFS[path] = diff
+        OUTPUT_CHANGES[path].update(diff.counts())
+        print(f"{os.path.basename(path)} : {diff.summary()}")
+
+    if DRY_RUN:
+        if tmpPath is not None:
+            os.remove(tmpPath)
+        return
+
+    with stage('write'):
+        if data is not None:
+            tmpPath = f"{path}.tmp"
+            with open(tmpPath, 'wb') as fh:
+                fh.write(data)
+        os.replace(tmpPath, path)
+    count('bytes written', os.path.getsize(path))
+
+def localName(element : etree.Element) -> str:
+    return etree.QName(element).localname
+
+# namespace declarations at the start of a serialized element
+NAMESPACE_DECLARATIONS = re.compile(rb'^<[^\s>/]+((?: xmlns(?::[\w.-]+)?="[^"]*")+)')
+NAMESPACE_DECLARATION = re.compile(rb' xmlns(?::([\w.-]+))?="([^"]*)"')
+
+def withoutDeclarations(data : bytes, nsmap : dict[str, str]) -> bytes:
+    """Drop the namespace declarations of the first start tag that `nsmap` already declares"""
+    declarations = NAMESPACE_DECLARATIONS.match(data)
+    if declarations is None:
+        return data
+    kept = b''.join(declaration.group(0) for declaration in NAMESPACE_DECLARATION.finditer(declarations.group(1))
+                    if nsmap.get(declaration.group(1).decode() if declaration.group(1) else None) != declaration.group(2).decode())
+    return data[:declarations.start(1)] + kept + data[declarations.end(1):]
+
+class StreamingModelWriter:
+    """
+        Writes MainInformationModel.xml subtree by subtree with etree.xmlfile. Each subtree is indented at
+        its depth and written as soon as it is built, so memory holds one station instead of the whole plant.
+        The written elements are counted per local name, the same statistics collectTreeStatistics
+        returns for a tree, their names feed ProjectTags.xml. hmiIds are allocated in document order,
+        like for the tree, so both modes give the same ids. With a ModelWalk every written element is
+        walked below its open ancestors, as walkModel walks the tree.
+    """
+
+    def __init__(self, xf, fh, nsmap : dict[str, str], allocator : HmiIdAllocator, indent : str = '    ', walk : ModelWalk = None) -> None:
+        self.xf = xf
+        self.fh = fh
+        # in-scope namespaces of da:Application, where the subtrees are written
+        self.nsmap = nsmap
+        self.allocator = allocator
+        self.indent = indent
+        self.walk = walk
+        self.statistics : Counter = Counter()
+
+    def newLine(self, level : int):
+        self.xf.write(f"\n{self.indent * level}")
+
+    def writeElement(self, element : etree.Element, nsmap : dict[str, str]):
+        """
+            Serialize the element as the tree output does. xf.write would declare again the namespaces of
+            the open ancestors (`nsmap`) on every subtree, they are dropped and the bytes written after the
+            pending xmlfile output.
+        """
+        self.xf.flush()
+        self.fh.write(withoutDeclarations(etree.tostring(element, encoding="utf-8"), nsmap))
+
+    def opened(self, element : etree.Element, parent : OpenElement) -> OpenElement:
+        """An element written open with xf.element, walked before its children"""
+        return self.walk.visit(element, parent) if self.walk is not None else None
+
+    def writeSubtree(self, element : etree.Element, level : int, parentPath : str = '', parent : OpenElement = None):
+        assignHmiIds(element=element, allocator=self.allocator, parentPath=parentPath)
+        if self.walk is not None:
+            self.walk.walk(element, parent)
+        self.newLine(level)
+        etree.indent(element, self.indent, level=level)
+        element.tail = None
+        self.writeElement(element, self.nsmap)
+        self.statistics.update(child.tag.rpartition('}')[2] for child in element.iter(etree.Element))
+
+    def writeAutomationDevice(self, device : ModelNode, dfAlarms : pd.DataFrame, level : int, parent : OpenElement = None):
+        daAutomationDevice : etree.Element = makeAutomationDeviceElement(device=device)
+        self.statistics[localName(daAutomationDevice)] += 1
+        devicePath = scopeSegment(daAutomationDevice)
+        daAutomationDevice.attrib['hmiId'] = str(self.allocator.allocate(devicePath))
+        deviceOpen : OpenElement = self.opened(daAutomationDevice, parent)
+
+        self.newLine(level)
+        with self.xf.element(daAutomationDevice.tag, daAutomationDevice.attrib):
+            for child in daAutomationDevice:
+                self.writeSubtree(child, level+1, devicePath, deviceOpen)
+
+            for machine in device.children:
+                self.writeMachine(machine=machine, level=level+1, parentPath=devicePath, parent=deviceOpen)
+
+            container : etree.Element = etree.Element("Container")
+            makeAlarms(daAutomationDeviceElement=container, dfAlarms=dfAlarms, device=device)
+            for child in container:
+                self.writeSubtree(child, level+1, devicePath, deviceOpen)
+            self.newLine(level)
+
+    def writeMachine(self, machine : ModelNode, level : int, parentPath : str, parent : OpenElement = None):
+        daMachine : etree.Element = makeMachineElement(machine=machine)
+        self.statistics[localName(daMachine)] += 1
+        machinePath = f"{parentPath}/{scopeSegment(daMachine)}"
+        daMachine.attrib['hmiId'] = str(self.allocator.allocate(machinePath))
+        machineOpen : OpenElement = self.opened(daMachine, parent)
+
+        self.newLine(level)
+        with self.xf.element(daMachine.tag, daMachine.attrib):
+            for child in daMachine:
+                self.writeSubtree(child, level+1, machinePath, machineOpen)
+
+            for station in machine.children:
+                self.writeSubtree(makeStationElement(station=station), level+1, machinePath, machineOpen)
+
+            self.writeSubtree(makeLoopShiftRegister(machine=machine), level+1, machinePath, machineOpen)
+            self.newLine(level)
+
+    def writeDocument(self, element : etree.Element, daApplicationElement : etree.Element, writeApplication : Callable[[int, OpenElement], None],
+                      level : int = 0, parent : OpenElement = None):
+        """Copy the base file elements, the content of da:Application is written by writeApplication"""
+        parentElement : etree.Element = element.getparent()
+        nsmap = {prefix : uri for prefix, uri in element.nsmap.items() if parentElement is None or parentElement.nsmap.get(prefix) != uri}
+        elementOpen : OpenElement = self.opened(element, parent if parent is not None else OpenElement('', {}, None, None))
+
+        with self.xf.element(element.tag, element.attrib, nsmap=nsmap):
+            if element is daApplicationElement:
+                for child in element:
+                    self.writeSubtree(child, level+1, parent=elementOpen)
+                writeApplication(level+1, elementOpen)
+                self.newLine(level)
+                return
+
+            if element.text:
+                self.xf.write(element.text)
+            for child in element:
+                if child is daApplicationElement or daApplicationElement in child.iterdescendants():
+                    self.writeDocument(child, daApplicationElement, writeApplication, level+1, elementOpen)
+                    if child.tail:
+                        self.xf.write(child.tail)
+                else:
+                    if self.walk is not None:
+                        self.walk.walk(child, elementOpen)
+                    self.writeElement(child, element.nsmap)
+
+@timed()
+def generateMainInformationModelStreaming(dfinformationModel : pd.DataFrame, dfParameters : pd.DataFrame, dfAlarms : pd.DataFrame, allocator : HmiIdAllocator = None,
+                                          alarmsTextFiles : bool = True) -> Counter:
+    """
+        Same output as generateMainInformationModelFromDataFrames, written incrementally instead of building
+        the whole tree. Returns the element counts per local name under da:Application.
+    """
+    etree.register_namespace('da',NAMESPACES['da'])
+    etree.register_namespace('xlink',"http://www.w3.org/1999/xlink")
 
-def makeProjectHmiTypeTags(maininformationmodel : etree.Element):
-    projectTagsFile = etree.parse("./BaseFiles/ProjectTags.xml")
+    maininformationmodelFile = baseTree('MainInformationModelBase.xml')
+
+    maininformationmodel : etree.Element = maininformationmodelFile.getroot()
+    
+    daApplicationElement : etree.Element = maininformationmodel.find('.//da:Application', NAMESPACES)
+
+    # add the include of the ProjectTagsFile in tagsManager
+    addIncludeProjectTags(maininformationmodelElement=maininformationmodel)
+
+    etree.indent(maininformationmodel, '    ')
+
+    useTagTable(dfinformationModel, dfParameters)
+    devices : list[ModelNode] = makeModelIndex(dfinformationModel)
+
+    def writeApplication(level : int, parent : OpenElement):
+        for device in devices:
+            writer.writeAutomationDevice(device=device,
+                                        dfAlarms=dfAlarms[dfAlarms['AutomationDevice'] == device.row.AutomationDevice],
+                                        level=level, parent=parent)
+
+    # the model is walked as it is written, not parsed again
+    walk : ModelWalk = startModelWalk() if modelWalked() else None
+    # written next to the output, then committed like writeXml
+    tmpPath = f"{PROJECT.mainInformationModelFile}.tmp"
+    with open(tmpPath, "wb") as fh:
+        fh.write(b"<?xml version='1.0' encoding='UTF-8'?>\n")
+        # unbuffered, the subtrees are written to fh between the xmlfile writes
+        with etree.xmlfile(fh, encoding="utf-8", buffered=False) as xf:
+            writer = StreamingModelWriter(xf, fh, nsmap=daApplicationElement.nsmap,
+                                          allocator=allocator if allocator is not None else HmiIdAllocator(), walk=walk)
+            writer.writeDocument(maininformationmodel, daApplicationElement, writeApplication)
+    if walk is not None:
+        finishModelWalk(walk, devices=devices, dfAlarms=dfAlarms)
+    commitOutput(PROJECT.mainInformationModelFile, tmpPath=tmpPath)
+    removeStaleIncludeFiles(set())
+
+    if alarmsTextFiles:
+        makeAlarmsTextFiles(dfAlarms=dfAlarms)
+
+    return writer.statistics
+
+
+def collectTreeStatistics(element : etree.Element) -> Counter:
+    """Element count per local name under `element` (itself excluded), in a single iterative pass"""
+    return Counter(child.tag.rpartition('}')[2] for child in element.iterdescendants(etree.Element))
+
+def logTreeStatistics(statistics : Counter):
+    print(f"Information model : {sum(statistics.values())} elements")
+    for name, count in statistics.most_common():
+        print(f"    {name} : {count}")
+
+@timed()
+def makeProjectHmiTypeTags(maininformationmodel : etree.Element = None, tagNames : Iterable[str] = None):
+    """Type tags from the elements of da:Application, or from already collected names (tree statistics, streaming writer)"""
+    projectTagsFile = baseTree('ProjectTags.xml')
 
     projectTagsModel : etree.Element = projectTagsFile.getroot()
 
@@ -689,30 +1850,121 @@ def makeProjectHmiTypeTags(maininformationmodel : etree.Element):
 
     projectTagsModel.append(tagsFolder)
 
-    daApplicationElement : etree.Element = maininformationmodel.find('.//da:Application', NAMESPACES)
-
-    tagsDataFrame :pd.DataFrame = pd.DataFrame(columns=['name', 'displayName'])
+    if tagNames is None:
+        daApplicationElement : etree.Element = maininformationmodel.find('.//da:Application', NAMESPACES)
 
-    recursiveDiscoverCreateTags(element=daApplicationElement, tagsDataFrame=tagsDataFrame)
+        tagNames = collectTreeStatistics(daApplicationElement)
 
-    for groupName, dataframe in tagsDataFrame.groupby(['name', 'displayName']):
+    for name in sorted(tagNames):
 
         tag : etree.Element = etree.Element(f"{{{NAMESPACES['']}}}Tag")
-        tag.attrib['name'] = groupName[0]
-        tag.attrib['displayName'] = groupName[1]
+        tag.attrib['name'] = name
+        tag.attrib['displayName'] = f"Ima.Hmi.Module.Automation>Type_{name}"
 
         tagsFolder.append(tag)
 
-    etree.indent(projectTagsModel, '    ')
-    projectTagsFile.write("./OutputFiles/serverConfiguration/02_Application/Data/Services/ProjectTags.xml", encoding="utf-8", xml_declaration=True)
+    writeXml(projectTagsFile, PROJECT.projectTagsFile)
 
-if __name__ == '__main__':
+def generateOutputs(dfinformationModel : pd.DataFrame, dfParameters : pd.DataFrame, dfAlarms : pd.DataFrame, allocator : HmiIdAllocator,
+                    alarmsTextFiles : bool = True) -> Counter:
+    """
+        MainInformationModel.xml (streamed with STREAMING_OUTPUT, else built with GENERATION_WORKERS processes),
+        the alarms text files and ProjectTags.xml, then the tag index is written with TAG_INDEX and the plcTags
+        are verified with VERIFY_TAGS. Returns the element counts under da:Application.
+    """
+    if STREAMING_OUTPUT and SPLIT_OUTPUT:
+        print("Warning the streaming output is not split into include files, the tree is built")
+    if STREAMING_OUTPUT and not SPLIT_OUTPUT:
+        statistics : Counter = generateMainInformationModelStreaming(dfinformationModel=dfinformationModel, dfParameters=dfParameters, dfAlarms=dfAlarms,
+                                                                     allocator=allocator, alarmsTextFiles=alarmsTextFiles)
+    else:
+        maininformationmodel : etree.Element = generateMainInformationModelFromDataFrames(dfinformationModel=dfinformationModel, dfParameters=dfParameters, dfAlarms=dfAlarms,
+                                                                                           allocator=allocator, workers=GENERATION_WORKERS, alarmsTextFiles=alarmsTextFiles)
+        statistics : Counter = collectTreeStatistics(maininformationmodel.find('.//da:Application', NAMESPACES))
 
-    print("Start ConfigFileConverter...")
-    dfinformationModel, dfParameters, dfAlarms = excelConfigFilesToDataFrames(CONFIG_FILE_FOLDER)
+    makeProjectHmiTypeTags(tagNames=statistics)
+
+    if TAG_INDEX and not DRY_RUN:
+        makeTagIndex(dfAlarms=dfAlarms)
 
-    maininformationmodel : etree.Element = generateMainInformationModelFromDataFrames(dfinformationModel=dfinformationModel, dfParameters=dfParameters, dfAlarms=dfAlarms)
+    if VERIFY_TAGS:
+        verifyPlcTags()
+    return statistics
 
-    makeProjectHmiTypeTags(maininformationmodel=maininformationmodel)
+def configureProject(paths : ProjectPaths):
+    """
+        Convert another project : the configuration of the previous one is dropped. The parsed BaseFiles,
+        PlcTags.csv frames, tag resolvers and WPH templates are kept by content hash, a project with the
+        same files reuses them.
+    """
+    global PROJECT
+    PROJECT = paths
+    projectconfig.clearCaches()
+    plcTagsHash.cache_clear()
+    plcConfigs.cache_clear()
+    buildFingerprint.cache_clear()
+
+def runConverter(frames : tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame] = None) -> dict[str, dict]:
+    """
+        Convert PROJECT : information model, alarms and project tags, then the run report. `frames` skips the
+        workbooks ingestion. Returns OUTPUT_CHANGES, nothing is written in DRY_RUN mode.
+    """
+    global BUILD_CACHE, TAG_VERIFICATION
 
+    print("Start ConfigFileConverter...")
+    INSTRUMENTATION.enabled = RUN_REPORT
+    flushTagCounts()
+    INSTRUMENTATION.reset()
+    OUTPUT_CHANGES.clear()
+    OUTPUT_DIFFS.clear()
+    MODEL_VIOLATIONS.clear()
+    MODEL_TAG_REFERENCES.clear()
+    TAG_VERIFICATION = None
+    if BUILD_CACHE_FOLDER:
+        BUILD_CACHE = BuildCache(BUILD_CACHE_FOLDER, maxBytes=BUILD_CACHE_MAX_BYTES)
+    PROJECT.makeOutputFolders()
+
+    with profiled(PROFILE_MODE, PROJECT.profileFile):
+        if frames is None:
+            frames = excelConfigFilesToDataFrames(PROJECT.inputFolder, workers=INGESTION_WORKERS, cache=BUILD_CACHE)
+        dfinformationModel, dfParameters, dfAlarms = frames
+
+        allocator : HmiIdAllocator = loadHmiIdAllocator(PROJECT.hmiIdMapFile if PERSIST_HMI_IDS else None)
+
+        statistics : Counter = generateOutputs(dfinformationModel=dfinformationModel, dfParameters=dfParameters, dfAlarms=dfAlarms, allocator=allocator)
+
+        if PERSIST_HMI_IDS and not DRY_RUN:
+            allocator.save(PROJECT.hmiIdMapFile)
+
+        logTreeStatistics(statistics)
+
+        if BUILD_CACHE is not None:
+            print(BUILD_CACHE.statistics)
+
+        if TAG_LIST_FILE and not DRY_RUN:
+            writeTagList(makeTagTable(dfinformationModel, dfParameters, shiftRegisters=True).dropna(subset=['PlcTag']), TAG_LIST_FILE)
+
+    changed = [os.path.basename(path) for path, change in OUTPUT_CHANGES.items() if change['status'] != 'unchanged']
+    print(f"{len(changed)} of {len(OUTPUT_CHANGES)} outputs {'would change' if DRY_RUN else 'written'}{' : ' + ', '.join(changed) if changed else ''}")
+    if DRY_RUN:
+        return OUTPUT_CHANGES
+
+    if OUTPUT_DIFFS:
+        with open(PROJECT.outputDiffFile, 'w', encoding='utf-8') as fh:
+            json.dump({path : diff.toDict() for path, diff in OUTPUT_DIFFS.items()}, fh, indent=4)
+
+    if RUN_REPORT:
+        flushTagCounts()
+        INSTRUMENTATION.writeReport(PROJECT.runReportFile,
+                                    workers={'ingestion' : INGESTION_WORKERS, 'generation' : GENERATION_WORKERS},
+                                    rows={'informationModel' : len(dfinformationModel), 'parameters' : len(dfParameters), 'alarms' : len(dfAlarms)},
+                                    elements=dict(statistics.most_common()),
+                                    buildCache=vars(BUILD_CACHE.statistics) if BUILD_CACHE is not None else None,
+                                    outputs=OUTPUT_CHANGES,
+                                    violations=[violation._asdict() for violation in MODEL_VIOLATIONS] if VALIDATE_MODEL else None,
+                                    tagVerification=TAG_VERIFICATION.toDict() if TAG_VERIFICATION is not None else None)
+        print(INSTRUMENTATION.summary())
+    return OUTPUT_CHANGES
 
+if __name__ == '__main__':
+    runConverter()
@@ -0,0 +1,189 @@
+"""
+    Project layout and configuration files of the converter.
+
+    Standard library only : listing the PLCs or checking a project must not pay for pandas and lxml. A
+    project is four folders, every path the converter reads or writes is derived from them :
+
+        <input>/<project>_<PLC>.xlsm
+        <config>/PlcTags.csv, <config>/PlcConfig.json
+        <base>/MainInformationModelBase.xml, Alarms.xml, ...
+        <output>/serverConfiguration/02_Application/...
+
+    PlcConfig.json maps each PLC name to its plcType and connection settings, without it the converter
+    falls back to DEFAULT_PLC_CONFIG :
+
+        {"PLC1" : {"plcType" : "OpcUa", "address" : "172.16.224.80", "defaultNamespaceUri" : "urn:BeckhoffAutomation:Ua:PLC1"}}
+"""
+import csv
+import functools
+import json
+import os
+import string
+
+# values of parser.PlcType, with the settings each PLC type needs
+PLC_TYPE_SETTINGS = {'Beckhoff' : ['address', 'remoteAmsNetId', 'localAmsNetId'],
+                     'Siemens' : ['address'],
+                     'OpcUa' : ['address', 'defaultNamespaceUri'],
+                     'Rockwell' : ['address']}
+
+DEFAULT_PLC_CONFIG = {
+    'PLC1' : {'plcType' : 'OpcUa', 'address' : "172.16.224.80", 'defaultNamespaceUri' : "urn:BeckhoffAutomation:Ua:PLC1"},
+    'PLC2' : {'plcType' : 'OpcUa', 'address' : "172.16.224.80", 'defaultNamespaceUri' : "urn:BeckhoffAutomation:Ua:PLC2"},
+}
+
+# fields a PlcTags.csv format can reference
+TAG_FORMAT_FIELDS = {'Machine_Number', 'Station_Number', 'Station_Name', 'Actuator_Number', 'Actuator_Name', 'Parameter_Name', 'Wph_Number', 'Nest_Number'}
+
+BASE_FILES = ['MainInformationModelBase.xml', 'Alarms.xml', 'en-US_Ima.Hmi.Module.Automation.Alarm.xml', 'ProjectTags.xml']
+
+class ProjectPaths:
+
+    def __init__(self, inputFolder : str = './InputFiles', configFolder : str = './ConfigFIles',
+                 baseFolder : str = './BaseFiles', outputFolder : str = './OutputFiles') -> None:
+        self.inputFolder = inputFolder
+        self.configFolder = configFolder
+        self.baseFolder = baseFolder
+        self.outputFolder = outputFolder
+
+    @classmethod
+    def fromRoot(cls, root : str) -> 'ProjectPaths':
+        """Default layout under a project folder"""
+        return cls(os.path.join(root, 'InputFiles'), os.path.join(root, 'ConfigFIles'),
+                   os.path.join(root, 'BaseFiles'), os.path.join(root, 'OutputFiles'))
+
+    @property
+    def plcTagsFile(self) -> str:
+        return os.path.join(self.configFolder, 'PlcTags.csv')
+
+    @property
+    def plcConfigFile(self) -> str:
+        return os.path.join(self.configFolder, 'PlcConfig.json')
+
+    def baseFile(self, name : str) -> str:
+        return os.path.join(self.baseFolder, name)
+
+    @property
+    def dataFolder(self) -> str:
+        return os.path.join(self.outputFolder, 'serverConfiguration', '02_Application', 'Data')
+
+    @property
+    def servicesFolder(self) -> str:
+        return os.path.join(self.dataFolder, 'Services')
+
+    @property
+    def translationsFolder(self) -> str:
+        return os.path.join(self.outputFolder, 'serverConfiguration', '02_Application', 'Translations')
+
+    @property
+    def mainInformationModelFile(self) -> str:
+        return os.path.join(self.dataFolder, 'MainInformationModel.xml')
+
+    @property
+    def alarmsFile(self) -> str:
+        return os.path.join(self.servicesFolder, 'Alarms.xml')
+
+    @property
+    def alarmsTranslationFile(self) -> str:
+        return os.path.join(self.translationsFolder, 'en-US_Ima.Hmi.Module.Automation.Alarm.xml')
+
+    @property
+    def projectTagsFile(self) -> str:
+        return os.path.join(self.servicesFolder, 'ProjectTags.xml')
+
+    @property
+    def hmiIdMapFile(self) -> str:
+        return os.path.join(self.outputFolder, 'HmiIdMap.json')
+
+    @property
+    def tagIndexFile(self) -> str:
+        return os.path.join(self.outputFolder, 'TagIndex.sqlite')
+
+    @property
+    def tagCacheFile(self) -> str:
+        return os.path.join(self.outputFolder, 'PlcTagCache.json')
+
+    @property
+    def runReportFile(self) -> str:
+        return os.path.join(self.outputFolder, 'RunReport.json')
+
+    @property
+    def outputDiffFile(self) -> str:
+        return os.path.join(self.outputFolder, 'OutputDiff.json')
+
+    @property
+    def profileFile(self) -> str:
+        return os.path.join(self.outputFolder, 'RunProfile')
+
+    def makeOutputFolders(self):
+        for folder in [self.servicesFolder, self.translationsFolder]:
+            os.makedirs(folder, exist_ok=True)
+
+    def workbooks(self) -> dict[str, str]:
+        """PLC name -> workbook path, for every <project>_<PLC>.xlsm of the input folder"""
+        return {os.path.basename(file).split('_')[1].replace(".xlsm","") : os.path.join(self.inputFolder, file)
+                    for file in sorted(os.listdir(self.inputFolder))
+                        if file.endswith(".xlsm") and not file.startswith("~$") and '_' in file}
+
+@functools.cache
+def readPlcConfigFile(path : str) -> dict[str, dict]:
+    """PLC name -> settings, DEFAULT_PLC_CONFIG when the project has no PlcConfig.json"""
+    if not os.path.exists(path):
+        return {name : dict(settings) for name, settings in DEFAULT_PLC_CONFIG.items()}
+    with open(path, encoding='utf-8') as fh:
+        return json.load(fh)
+
+@functools.cache
+def readPlcTagsFile(path : str) -> dict[str, dict[str, str]]:
+    """Key -> {column : value} of PlcTags.csv, read with the csv module"""
+    with open(path, encoding='utf-8', newline='') as fh:
+        reader = csv.reader(fh, delimiter=';')
+        header = next(reader)
+        return {row[0] : dict(zip(header[1:], row[1:])) for row in reader if row}
+
+def clearCaches():
+    readPlcConfigFile.cache_clear()
+    readPlcTagsFile.cache_clear()
+
+def tagFormatErrors(key : str, plcType : str, tagFormat : str) -> list[str]:
+    try:
+        fields = {field for _, field, _, _ in string.Formatter().parse(tagFormat) if field is not None}
+    except ValueError as e:
+        return [f"PlcTags.csv {key} ({plcType}) : invalid format {tagFormat!r} ({e})"]
+    return [f"PlcTags.csv {key} ({plcType}) : unknown field {{{field}}} in {tagFormat!r}" for field in sorted(fields - TAG_FORMAT_FIELDS)]
+
+def validateProject(paths : ProjectPaths) -> list[str]:
+    """Configuration errors of the project, the workbooks are not opened"""
+    errors : list[str] = []
+    for label, folder in [('input', paths.inputFolder), ('config', paths.configFolder), ('base', paths.baseFolder)]:
+        if not os.path.isdir(folder):
+            errors.append(f"Missing {label} folder {folder}")
+    errors += [f"Missing base file {paths.baseFile(name)}" for name in BASE_FILES if not os.path.exists(paths.baseFile(name))]
+    if errors:
+        return errors
+
+    try:
+        plcConfig = readPlcConfigFile(paths.plcConfigFile)
+    except (OSError, ValueError) as e:
+        return errors + [f"Invalid {paths.plcConfigFile} : {e}"]
+    for name, settings in plcConfig.items():
+        plcType = settings.get('plcType')
+        if plcType not in PLC_TYPE_SETTINGS:
+            errors.append(f"PLC {name} : unknown plcType {plcType!r}, expected one of {', '.join(PLC_TYPE_SETTINGS)}")
+            continue
+        errors += [f"PLC {name} : missing {setting}" for setting in PLC_TYPE_SETTINGS[plcType] if not settings.get(setting)]
+
+    if not os.path.exists(paths.plcTagsFile):
+        return errors + [f"Missing {paths.plcTagsFile}"]
+    plcTags = readPlcTagsFile(paths.plcTagsFile)
+    columns = set(next(iter(plcTags.values()), {}))
+    for plcType in sorted({settings.get('plcType') for settings in plcConfig.values()} & set(PLC_TYPE_SETTINGS)):
+        missing = [column for column in [f'{plcType} Type', f'{plcType} Format'] if column not in columns]
+        if missing:
+            errors.append(f"PlcTags.csv has no {' and '.join(missing)} column for the {plcType} PLCs")
+            continue
+        for key, row in plcTags.items():
+            errors += tagFormatErrors(key, plcType, row.get(f'{plcType} Format', ''))
+
+    errors += [f"Workbook {os.path.basename(path)} : PLC {name} is not in the PLC configuration"
+                for name, path in paths.workbooks().items() if name not in plcConfig]
+    return errors
@@ -0,0 +1,168 @@
+"""
+    Snapshot of the ingested configuration frames.
+
+    The information model, parameters and alarms frames returned by excelConfigFilesToDataFrames are
+    written to a folder as numpy .npy files, a few per column, with a manifest :
+
+        <snapshot>/manifest.json                      schema version, frame columns and dtypes, source hashes
+        <snapshot>/informationModel.0.codes.npy       codes of a categorical column
+        <snapshot>/informationModel.0.categories.*    its categories, encoded like an object column
+        <snapshot>/informationModel.4.kinds.npy       object column : kind of every value (None, text, int...)
+        <snapshot>/informationModel.4.texts.npy       and one typed array per kind
+        ...
+
+    Numeric columns and the codes of categoricals are read back memory mapped. Object columns are stored
+    as typed arrays, a value keeps its type (text stays text, 2 stays an int), only columns holding other
+    values than None, text, numbers and bools are pickled. The manifest keeps the hash of every workbook
+    and of the converter source the frames were parsed with, snapshotErrors tells whether a snapshot still
+    matches an input folder.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+import parser
+from buildcache import hashFile
+
+SNAPSHOT_SCHEMA_VERSION = 2
+SNAPSHOT_FORMAT = 'npy'
+
+SNAPSHOT_FRAMES = {'informationModel' : parser.INFORMATION_MODEL_DTYPES,
+                   'parameters' : parser.PARAMETERS_DTYPES,
+                   'alarms' : parser.ALARMS_DTYPES}
+
+# kind of each value of an object column, its value is in the typed array of the kind
+VALUE_NONE, VALUE_TEXT, VALUE_INT, VALUE_FLOAT, VALUE_BOOL = range(5)
+
+def workbookHashes(inputFolder : str) -> dict[str, str]:
+    """sha256 of every workbook excelConfigFilesToDataFrames reads, by file name"""
+    return {file : hashFile(os.path.join(inputFolder, file)) for file in sorted(os.listdir(inputFolder))
+                if file.endswith(".xlsm") and not file.startswith("~$")}
+
+def encodeValues(values : pd.Series) -> dict[str, np.ndarray]:
+    """kinds, texts, ints and floats arrays of an object column, None when a value has no kind"""
+    kinds = np.full(len(values), VALUE_NONE, dtype=np.uint8)
+    texts = [''] * len(values)
+    ints = np.zeros(len(values), dtype=np.int64)
+    floats = np.zeros(len(values), dtype=np.float64)
+    for i, value in enumerate(values):
+        if value is None:
+            continue
+        if isinstance(value, str):
+            kinds[i], texts[i] = VALUE_TEXT, value
+        elif isinstance(value, (bool, np.bool_)):
+            kinds[i], ints[i] = VALUE_BOOL, value
+        elif isinstance(value, (int, np.integer)) and -2**63 <= value < 2**63:
+            kinds[i], ints[i] = VALUE_INT, value
+        elif isinstance(value, (float, np.floating)):
+            kinds[i], floats[i] = VALUE_FLOAT, value
+        else:
+            return None
+    return {'kinds' : kinds, 'texts' : np.array(texts, dtype=str) if texts else np.array([], dtype='U1'),
+            'ints' : ints, 'floats' : floats}
+
+def decodeValues(arrays : dict[str, np.ndarray]) -> np.ndarray:
+    """Object array of the values encoded by encodeValues, with their Python types"""
+    kinds = arrays['kinds']
+    values = np.empty(len(kinds), dtype=object)
+    for kind, typed in [(VALUE_TEXT, arrays['texts']), (VALUE_INT, arrays['ints']), (VALUE_FLOAT, arrays['floats']),
+                        (VALUE_BOOL, arrays['ints'].astype(bool))]:
+        mask = kinds == kind
+        if mask.any():
+            values[mask] = typed[mask].tolist()
+    return values
+
+def writeValues(folder : str, prefix : str, values : pd.Series) -> str:
+    """Write an object column, returns its encoding"""
+    arrays = encodeValues(values)
+    if arrays is None:
+        np.save(os.path.join(folder, f"{prefix}.pickle.npy"), np.asarray(values, dtype=object), allow_pickle=True)
+        return 'pickle'
+    for part, array in arrays.items():
+        np.save(os.path.join(folder, f"{prefix}.{part}.npy"), array)
+    return 'values'
+
+def readValues(folder : str, prefix : str, encoding : str) -> np.ndarray:
+    if encoding == 'pickle':
+        return np.load(os.path.join(folder, f"{prefix}.pickle.npy"), allow_pickle=True)
+    return decodeValues({part : np.load(os.path.join(folder, f"{prefix}.{part}.npy"), mmap_mode='r')
+                            for part in ['kinds', 'texts', 'ints', 'floats']})
+
+def writeFrame(folder : str, name : str, df : pd.DataFrame) -> dict:
+    """Write the columns of a frame, returns its manifest entry"""
+    columns : list[dict] = []
+    for i, (column, series) in enumerate(df.items()):
+        prefix = f"{name}.{i}"
+        entry = {'name' : column, 'dtype' : str(series.dtype)}
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            np.save(os.path.join(folder, f"{prefix}.codes.npy"), series.cat.codes.to_numpy())
+            entry.update(ordered=bool(series.dtype.ordered), categoriesDtype=str(series.dtype.categories.dtype),
+                         encoding=writeValues(folder, f"{prefix}.categories", series.dtype.categories.to_series()))
+        elif isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biuf':
+            np.save(os.path.join(folder, f"{prefix}.npy"), series.to_numpy())
+            entry['encoding'] = 'numpy'
+        else:
+            entry['encoding'] = writeValues(folder, prefix, series)
+        columns.append(entry)
+    # the name of the columns index is the header row of the sheets, kept so the frame reads back equal
+    return {'rows' : len(df), 'columns' : columns, 'columnsName' : df.columns.name}
+
+def readFrame(folder : str, name : str, frame : dict) -> pd.DataFrame:
+    """Frame written by writeFrame, with its dtypes"""
+    columns : dict[str, object] = {}
+    for i, entry in enumerate(frame['columns']):
+        prefix = f"{name}.{i}"
+        if entry['dtype'] == 'category':
+            categories = pd.Index(readValues(folder, f"{prefix}.categories", entry['encoding']), dtype=entry['categoriesDtype'])
+            columns[entry['name']] = pd.Categorical.from_codes(np.load(os.path.join(folder, f"{prefix}.codes.npy"), mmap_mode='r'),
+                                                               categories=categories, ordered=entry['ordered'])
+        elif entry['encoding'] == 'numpy':
+            columns[entry['name']] = np.load(os.path.join(folder, f"{prefix}.npy"), mmap_mode='r')
+        else:
+            columns[entry['name']] = pd.Series(readValues(folder, prefix, entry['encoding']), dtype=object).astype(entry['dtype'])
+    df = pd.DataFrame(columns, index=pd.RangeIndex(frame['rows']))
+    df.columns.name = frame['columnsName']
+    return df
+
+def writeSnapshot(folder : str, frames : tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame], inputFolder : str) -> dict:
+    """Write the frames and their manifest, the manifest is written last so a partial snapshot has none"""
+    os.makedirs(folder, exist_ok=True)
+    manifestPath = os.path.join(folder, 'manifest.json')
+    if os.path.exists(manifestPath):
+        os.remove(manifestPath)
+
+    manifest = {'schemaVersion' : SNAPSHOT_SCHEMA_VERSION,
+                'format' : SNAPSHOT_FORMAT,
+                'sources' : {'converter' : parser.sourceFingerprint(), 'workbooks' : workbookHashes(inputFolder)},
+                'frames' : {name : writeFrame(folder, name, df.reset_index(drop=True)) for name, df in zip(SNAPSHOT_FRAMES, frames)}}
+
+    with open(manifestPath, 'w', encoding='utf-8') as fh:
+        json.dump(manifest, fh, indent=4)
+    return manifest
+
+def readManifest(folder : str) -> dict:
+    with open(os.path.join(folder, 'manifest.json'), encoding='utf-8') as fh:
+        manifest = json.load(fh)
+    if manifest.get('schemaVersion') != SNAPSHOT_SCHEMA_VERSION or manifest.get('format') != SNAPSHOT_FORMAT:
+        raise ValueError(f"snapshot {folder} has schema version {manifest.get('schemaVersion')} ({manifest.get('format')}), "
+                         f"expected {SNAPSHOT_SCHEMA_VERSION} ({SNAPSHOT_FORMAT})")
+    return manifest
+
+def readSnapshot(folder : str) -> (pd.DataFrame, pd.DataFrame, pd.DataFrame):
+    """The three frames of a snapshot, with the dtypes they were written with"""
+    manifest = readManifest(folder)
+    return tuple(readFrame(folder, name, manifest['frames'][name]) for name in SNAPSHOT_FRAMES)
+
+def snapshotErrors(folder : str, inputFolder : str) -> list[str]:
+    """Why the snapshot does not match the workbooks of `inputFolder` and this converter, empty when it does"""
+    sources = readManifest(folder)['sources']
+    errors : list[str] = []
+    if sources['converter'] != parser.sourceFingerprint():
+        errors.append("parsed by another version of the converter")
+    current = workbookHashes(inputFolder)
+    errors += [f"{name} changed" for name in sorted(current) if name in sources['workbooks'] and sources['workbooks'][name] != current[name]]
+    errors += [f"{name} added" for name in sorted(set(current) - set(sources['workbooks']))]
+    errors += [f"{name} removed" for name in sorted(set(sources['workbooks']) - set(current))]
+    return errors
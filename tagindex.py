@@ -0,0 +1,90 @@
+"""
+    Reverse index of the generated model : PLC address -> HMI elements.
+
+    Every plcTag of the model and every alarm AlarmInput is stored with the scope path and hmiId of the
+    element referencing it, in a SQLite file written next to the outputs :
+
+        plcTag                              device  path                                      hmiId   kind
+        _01_01_Station0101.Sts_Idle         PLC1    PLC1/M01/ST01/Sts_Idle                    8133..  plcTag
+        _01_01_Alms.L1.0                    PLC1    Alarms/1                                  1       alarm
+
+    plcTags are stored without their // prefix. The table is clustered on (plcTag, device, path) and the
+    plcTag column compares case insensitively like the PLC addresses, a prefix search is one range scan of
+    the primary key. The references come from the model walk of the generation, see parser.walkModel.
+"""
+import os
+import sqlite3
+from typing import Iterable, NamedTuple
+
+TAG_INDEX_SCHEMA_VERSION = 1
+
+TAG_INDEX_SCHEMA = """
+    CREATE TABLE tags (plcTag TEXT NOT NULL COLLATE NOCASE, device TEXT NOT NULL, path TEXT NOT NULL, hmiId INTEGER, kind TEXT NOT NULL,
+                       PRIMARY KEY (plcTag, device, path)) WITHOUT ROWID;
+    CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID;
+"""
+
+class TagEntry(NamedTuple):
+    plcTag : str
+    device : str
+    path : str
+    hmiId : int
+    # 'plcTag' or 'alarm'
+    kind : str
+
+    def __str__(self) -> str:
+        return f"{self.plcTag:<50} {self.device:<8} {self.path:<60} {self.hmiId if self.hmiId is not None else '-':>11} {self.kind}"
+
+def indexedTag(plcTag : str) -> str:
+    return plcTag.removeprefix('//')
+
+def writeTagIndex(path : str, entries : Iterable[TagEntry]) -> int:
+    """Write the index of `entries` to `path`, replaced atomically. Returns the number of entries"""
+    tmpPath = f"{path}.tmp"
+    if os.path.exists(tmpPath):
+        os.remove(tmpPath)
+    connection = sqlite3.connect(tmpPath)
+    try:
+        # the file is only read once complete and replaced, no journal and no sync are needed
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.executescript(TAG_INDEX_SCHEMA)
+        with connection:
+            connection.executemany("INSERT OR IGNORE INTO tags VALUES (?, ?, ?, ?, ?)",
+                                   sorted((indexedTag(entry.plcTag), entry.device or '', entry.path, entry.hmiId, entry.kind) for entry in entries))
+            connection.execute("INSERT INTO meta VALUES ('schemaVersion', ?)", (str(TAG_INDEX_SCHEMA_VERSION),))
+        entryCount = connection.execute("SELECT count(*) FROM tags").fetchone()[0]
+    finally:
+        connection.close()
+    os.replace(tmpPath, path)
+    return entryCount
+
+class TagIndex:
+    """Read-only queries of a tag index file"""
+
+    def __init__(self, path : str) -> None:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"no tag index {path}, it is written by the conversion")
+        self.connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+    def __enter__(self) -> 'TagIndex':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def lookup(self, plcTag : str) -> list[TagEntry]:
+        """Elements of one plcTag or AlarmInput"""
+        return [TagEntry._make(row) for row in self.connection.execute(
+                    "SELECT * FROM tags WHERE plcTag = ? ORDER BY plcTag, device, path", (indexedTag(plcTag),))]
+
+    def search(self, prefix : str, limit : int = None) -> list[TagEntry]:
+        """Elements of the plcTags and AlarmInputs starting with `prefix`, in plcTag order"""
+        prefix = indexedTag(prefix)
+        # every tag starting with the prefix sorts between the prefix and the prefix followed by the last code point
+        return [TagEntry._make(row) for row in self.connection.execute(
+                    "SELECT * FROM tags WHERE plcTag >= ? AND plcTag < ? ORDER BY plcTag, device, path LIMIT ?",
+                    (prefix, f"{prefix}\U0010ffff", -1 if limit is None else limit))]
@@ -0,0 +1,187 @@
+"""
+    Verification of the generated plcTags against the OPC UA server of each PLC.
+
+    The distinct plcTags of every AutomationDevice (collected by the model validation walk) are read from
+    the server of the PLC, opc.tcp://<address>:<port>, in the namespace of its defaultNamespaceUri. A plcTag
+    is the string identifier of its node, //_01_Main.PackMl.Sts_State -> ns=<index>;s=_01_Main.PackMl.Sts_State,
+    an array element Words[51] reads the index range 51 of the node Words.
+
+    Each PLC gets one connection, its tags are read in batches of `batchSize` nodes per Read request, the
+    batches of all the PLCs run concurrently with at most `concurrency` requests in flight. A tag whose
+    node is unknown (or index out of range) is missing, any other status is reported as an error.
+
+    Found tags are kept in a TagCache, per endpoint and namespace, and are not read again before `maxAge`
+    seconds. Missing tags are never cached, a fixed tag is seen on the next run.
+
+    asyncua is optional, the converter runs without it and only the verification needs it.
+"""
+import asyncio
+import json
+import os
+import re
+import time
+from typing import NamedTuple
+
+try:
+    from asyncua import Client, ua
+except ImportError:
+    Client = ua = None
+
+# seconds a found tag is trusted without reading it again
+TAG_CACHE_MAX_AGE = 24 * 3600
+
+# status codes of a node that does not exist, the other bad status codes are errors
+MISSING_STATUS_NAMES = {'BadNodeIdUnknown', 'BadNodeIdInvalid', 'BadIndexRangeNoData', 'BadIndexRangeInvalid'}
+
+ARRAY_ELEMENT_PATTERN = re.compile(r"^(?P<node>.+)\[(?P<index>\d+)\]$")
+
+class TagCheck(NamedTuple):
+    device : str
+    plcTag : str
+    path : str
+    # 'ok', 'missing' or 'error'
+    status : str
+    message : str = None
+
+    def __str__(self) -> str:
+        return f"{self.path} : {self.plcTag} {self.message}"
+
+def endpointUrl(plcConfig) -> str:
+    return f"opc.tcp://{plcConfig.address}:{plcConfig.port}"
+
+def endpointKey(plcConfig) -> str:
+    return f"{endpointUrl(plcConfig)} {plcConfig.defaultNamespaceUri}"
+
+def nodeAddress(plcTag : str) -> tuple[str, str]:
+    """String identifier and index range (None for a whole node) of a plcTag"""
+    identifier = plcTag.removeprefix('//')
+    match = ARRAY_ELEMENT_PATTERN.match(identifier)
+    return (match['node'], match['index']) if match else (identifier, None)
+
+class TagCache:
+    """Time each plcTag was found on an endpoint, missing tags are not kept"""
+
+    def __init__(self, found : dict[str, dict[str, float]] = None, maxAge : float = TAG_CACHE_MAX_AGE) -> None:
+        self.found = found or {}
+        self.maxAge = maxAge
+
+    def isFresh(self, endpoint : str, plcTag : str, now : float) -> bool:
+        foundAt = self.found.get(endpoint, {}).get(plcTag)
+        return foundAt is not None and now - foundAt < self.maxAge
+
+    def add(self, endpoint : str, plcTags : list[str], now : float):
+        self.found.setdefault(endpoint, {}).update(dict.fromkeys(plcTags, now))
+
+    def save(self, path : str):
+        with open(path, 'w', encoding='utf-8') as fh:
+            json.dump(self.found, fh, indent=0, sort_keys=True)
+
+def loadTagCache(path : str = None, maxAge : float = TAG_CACHE_MAX_AGE) -> TagCache:
+    """Cache saved at `path`, if there is one"""
+    if path is None or not os.path.exists(path):
+        return TagCache(maxAge=maxAge)
+    with open(path, encoding='utf-8') as fh:
+        return TagCache(json.load(fh), maxAge=maxAge)
+
+class TagVerification:
+    """Checks of one verification run and its throughput"""
+
+    def __init__(self, checks : list[TagCheck], seconds : float, read : int, requests : int, cached : int) -> None:
+        self.checks = checks
+        self.seconds = seconds
+        self.read = read
+        self.requests = requests
+        self.cached = cached
+
+    @property
+    def missing(self) -> list[TagCheck]:
+        return [check for check in self.checks if check.status == 'missing']
+
+    @property
+    def errors(self) -> list[TagCheck]:
+        return [check for check in self.checks if check.status == 'error']
+
+    @property
+    def tagsPerSecond(self) -> float:
+        return self.read / self.seconds if self.seconds else 0.0
+
+    def summary(self) -> str:
+        devices = len({check.device for check in self.checks})
+        return (f"{len(self.checks)} plcTags of {devices} PLCs verified in {self.seconds:.2f} s, {self.read} read in "
+                f"{self.requests} requests ({self.tagsPerSecond:.0f} tags/s), {self.cached} cached, "
+                f"{len(self.missing)} missing, {len(self.errors)} errors")
+
+    def toDict(self) -> dict:
+        return {'tags' : len(self.checks), 'read' : self.read, 'requests' : self.requests, 'cached' : self.cached, 'seconds' : round(self.seconds, 6),
+                'tagsPerSecond' : round(self.tagsPerSecond, 1), 'missing' : len(self.missing), 'errors' : len(self.errors),
+                'failures' : [check._asdict() for check in self.checks if check.status != 'ok']}
+
+class TagVerifier:
+
+    def __init__(self, concurrency : int = 8, batchSize : int = 500, timeout : float = 5.0, cache : TagCache = None) -> None:
+        self.concurrency = concurrency
+        self.batchSize = batchSize
+        self.timeout = timeout
+        self.cache = cache if cache is not None else TagCache()
+
+    def verify(self, devices : dict[str, tuple[object, dict[str, str]]]) -> TagVerification:
+        """Check the {plcTag : path} of each {AutomationDevice : (OpcuaConfig, plcTags)}"""
+        if Client is None:
+            raise ImportError("asyncua is not installed, the plcTags cannot be verified")
+        start = time.perf_counter()
+        self.read = self.requests = self.cached = 0
+        checks = asyncio.run(self.verifyDevices(devices))
+        return TagVerification(checks, time.perf_counter() - start, self.read, self.requests, self.cached)
+
+    async def verifyDevices(self, devices : dict[str, tuple[object, dict[str, str]]]) -> list[TagCheck]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(*(self.verifyDevice(device, plcConfig, plcTags, semaphore)
+                                            for device, (plcConfig, plcTags) in devices.items()))
+        return [check for checks in results for check in checks]
+
+    async def verifyDevice(self, device : str, plcConfig, plcTags : dict[str, str], semaphore : asyncio.Semaphore) -> list[TagCheck]:
+        endpoint = endpointKey(plcConfig)
+        now = time.time()
+        checks = [TagCheck(device, plcTag, path, 'ok') for plcTag, path in plcTags.items() if self.cache.isFresh(endpoint, plcTag, now)]
+        toRead = [(plcTag, path) for plcTag, path in plcTags.items() if not self.cache.isFresh(endpoint, plcTag, now)]
+        self.cached += len(checks)
+        if not toRead:
+            return checks
+
+        url = endpointUrl(plcConfig)
+        try:
+            async with Client(url, timeout=self.timeout) as client:
+                namespaceIndex = await client.get_namespace_index(plcConfig.defaultNamespaceUri)
+                batches = await asyncio.gather(*(self.readBatch(device, client, namespaceIndex, toRead[start:start+self.batchSize], semaphore)
+                                                    for start in range(0, len(toRead), self.batchSize)))
+        except ValueError:
+            return checks + [TagCheck(device, plcTag, path, 'error', f"namespace {plcConfig.defaultNamespaceUri} is not on {url}") for plcTag, path in toRead]
+        except (OSError, TimeoutError, ua.UaError) as e:
+            return checks + [TagCheck(device, plcTag, path, 'error', f"{url} : {e!r}") for plcTag, path in toRead]
+
+        readChecks = [check for batch in batches for check in batch]
+        self.cache.add(endpoint, [check.plcTag for check in readChecks if check.status == 'ok'], now)
+        return checks + readChecks
+
+    async def readBatch(self, device : str, client, namespaceIndex : int, batch : list[tuple[str, str]], semaphore : asyncio.Semaphore) -> list[TagCheck]:
+        """One Read request of the Value of every node of the batch"""
+        parameters = ua.ReadParameters()
+        for plcTag, _ in batch:
+            identifier, indexRange = nodeAddress(plcTag)
+            parameters.NodesToRead.append(ua.ReadValueId(NodeId=ua.NodeId(identifier, namespaceIndex, ua.NodeIdType.String),
+                                                         AttributeId=ua.AttributeIds.Value, IndexRange=indexRange))
+        async with semaphore:
+            dataValues = await client.uaclient.read(parameters)
+        self.read += len(batch)
+        self.requests += 1
+
+        checks : list[TagCheck] = []
+        for (plcTag, path), dataValue in zip(batch, dataValues):
+            status = dataValue.StatusCode
+            if status.is_good():
+                checks.append(TagCheck(device, plcTag, path, 'ok'))
+            elif status.name in MISSING_STATUS_NAMES:
+                checks.append(TagCheck(device, plcTag, path, 'missing', f"is not on the PLC ({status.name})"))
+            else:
+                checks.append(TagCheck(device, plcTag, path, 'error', f"cannot be read ({status.name})"))
+        return checks
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# the converter modules and the synthetic plant of the benchmarks, absolute so spawned workers find them too
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import parser as converter
+from projectconfig import ProjectPaths
+from synthetic_plant import makeSyntheticProject, registerPlcConfigs
+
+@pytest.fixture
+def project(tmp_path, monkeypatch) -> ProjectPaths:
+    """Small synthetic plant of 2 PLCs configured in parser, run from another folder than the project one"""
+    root = makeSyntheticProject(str(tmp_path / 'plant'), plcs=2, machines=2, stations=3, actuators=2, alarms=20)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(converter, 'BUILD_CACHE', None)
+    monkeypatch.setattr(converter, 'VALIDATE_MODEL', False)
+    monkeypatch.setattr(converter, 'TAG_INDEX', False)
+    converter.configureProject(ProjectPaths.fromRoot(root))
+    registerPlcConfigs(converter, 2)
+    converter.PROJECT.makeOutputFolders()
+    yield converter.PROJECT
+    converter.configureProject(ProjectPaths())
+
+@pytest.fixture
+def parser(project):
+    return converter
@@ -0,0 +1,41 @@
+import pandas as pd
+from lxml import etree
+
+ALARMS = pd.DataFrame({'AutomationDevice' : 'PLC1', 'AlarmName' : ['Alarm_1', 'Alarm_2', 'Alarm_3', 'Alarm_4', 'Alarm_5'],
+                       'AlarmInput' : ['_01_02_Alms.L1.0', '_01_02_Alms.L1.1', '_02_Alms.L3.4', '_01_99_Alms.L1.0', '_02_01_Alms.L2.0'],
+                       'AlarmAcknowledge' : None, 'AlarmMessage' : ['Door open', 'Air pressure', 'Emergency stop', 'Spare', None]})
+
+def test_alarm_words_are_resolved_through_the_station_index(parser):
+    dfInformationModel, _, _ = parser.excelConfigFilesToDataFrames(parser.PROJECT.inputFolder)
+    device = parser.makeModelIndex(dfInformationModel[dfInformationModel['AutomationDevice'] == 'PLC1'])[0]
+
+    assert parser.alarmWordTags(dfAlarms=ALARMS, device=device) == [
+        ('_01_02_Alms.L1', 'MAIN_PRG._01_02_Station0102.Alms.L1'),
+        ('_02_Alms.L3', 'MAIN_PRG._02_Main.Alms.L3'),
+        ('_01_99_Alms.L1', None),
+        ('_02_01_Alms.L2', 'MAIN_PRG._02_01_Station0201.Alms.L2')]
+
+def test_alarms_folder_skips_and_reports_unresolved_words(parser, capsys):
+    dfInformationModel, _, _ = parser.excelConfigFilesToDataFrames(parser.PROJECT.inputFolder)
+    container = etree.Element('Container')
+
+    device = parser.makeModelIndex(dfInformationModel[dfInformationModel['AutomationDevice'] == 'PLC1'])[0]
+
+    parser.makeAlarms(daAutomationDeviceElement=container, dfAlarms=ALARMS, device=device)
+
+    assert [(primitive.get('name'), primitive.get('plcTag')) for primitive in container[0]] == [
+        ('_01_02_Alms.L1', 'MAIN_PRG._01_02_Station0102.Alms.L1'), ('_02_Alms.L3', 'MAIN_PRG._02_Main.Alms.L3'),
+        ('_02_01_Alms.L2', 'MAIN_PRG._02_01_Station0201.Alms.L2')]
+    assert 'Error during Alarm creation : PLC1 _01_99_Alms.L1 no station 99 in machine M01' in capsys.readouterr().out
+
+def test_alarm_files_have_one_entry_per_alarm(parser):
+    parser.makeAlarmsTextFiles(dfAlarms=ALARMS)
+
+    alarms = etree.parse(parser.PROJECT.alarmsFile).getroot()
+    assert [dict(alarm.attrib) for alarm in alarms][:2] == [
+        {'name' : '_01_02_Alms.L1.0', 'scopeId' : '1', 'hmiId' : '1', 'displayName' : 'Ima.Hmi.Module.Automation>Alarm_1', 'severity' : 'Alarm'},
+        {'name' : '_01_02_Alms.L1.1', 'scopeId' : '2', 'hmiId' : '2', 'displayName' : 'Ima.Hmi.Module.Automation>Alarm_2', 'severity' : 'Alarm'}]
+    assert len(alarms) == 5
+    translations = etree.parse(parser.PROJECT.alarmsTranslationFile)
+    assert [(item.get('textId'), item.text) for item in translations.iter('Item')] == [
+        ('Alarm_1', 'Door open'), ('Alarm_2', 'Air pressure'), ('Alarm_3', 'Emergency stop'), ('Alarm_4', 'Spare'), ('Alarm_5', None)]
@@ -0,0 +1,28 @@
+import json
+import os
+
+import batch
+from synthetic_plant import makeSyntheticProject
+
+def test_the_projects_of_a_manifest_reuse_the_parsed_inputs(parser, tmp_path, monkeypatch, capsys):
+    for name in ('LineA', 'LineB'):
+        makeSyntheticProject(str(tmp_path / name), plcs=2, machines=2, stations=3, actuators=2, alarms=20)
+    manifestFile = tmp_path / 'projects.json'
+    manifestFile.write_text(json.dumps({'projects' : ['LineA', {'name' : 'LineC', 'project' : 'LineB', 'outputDir' : 'out/LineC'}, 'Missing']}))
+    for name in batch.CONVERTER_SETTINGS:
+        monkeypatch.setattr(parser, name, getattr(parser, name))
+    # the files of the previous tests are the same, the first project parses them again
+    for name in ('PLC_TAG_FRAMES', 'TAG_RESOLVERS', 'BASE_TREES', 'WPH_TEMPLATES'):
+        monkeypatch.setattr(parser, name, {})
+
+    projects = batch.readManifest(str(manifestFile))
+    results = batch.runBatch(projects, {'DRY_RUN' : False, 'INGESTION_WORKERS' : 1, 'GENERATION_WORKERS' : 1})
+
+    assert list(projects) == ['LineA', 'LineC', 'Missing']
+    assert projects['LineC'].outputFolder == os.path.join(str(tmp_path), 'out/LineC')
+    assert [result['status'] for result in results] == ['converted', 'converted', 'failed']
+    assert os.path.exists(projects['LineC'].mainInformationModelFile)
+    # LineB has the same files as LineA, nothing is parsed or compiled again
+    assert results[1]['reuse'] == {counter : 0 for counter in batch.REUSE_COUNTERS}
+    assert all(results[0]['reuse'][counter] for counter in batch.REUSE_COUNTERS)
+    assert "Error project Missing failed" in capsys.readouterr().out
@@ -0,0 +1,33 @@
+import bench_converter
+
+def benchResult(calibration : float, machine : str, **seconds) -> dict:
+    return {'plant' : {'plcs' : 2}, 'machine' : machine, 'calibrationSeconds' : calibration,
+            'stages' : {stage : {'seconds' : value, 'peakBytes' : 0} for stage, value in seconds.items()}}
+
+def test_slower_stage_is_a_regression():
+    baseline = benchResult(0.1, 'a', load=1.0, generate=2.0)
+    result = benchResult(0.1, 'a', load=1.1, generate=3.0)
+
+    regressions = bench_converter.compareToBaseline(result, baseline, threshold=0.2)
+    assert len(regressions) == 1
+    assert regressions[0].startswith('generate')
+
+def test_stage_times_are_normalised_by_the_calibration_loop():
+    baseline = benchResult(0.1, 'fast', load=1.0, generate=2.0)
+    # a machine twice as slow, stages took twice as long
+    slowMachine = benchResult(0.2, 'slow', load=2.0, generate=4.0)
+    assert bench_converter.compareToBaseline(slowMachine, baseline, threshold=0.2) == []
+
+    # a machine twice as fast hides no regression
+    fastMachine = benchResult(0.05, 'faster', load=0.5, generate=1.5)
+    regressions = bench_converter.compareToBaseline(fastMachine, baseline, threshold=0.2)
+    assert [line.split()[0] for line in regressions] == ['generate']
+
+def test_baseline_without_calibration_is_compared_in_seconds():
+    baseline = benchResult(None, None, load=1.0)
+    assert bench_converter.compareToBaseline(benchResult(0.2, 'b', load=1.1), baseline, threshold=0.2) == []
+    assert len(bench_converter.compareToBaseline(benchResult(0.2, 'b', load=1.3), baseline, threshold=0.2)) == 1
+
+def test_max_rss_without_resource(monkeypatch):
+    monkeypatch.setattr(bench_converter, 'resource', None)
+    assert bench_converter.maxRssBytes() is None
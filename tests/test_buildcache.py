@@ -0,0 +1,132 @@
+import os
+import pickle
+import re
+import zipfile
+
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+
+from buildcache import BuildCache, workbookSheetHashes
+
+def test_hits_misses_and_writes_are_counted(tmp_path):
+    cache = BuildCache(str(tmp_path / 'cache'))
+    key = cache.key('station', 'rows', 'parameters')
+
+    assert cache.get(key) is None
+    cache.put(key, {'fragment' : b'<da:Station/>'})
+
+    assert cache.get(key) == {'fragment' : b'<da:Station/>'}
+    assert key != cache.key('station', 'rowsparameters') != cache.key('loop', 'rows', 'parameters')
+    assert (cache.statistics.hits, cache.statistics.misses, cache.statistics.writes) == (1, 1, 1)
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = BuildCache(str(tmp_path / 'cache'))
+    for age, name in enumerate(['a', 'b', 'c']):
+        cache.put(name, name * 100)
+        os.utime(cache.path(name), (age, age))
+    entryBytes = os.path.getsize(cache.path('a'))
+    cache.maxBytes = 3 * entryBytes
+
+    cache.get('a')
+    cache.put('d', 'd' * 100)
+
+    assert sorted(os.listdir(cache.folder)) == ['a', 'c', 'd']
+    assert cache.statistics.evictions == 1
+    assert cache.currentBytes == 3 * entryBytes
+
+def test_unreadable_entries_are_misses(tmp_path):
+    cache = BuildCache(str(tmp_path / 'cache'))
+    with open(cache.path('truncated'), 'wb') as fh:
+        fh.write(pickle.dumps(list(range(100)))[:20])
+    with open(cache.path('garbage'), 'wb') as fh:
+        fh.write(b'not a pickle')
+    # pickled by a version of the code that had another module
+    with open(cache.path('stale'), 'wb') as fh:
+        fh.write(pickle.dumps(pickle.loads(pickle.dumps(cache.statistics))).replace(b'buildcache', b'buildcachX'))
+
+    assert [cache.get(key) for key in ['truncated', 'garbage', 'stale', 'missing']] == [None] * 4
+    assert cache.statistics.misses == 4
+
+def test_temp_files_of_interrupted_writes_are_not_counted(tmp_path):
+    folder = tmp_path / 'cache'
+    folder.mkdir()
+    (folder / '.tmpx1y2').write_bytes(b'x' * 1000)
+    (folder / 'entry').write_bytes(b'y' * 10)
+
+    cache = BuildCache(str(folder))
+
+    assert cache.currentBytes == cache.size() == 10
+
+INLINE_STRING = re.compile(r'<c r="([A-Z]+[0-9]+)" t="inlineStr"><is><t>([^<]*)</t></is></c>')
+
+def writeWorkbook(path : str, sheets : dict[str, list[list]]):
+    """Workbook with a shared strings table in order of first use, as Excel writes it (openpyxl writes inline strings)"""
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for name, rows in sheets.items():
+        sheet = workbook.create_sheet(name)
+        for row in rows:
+            sheet.append(row)
+    workbook.save(path)
+
+    with zipfile.ZipFile(path) as archive:
+        members = {name : archive.read(name) for name in archive.namelist()}
+    strings : list[str] = []
+    def sharedString(match : re.Match) -> str:
+        if match.group(2) not in strings:
+            strings.append(match.group(2))
+        return f'<c r="{match.group(1)}" t="s"><v>{strings.index(match.group(2))}</v></c>'
+    for name in sorted(members):
+        if name.startswith('xl/worksheets/'):
+            members[name] = INLINE_STRING.sub(sharedString, members[name].decode()).encode()
+    members['xl/sharedStrings.xml'] = ('<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                                       + ''.join(f'<si><t>{text}</t></si>' for text in strings) + '</sst>').encode()
+    members['xl/_rels/workbook.xml.rels'] = members['xl/_rels/workbook.xml.rels'].replace(b'</Relationships>',
+        b'<Relationship Id="rIdSst" Target="sharedStrings.xml" '
+        b'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings"/></Relationships>')
+    members['[Content_Types].xml'] = members['[Content_Types].xml'].replace(b'</Types>',
+        b'<Override PartName="/xl/sharedStrings.xml" '
+        b'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/></Types>')
+    with zipfile.ZipFile(path, 'w') as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+
+def test_sheet_hashes_only_change_with_the_sheet_content(tmp_path):
+    path = str(tmp_path / 'Project_PLC1.xlsm')
+    sheets = {'_01_01' : [['NameL1', 'Infeed'], ['Actuator', 'DataType']], '_01_02' : [['NameL1', 'Outfeed'], ['Actuator', 'DataType']]}
+    writeWorkbook(path, sheets)
+    before = workbookSheetHashes(path)
+
+    # a new string in the first sheet shifts the shared string indexes of the second one
+    sheets['_01_01'].append(['Aligner'])
+    writeWorkbook(path, sheets)
+    after = workbookSheetHashes(path)
+
+    assert [cell.value for row in load_workbook(path)['_01_02'].iter_rows() for cell in row] == ['NameL1', 'Outfeed', 'Actuator', 'DataType']
+    assert after['_01_02'] == before['_01_02']
+    assert after['_01_01'] != before['_01_01']
+
+def test_unchanged_sheets_and_stations_come_from_the_cache(parser, tmp_path, monkeypatch):
+    cache = BuildCache(str(tmp_path / 'cache'))
+    cold = parser.excelConfigFilesToDataFrames(parser.PROJECT.inputFolder, cache=cache)
+    sheets = cache.statistics.writes
+
+    warm = parser.excelConfigFilesToDataFrames(parser.PROJECT.inputFolder, cache=cache)
+
+    assert sheets == 2 * (2 * 3 + 1)
+    assert cache.statistics.hits == sheets
+    for coldFrame, warmFrame in zip(cold, warm):
+        pd.testing.assert_frame_equal(warmFrame, coldFrame)
+
+    def writtenModel() -> bytes:
+        parser.generateMainInformationModelFromDataFrames(*warm)
+        with open(parser.PROJECT.mainInformationModelFile, 'rb') as fh:
+            return fh.read()
+
+    uncached = writtenModel()
+    monkeypatch.setattr(parser, 'BUILD_CACHE', cache)
+    assert writtenModel() == uncached
+    hits = cache.statistics.hits
+    assert writtenModel() == uncached
+    # 12 stations and 4 loop registers
+    assert cache.statistics.hits - hits == 16
@@ -0,0 +1,55 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import cli
+from conftest import ROOT
+from synthetic_plant import makeSyntheticProject
+
+def runCli(*args : str) -> subprocess.CompletedProcess:
+    """cli.main in a fresh interpreter, printing the heavy modules it imported"""
+    code = ("import sys, cli; code = cli.main(sys.argv[1:]); "
+            "print(sorted(name for name in ('pandas', 'lxml', 'parser') if name in sys.modules)); sys.exit(code)")
+    return subprocess.run([sys.executable, '-c', code, *args], cwd=ROOT, capture_output=True, text=True)
+
+def test_list_plcs_reads_only_the_configuration(tmp_path):
+    root = makeSyntheticProject(str(tmp_path / 'plant'), plcs=2, machines=1, stations=1, actuators=1, alarms=1)
+    result = runCli('--project', root, '--list-plcs')
+
+    assert result.returncode == 0, result.stderr
+    lines = result.stdout.splitlines()
+    assert [line.split()[0] for line in lines[:-1]] == ['PLC1', 'PLC2']
+    assert lines[0].split()[1] == 'OpcUa'
+    assert lines[-1] == '[]'
+
+def test_validate_reports_configuration_errors(tmp_path):
+    root = makeSyntheticProject(str(tmp_path / 'plant'), plcs=2, machines=1, stations=1, actuators=1, alarms=1)
+    result = runCli('--project', root, '--validate')
+    assert result.returncode == 0, result.stdout
+    assert "Configuration OK" in result.stdout
+    assert not [line for line in result.stdout.splitlines() if line.startswith('Error')]
+    # the model is built
+    assert result.stdout.splitlines()[-1] == "['lxml', 'pandas', 'parser']"
+
+    with open(os.path.join(root, 'ConfigFIles', 'PlcConfig.json'), 'w', encoding='utf-8') as fh:
+        json.dump({'PLC1' : {'plcType' : 'Beckhoff', 'address' : '10.0.0.1'}}, fh)
+    result = runCli('--project', root, '--validate')
+    assert result.returncode == 1
+    assert "Error PLC PLC1 : missing remoteAmsNetId" in result.stdout
+    assert "Error Workbook Synthetic_PLC2.xlsm : PLC PLC2 is not in the PLC configuration" in result.stdout
+    # a configuration error stops before the conversion
+    assert result.stdout.splitlines()[-1] == '[]'
+
+def test_importing_parser_reads_no_file(tmp_path):
+    result = subprocess.run([sys.executable, '-c', "import parser"], cwd=tmp_path, capture_output=True, text=True,
+                            env={**os.environ, 'PYTHONPATH' : ROOT})
+    assert result.returncode == 0, result.stderr
+
+def test_project_paths_from_the_options():
+    args = argparse.Namespace(project='/plant', input_dir='/workbooks', config_dir=None, base_dir=None, output_dir='/out')
+    paths = cli.projectPaths(args)
+    assert paths.inputFolder == '/workbooks'
+    assert paths.configFolder == os.path.join('/plant', 'ConfigFIles')
+    assert paths.outputFolder == '/out'
@@ -0,0 +1,35 @@
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+def generateModel(parser, frames, workers : int) -> bytes:
+    parser.generateMainInformationModelFromDataFrames(*frames, workers=workers)
+    with open(parser.PROJECT.mainInformationModelFile, 'rb') as fh:
+        return fh.read()
+
+def test_workers_build_the_serial_model(parser, monkeypatch):
+    # small shift registers keep the model quick to build
+    monkeypatch.setattr(parser, 'LOOP_WPH_COUNT', 3)
+    monkeypatch.setattr(parser, 'STATION_WPH_COUNT', 3)
+    frames = parser.excelConfigFilesToDataFrames(parser.PROJECT.inputFolder)
+    serial = generateModel(parser, frames, workers=1)
+
+    # one PLC per worker
+    assert generateModel(parser, frames, workers=2) == serial
+    # more workers than PLCs, the machines are built by the workers
+    assert generateModel(parser, frames, workers=3) == serial
+    assert serial.count(b'<da:AutomationDevice ') == 2
+
+def test_spawned_workers_build_the_serial_model(parser, monkeypatch):
+    # settings the workers must get from the parent, the default project folders of the module do not
+    # resolve from the current folder either
+    monkeypatch.setattr(parser, 'LOOP_WPH_COUNT', 3)
+    monkeypatch.setattr(parser, 'STATION_WPH_COUNT', 3)
+    frames = parser.excelConfigFilesToDataFrames(parser.PROJECT.inputFolder, workers=1)
+    serial = generateModel(parser, frames, workers=1)
+
+    monkeypatch.setattr(parser, 'ProcessPoolExecutor', functools.partial(ProcessPoolExecutor, mp_context=multiprocessing.get_context('spawn')))
+    # more workers than PLCs, the machines are built by the workers
+    assert generateModel(parser, frames, workers=3) == serial
+    # one PLC per worker
+    assert generateModel(parser, frames, workers=2) == serial
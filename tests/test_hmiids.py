@@ -0,0 +1,66 @@
+from lxml import etree
+
+import hmiids
+from hmiids import HMI_ID_MAX, HMI_ID_MIN, HmiIdAllocator, assignHmiIds, loadHmiIdAllocator
+
+PATHS = ['PLC1', 'PLC1/M01', 'PLC1/M01/ST01', 'PLC1/M01/ST01/ShiftRegisterST01/WPH_3/2', 'PLC2/M01/ST01']
+
+def test_ids_are_derived_from_the_scope_path(tmp_path):
+    ids = [HmiIdAllocator().allocate(path) for path in PATHS]
+
+    # another run, in another order
+    allocator = HmiIdAllocator()
+    assert [allocator.allocate(path) for path in reversed(PATHS)] == list(reversed(ids))
+    assert len(set(ids)) == len(ids)
+    assert all(HMI_ID_MIN <= hmiId < HMI_ID_MAX for hmiId in ids)
+
+def test_collisions_probe_the_next_free_id(monkeypatch):
+    monkeypatch.setattr(HmiIdAllocator, 'hashedId', lambda self, path: HMI_ID_MAX - 1)
+    allocator = HmiIdAllocator()
+
+    assert [allocator.allocate(path) for path in PATHS[:3]] == [HMI_ID_MAX - 1, HMI_ID_MAX, HMI_ID_MIN]
+
+def test_a_path_seen_twice_gets_an_occurrence_suffix():
+    allocator = HmiIdAllocator()
+    first, second, third = (allocator.allocate('PLC1/M01/Parameters') for _ in range(3))
+
+    assert list(allocator.assigned) == ['PLC1/M01/Parameters', 'PLC1/M01/Parameters#2', 'PLC1/M01/Parameters#3']
+    assert second == HmiIdAllocator().hashedId('PLC1/M01/Parameters#2')
+    assert len({first, second, third}) == 3
+
+def test_saved_ids_are_kept_and_reserved(tmp_path, monkeypatch):
+    path = str(tmp_path / 'HmiIdMap.json')
+    previous = HmiIdAllocator({'PLC1/M01' : 123456})
+    previous.allocate('PLC1/M01')
+    previous.save(path)
+
+    # a new element hashed on the id of an existing one does not take it, even when allocated first
+    monkeypatch.setattr(HmiIdAllocator, 'hashedId', lambda self, path: 123456)
+    allocator = loadHmiIdAllocator(path)
+    assert allocator.allocate('PLC1/M02') == 123457
+    assert allocator.allocate('PLC1/M01') == 123456
+    assert loadHmiIdAllocator(str(tmp_path / 'missing.json')).previous == {}
+
+def test_da_elements_get_ids_in_document_order():
+    station = etree.fromstring(f'<da:Station xmlns:da="{hmiids.DA_NAMESPACE}" scopeId="ST01"><Folder name="Parameters">'
+                               f'<da:GenericOutbound name="WaitingTime"><Primitive name="Data"/></da:GenericOutbound></Folder>'
+                               f'<da:Actuator name="ACT01" scopeId="_01_01_01_Act01"/></da:Station>')
+    allocator = HmiIdAllocator()
+
+    assignHmiIds(element=station, allocator=allocator, parentPath='PLC1/M01')
+
+    assert list(allocator.assigned) == ['PLC1/M01/ST01', 'PLC1/M01/ST01/Parameters/WaitingTime', 'PLC1/M01/ST01/_01_01_01_Act01']
+    assert [element.get('hmiId') for element in station.iter()] == [str(allocator.assigned['PLC1/M01/ST01']), None,
+        str(allocator.assigned['PLC1/M01/ST01/Parameters/WaitingTime']), None, str(allocator.assigned['PLC1/M01/ST01/_01_01_01_Act01'])]
+
+def test_regenerated_models_are_identical(parser):
+    frames = parser.excelConfigFilesToDataFrames(parser.PROJECT.inputFolder)
+    models = []
+    for _ in range(2):
+        parser.generateMainInformationModelFromDataFrames(*frames)
+        with open(parser.PROJECT.mainInformationModelFile, 'rb') as fh:
+            models.append(fh.read())
+
+    assert models[0] == models[1]
+    hmiIds = etree.fromstring(models[0]).xpath('//@hmiId')
+    assert len(hmiIds) == len(set(hmiIds)) > 1000
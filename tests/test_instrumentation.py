@@ -0,0 +1,57 @@
+import instrumentation
+from instrumentation import Instrumentation
+
+def test_disabled_by_default():
+    recorder = Instrumentation()
+    with recorder.stage('load'):
+        recorder.count('rows', 3)
+    assert recorder.stages == {}
+    assert not recorder.counters
+
+def test_stages_and_counters():
+    recorder = Instrumentation(enabled=True)
+    for _ in range(2):
+        with recorder.stage('load'):
+            recorder.count('rows', 3)
+
+    report = recorder.report(rows=6)
+    assert report['stages']['load']['calls'] == 2
+    assert report['counters'] == {'rows' : 6}
+    assert report['rows'] == 6
+    if instrumentation.resource is not None:
+        assert report['stages']['load']['peakRssGrowthBytes'] >= 0
+        assert report['stages']['load']['processPeakRssBytes'] > 0
+
+def test_peak_rss_growth_of_a_stage():
+    if instrumentation.resource is None:
+        return
+    recorder = Instrumentation(enabled=True)
+    with recorder.stage('allocate'):
+        block = bytearray(64 * 1024 * 1024)
+        block[::4096] = b'x' * len(block[::4096])
+    with recorder.stage('idle'):
+        pass
+
+    stages = recorder.report()['stages']
+    assert stages['idle']['peakRssGrowthBytes'] == 0
+    assert stages['allocate']['processPeakRssBytes'] == stages['idle']['processPeakRssBytes']
+
+def test_tag_counts_are_flushed_once(parser, monkeypatch):
+    monkeypatch.setattr(parser.INSTRUMENTATION, 'enabled', True)
+    plconfig = parser.PLC_CONFIG['PLC1']
+    # counts of the earlier tests
+    parser.flushTagCounts()
+    parser.INSTRUMENTATION.reset()
+    row = parser.TagRow('01', '02', 'Station', '03', 'Actuator')
+    key = parser.PLCTAG_DATAFRAME.index[0]
+    plconfig.get_tag(key, row, 1, 1)
+    plconfig.tagResolver.resolveMany([(key, row, 1, 1)] * 2)
+
+    # nothing is counted per call
+    assert 'tags resolved' not in parser.INSTRUMENTATION.counters
+    parser.flushTagCounts()
+    assert parser.INSTRUMENTATION.counters['tags resolved'] == 3
+    assert parser.INSTRUMENTATION.counters['get_tag calls'] == 1
+    parser.flushTagCounts()
+    assert parser.INSTRUMENTATION.counters['tags resolved'] == 3
+    parser.INSTRUMENTATION.reset()
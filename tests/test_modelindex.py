@@ -0,0 +1,38 @@
+import pandas as pd
+
+from modelindex import ModelRow, modelIndex
+
+def firstRow(df : pd.DataFrame) -> ModelRow:
+    return ModelRow._make(df[list(ModelRow._fields)].astype(object).iloc[0])
+
+def assertIndexMatchesGroupby(parser, dfinformationModel : pd.DataFrame):
+    devices = modelIndex(dfinformationModel)
+    groups = list(dfinformationModel.groupby('AutomationDevice', observed=True))
+    assert [device.key for device in devices] == [name for name, _ in groups]
+
+    for device, (_, dfDevice) in zip(devices, groups):
+        assert (device.row, device.rowsHash) == (firstRow(dfDevice), parser.hashFrame(dfDevice))
+        machines = list(dfDevice.groupby('Machine', observed=True))
+        assert [machine.key for machine in device.children] == [name for name, _ in machines]
+
+        for machine, (_, dfMachine) in zip(device.children, machines):
+            assert (machine.row, machine.rowsHash) == (firstRow(dfMachine), parser.hashFrame(dfMachine))
+            stations = list(dfMachine.groupby('Station', observed=True))
+            assert [station.key for station in machine.children] == [name for name, _ in stations]
+
+            for station, (_, dfStation) in zip(machine.children, stations):
+                assert (station.row, station.rowsHash) == (firstRow(dfStation), parser.hashFrame(dfStation))
+                actuators = list(dfStation.groupby(['Actuator', 'ActuatorName'], observed=True))
+                assert [actuator.key for actuator in station.children] == [name for name, _ in actuators]
+                assert [actuator.row for actuator in station.children] == [firstRow(dfActuator) for _, dfActuator in actuators]
+
+def test_index_has_the_groups_first_rows_and_hashes_of_groupby(parser):
+    dfinformationModel, _, _ = parser.excelConfigFilesToDataFrames(parser.PROJECT.inputFolder)
+    assertIndexMatchesGroupby(parser, dfinformationModel)
+
+def test_unsorted_rows_and_missing_keys_are_grouped_like_groupby(parser):
+    dfinformationModel, _, _ = parser.excelConfigFilesToDataFrames(parser.PROJECT.inputFolder)
+    shuffled = dfinformationModel.sample(frac=1, random_state=3)
+    shuffled.loc[shuffled.index[:5], 'Station'] = None
+    shuffled.loc[shuffled.index[5:10], 'ActuatorName'] = None
+    assertIndexMatchesGroupby(parser, shuffled)
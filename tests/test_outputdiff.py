@@ -0,0 +1,78 @@
+import os
+
+from outputdiff import diffXml
+
+OLD = b"""<InformationModel>
+    <Application name="Application">
+        <AutomationDevice name="PLC1">
+            <Machine scopeId="M01"><Station scopeId="ST01" hmiId="1"/><Station scopeId="ST02"/></Machine>
+        </AutomationDevice>
+    </Application>
+</InformationModel>"""
+
+NEW = b"""<InformationModel>
+    <Application name="Application">
+        <AutomationDevice name="PLC1">
+            <Machine scopeId="M01"><Station scopeId="ST01" hmiId="2"/><Station scopeId="ST03"><Actuator name="A"/></Station></Machine>
+        </AutomationDevice>
+    </Application>
+</InformationModel>"""
+
+def writeFile(path, data : bytes) -> str:
+    with open(path, 'wb') as fh:
+        fh.write(data)
+    return str(path)
+
+def test_diff_by_scope_path(tmp_path):
+    diff = diffXml(writeFile(tmp_path / 'old.xml', OLD), writeFile(tmp_path / 'new.xml', NEW))
+    assert diff.added == ['InformationModel/Application/PLC1/M01/ST03']
+    assert diff.removed == ['InformationModel/Application/PLC1/M01/ST02']
+    assert diff.changed == ['InformationModel/Application/PLC1/M01/ST01']
+    assert diff.counts() == {'added' : 2, 'removed' : 1, 'changed' : 1}
+
+def test_formatting_is_not_a_change(tmp_path):
+    diff = diffXml(writeFile(tmp_path / 'old.xml', OLD), writeFile(tmp_path / 'new.xml', OLD.replace(b'\n    ', b'\n')))
+    assert not diff
+    assert diff.summary() == "formatting only, no element changed"
+
+def test_unchanged_outputs_are_not_rewritten(parser, tmp_path, monkeypatch):
+    monkeypatch.setattr(parser, 'OUTPUT_DIFF', True)
+    path = writeFile(tmp_path / 'out.xml', OLD)
+    os.utime(path, ns=(1, 1))
+
+    parser.OUTPUT_CHANGES.clear()
+    parser.commitOutput(path, data=OLD)
+    assert parser.OUTPUT_CHANGES[path] == {'status' : 'unchanged'}
+    assert os.stat(path).st_mtime_ns == 1
+
+    tmpPath = writeFile(tmp_path / 'out.xml.tmp', NEW)
+    parser.commitOutput(path, tmpPath=tmpPath)
+    assert parser.OUTPUT_CHANGES[path] == {'status' : 'changed', 'added' : 2, 'removed' : 1, 'changed' : 1}
+    assert parser.OUTPUT_DIFFS[path].added == ['InformationModel/Application/PLC1/M01/ST03']
+    assert not os.path.exists(tmpPath)
+    with open(path, 'rb') as fh:
+        assert fh.read() == NEW
+
+def test_dry_run_writes_nothing(parser, tmp_path, monkeypatch):
+    monkeypatch.setattr(parser, 'DRY_RUN', True)
+    path = writeFile(tmp_path / 'out.xml', OLD)
+    parser.commitOutput(path, data=NEW)
+    parser.commitOutput(str(tmp_path / 'created.xml'), data=NEW)
+
+    assert parser.OUTPUT_CHANGES[path]['status'] == 'changed'
+    assert parser.OUTPUT_CHANGES[str(tmp_path / 'created.xml')] == {'status' : 'created'}
+    assert not os.path.exists(tmp_path / 'created.xml')
+    with open(path, 'rb') as fh:
+        assert fh.read() == OLD
+
+def test_second_conversion_writes_nothing(parser, monkeypatch):
+    monkeypatch.setattr(parser, 'BUILD_CACHE_FOLDER', None)
+    monkeypatch.setattr(parser, 'GENERATION_WORKERS', 1)
+    monkeypatch.setattr(parser, 'INGESTION_WORKERS', 1)
+    first = parser.runConverter()
+    assert {change['status'] for change in first.values()} == {'created'}
+
+    mtimes = {path : os.stat(path).st_mtime_ns for path in first}
+    second = parser.runConverter()
+    assert {change['status'] for change in second.values()} == {'unchanged'}
+    assert {path : os.stat(path).st_mtime_ns for path in second} == mtimes
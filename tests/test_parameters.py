@@ -0,0 +1,66 @@
+import os
+
+import pandas as pd
+import pytest
+from lxml import etree
+
+from synthetic_plant import writeWorkbook
+
+@pytest.fixture
+def parameters(parser) -> pd.DataFrame:
+    """The synthetic project with 3 parameters per machine and station, its parameters frame"""
+    for plc in range(1, 3):
+        writeWorkbook(os.path.join(parser.PROJECT.inputFolder, f'Synthetic_PLC{plc}.xlsm'), machines=2, stations=3, actuators=2,
+                      alarms=20, seed=plc, parameters=3)
+    return parser.excelConfigFilesToDataFrames(parser.PROJECT.inputFolder)[1]
+
+def parameterPrimitives(folder : etree.Element) -> dict[str, dict[str, str]]:
+    return {parameter.get('name') : dict(parameter[0].attrib) for parameter in folder}
+
+def test_machine_and_station_sheets_give_parameter_rows(parameters):
+    assert len(parameters) == 2 * (2 + 2 * 3) * 3
+    machineParameters = parameters[parameters['Station'].isna()]
+    assert sorted(zip(machineParameters['AutomationDevice'], machineParameters['Machine'])) == sorted(
+        [(f'PLC{plc}', f'{machine:02d}') for plc in range(1, 3) for machine in range(1, 3) for _ in range(3)])
+    assert set(parameters['DataType']) <= {'Int32', 'Real'}
+    assert 'Value' not in parameters.columns
+
+def test_parameters_folders_are_filled_from_the_pars_blocks(parser, parameters):
+    parser.runConverter()
+
+    model = etree.parse(parser.PROJECT.mainInformationModelFile)
+    plc = model.find(".//da:AutomationDevice[@name='PLC1']", parser.NAMESPACES)
+    station = plc.find("da:Machine[@name='M01']/da:Station[@name='ST02']", parser.NAMESPACES)
+    stationRows = parameters[(parameters['AutomationDevice'] == 'PLC1') & (parameters['Machine'] == '01') & (parameters['Station'] == '02')]
+
+    assert parameterPrimitives(station.find("Folder[@name='Parameters']", parser.NAMESPACES)) == {
+        name : {'name' : 'Data', 'dataType' : dataType, 'plcTag' : f'//_01_02_Station0102.Pars.{name}', 'canSet' : 'true', 'isVisible' : 'true',
+                'min' : f'//_01_02_Station0102.Pars.{name}_Min', 'max' : f'//_01_02_Station0102.Pars.{name}_Max'}
+        for name, dataType in zip(stationRows['ParameterName'], stationRows['DataType'])}
+
+    machine = plc.find("da:Machine[@name='M02']", parser.NAMESPACES)
+    assert [primitive['plcTag'] for primitive in parameterPrimitives(machine.find("Folder[@name='Parameters']", parser.NAMESPACES)).values()] == [
+        '//_02_Main.Pars.Par01', '//_02_Main.Pars.Par02', '//_02_Main.Pars.Par03']
+
+def test_editing_one_station_changes_only_its_parameters_hash(parser, parameters):
+    dfinformationModel, _, _ = parser.excelConfigFilesToDataFrames(parser.PROJECT.inputFolder)
+    stations = [station for device in parser.makeModelIndex(dfinformationModel) for machine in device.children for station in machine.children]
+
+    parser.useTagTable(dfinformationModel, parameters)
+    before = [parser.stationParametersHash(station) for station in stations]
+    edited = parameters.copy()
+    edited.loc[(edited['AutomationDevice'] == 'PLC2') & (edited['Machine'] == '01') & (edited['Station'] == '03'), 'DataType'] = 'Int64'
+    parser.useTagTable(dfinformationModel, edited)
+    after = [parser.stationParametersHash(station) for station in stations]
+
+    assert [(station.row.AutomationDevice, station.row.Machine, station.row.Station) for station, old, new in zip(stations, before, after)
+                if old != new] == [('PLC2', '01', '03')]
+
+def test_parameters_of_unknown_stations_are_reported(parser, parameters, capsys):
+    dfinformationModel, _, _ = parser.excelConfigFilesToDataFrames(parser.PROJECT.inputFolder)
+    unknown = parameters.head(1).astype(object).assign(Station='09')
+
+    table = parser.makeParameterTable(dfinformationModel, pd.concat([parameters.astype(object), unknown], ignore_index=True))
+
+    assert len(table) == len(parameters)
+    assert f"Error parameters of {unknown['AutomationDevice'].iloc[0]} M{unknown['Machine'].iloc[0]} ST09" in capsys.readouterr().out
@@ -0,0 +1,33 @@
+from bench_shift_register import elementwiseShiftRegister, withoutHmiIds
+
+def test_stamped_registers_match_the_elementwise_builder(parser):
+    dfinformationModel, _, _ = parser.excelConfigFilesToDataFrames(parser.PROJECT.inputFolder)
+    dfStation = dfinformationModel[(dfinformationModel['Machine'] == '02') & (dfinformationModel['Station'] == '03')]
+    row = parser.makeModelIndex(dfStation)[0].children[0].children[0].row
+
+    for wphCount, nestCount in [(1, 1), (7, 4), (40, 2)]:
+        reference = elementwiseShiftRegister(parser, 'Loop01', dfStation, wphCount, nestCount)
+        stamped = parser.makeshiftRegister(shiftRegisterName='Loop01', row=row, wphCount=wphCount, nestCount=nestCount)
+        assert withoutHmiIds(stamped) == withoutHmiIds(reference)
+
+        reference = elementwiseShiftRegister(parser, 'ShiftRegisterST03', dfStation, wphCount, nestCount, dfStation=dfStation)
+        stamped = parser.makeshiftRegister(shiftRegisterName='ShiftRegisterST03', row=row, wphCount=wphCount,
+                                           nestCount=nestCount, station=True)
+        assert withoutHmiIds(stamped) == withoutHmiIds(reference)
+
+    assert b'M02.GVLWPHsST03[7].Nest[4].Sts_StationFailID' in withoutHmiIds(parser.makeshiftRegister(
+        shiftRegisterName='ShiftRegisterST03', row=row, wphCount=7, nestCount=4, station=True))
+
+def test_one_template_per_register_kind_and_nest_count(parser):
+    parser.WPH_TEMPLATES.clear()
+    dfinformationModel, _, _ = parser.excelConfigFilesToDataFrames(parser.PROJECT.inputFolder)
+    row = parser.makeModelIndex(dfinformationModel)[0].row
+
+    for _ in range(2):
+        for station in [False, True]:
+            for nestCount in [2, 4]:
+                parser.makeshiftRegister(shiftRegisterName='Register', row=row, wphCount=3, nestCount=nestCount, station=station)
+
+    assert len(parser.WPH_TEMPLATES) == 4
+    # the prototypes are copied, never filled
+    assert all(template.attrib['name'] == '' and template[0].attrib['plcTag'] == '' for template in parser.WPH_TEMPLATES.values())
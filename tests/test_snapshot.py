@@ -0,0 +1,68 @@
+import math
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import snapshot
+from hmiids import HmiIdAllocator
+
+def test_snapshot_round_trip(parser, tmp_path):
+    frames = parser.excelConfigFilesToDataFrames(parser.PROJECT.inputFolder)
+    folder = str(tmp_path / 'snapshot')
+    manifest = snapshot.writeSnapshot(folder, frames, parser.PROJECT.inputFolder)
+
+    assert [frame['rows'] for frame in manifest['frames'].values()] == [len(df) for df in frames]
+    for df, restored in zip(frames, snapshot.readSnapshot(folder)):
+        pd.testing.assert_frame_equal(restored, df)
+        assert restored.dtypes.to_dict() == df.dtypes.to_dict()
+
+def test_mixed_values_keep_their_type(tmp_path):
+    df = pd.DataFrame({'Value' : pd.Series(['1', 2, 3.5, None, True, math.nan, '', 'é'], dtype=object),
+                       'Station' : pd.Categorical(['01', '02', None, '01', '02', '01', '01', '02']),
+                       'Count' : np.arange(8, dtype=np.int32),
+                       'Name' : pd.Series(list('abcdefgh'), dtype='str')})
+    folder = str(tmp_path)
+    frame = snapshot.writeFrame(folder, 'mixed', df)
+    restored = snapshot.readFrame(folder, 'mixed', frame)
+
+    pd.testing.assert_frame_equal(restored, df)
+    assert [type(value) for value in restored['Value']] == [type(value) for value in df['Value']]
+    assert not os.path.exists(os.path.join(folder, 'mixed.0.pickle.npy'))
+
+def test_other_values_are_pickled(tmp_path):
+    df = pd.DataFrame({'Value' : pd.Series([pd.Timestamp('2024-01-01'), 'text', 2**70], dtype=object)})
+    frame = snapshot.writeFrame(str(tmp_path), 'other', df)
+    assert frame['columns'][0]['encoding'] == 'pickle'
+    pd.testing.assert_frame_equal(snapshot.readFrame(str(tmp_path), 'other', frame), df)
+
+def test_stale_snapshot(parser, tmp_path):
+    frames = parser.excelConfigFilesToDataFrames(parser.PROJECT.inputFolder)
+    folder = str(tmp_path / 'snapshot')
+    snapshot.writeSnapshot(folder, frames, parser.PROJECT.inputFolder)
+    assert snapshot.snapshotErrors(folder, parser.PROJECT.inputFolder) == []
+
+    with open(os.path.join(parser.PROJECT.inputFolder, 'Synthetic_PLC1.xlsm'), 'ab') as fh:
+        fh.write(b'\0')
+    os.remove(os.path.join(parser.PROJECT.inputFolder, 'Synthetic_PLC2.xlsm'))
+    assert snapshot.snapshotErrors(folder, parser.PROJECT.inputFolder) == ["Synthetic_PLC1.xlsm changed", "Synthetic_PLC2.xlsm removed"]
+
+def test_unknown_schema_is_refused(parser, tmp_path):
+    folder = str(tmp_path)
+    with open(os.path.join(folder, 'manifest.json'), 'w', encoding='utf-8') as fh:
+        fh.write('{"schemaVersion" : 1, "format" : "arrow"}')
+    with pytest.raises(ValueError):
+        snapshot.readSnapshot(folder)
+
+def test_model_from_snapshot_is_identical(parser, tmp_path):
+    frames = parser.excelConfigFilesToDataFrames(parser.PROJECT.inputFolder)
+    folder = str(tmp_path / 'snapshot')
+    snapshot.writeSnapshot(folder, frames, parser.PROJECT.inputFolder)
+
+    models = []
+    for source in [frames, snapshot.readSnapshot(folder)]:
+        parser.generateMainInformationModelFromDataFrames(*source, allocator=HmiIdAllocator())
+        with open(parser.PROJECT.mainInformationModelFile, 'rb') as fh:
+            models.append(fh.read())
+    assert models[0] == models[1]
@@ -0,0 +1,37 @@
+import os
+
+from lxml import etree
+
+def test_split_output_includes_every_device_and_machine(parser, monkeypatch):
+    frames = parser.excelConfigFilesToDataFrames(parser.PROJECT.inputFolder, workers=1)
+    parser.generateMainInformationModelFromDataFrames(*frames)
+    with open(parser.PROJECT.mainInformationModelFile, 'rb') as fh:
+        single = etree.fromstring(fh.read())
+
+    monkeypatch.setattr(parser, 'SPLIT_OUTPUT', 'machine')
+    parser.generateMainInformationModelFromDataFrames(*frames)
+    main = etree.parse(parser.PROJECT.mainInformationModelFile).getroot()
+    includes = [include.get('file') for include in main.iter(f"{{{parser.NAMESPACES['']}}}Include")]
+    assert includes == ['Services/ProjectTags.xml', 'AutomationDevices/PLC1.xml', 'AutomationDevices/PLC2.xml']
+
+    device = etree.parse(os.path.join(parser.PROJECT.dataFolder, 'AutomationDevices', 'PLC1.xml')).getroot()
+    machines = [include.get('file') for include in device.iter(f"{{{parser.NAMESPACES['']}}}Include")]
+    assert machines == ['AutomationDevices/PLC1/M01.xml', 'AutomationDevices/PLC1/M02.xml']
+
+    # the split files hold the elements of the single file, with the same hmiIds
+    machine = etree.parse(os.path.join(parser.PROJECT.dataFolder, 'AutomationDevices', 'PLC1', 'M01.xml')).getroot()[0]
+    expected = single.find(".//da:AutomationDevice[@name='PLC1']/da:Machine[@name='M01']", parser.NAMESPACES)
+    assert [(element.tag, dict(element.attrib)) for element in machine.iter()] == \
+           [(element.tag, dict(element.attrib)) for element in expected.iter()]
+
+def test_include_files_are_removed_once_the_output_is_not_split(parser, monkeypatch):
+    frames = parser.excelConfigFilesToDataFrames(parser.PROJECT.inputFolder, workers=1)
+    includeFolder = os.path.join(parser.PROJECT.dataFolder, parser.INCLUDE_FOLDER)
+
+    monkeypatch.setattr(parser, 'SPLIT_OUTPUT', 'machine')
+    parser.generateMainInformationModelFromDataFrames(*frames)
+    assert sorted(os.listdir(includeFolder)) == ['PLC1', 'PLC1.xml', 'PLC2', 'PLC2.xml']
+
+    monkeypatch.setattr(parser, 'SPLIT_OUTPUT', None)
+    parser.generateMainInformationModelFromDataFrames(*frames)
+    assert not os.path.exists(includeFolder)
@@ -0,0 +1,23 @@
+import pytest
+
+from synthetic_plant import MAIN_INFORMATION_MODEL_BASE
+
+def writtenModel(parser) -> bytes:
+    with open(parser.PROJECT.mainInformationModelFile, 'rb') as fh:
+        return fh.read()
+
+@pytest.mark.parametrize('base', [MAIN_INFORMATION_MODEL_BASE, MAIN_INFORMATION_MODEL_BASE.replace(
+    '<TagsContainer/>', '<TagsContainer>\n        <!-- types -->\n        <t:TagsFolder name="Base"><Tag name="A"/></t:TagsFolder>\n    </TagsContainer>')],
+    ids=['empty', 'tags'])
+def test_streaming_output_is_byte_identical_to_the_tree_output(parser, base):
+    with open(parser.PROJECT.baseFile('MainInformationModelBase.xml'), 'w', encoding='utf-8') as fh:
+        fh.write(base)
+    frames = parser.excelConfigFilesToDataFrames(parser.PROJECT.inputFolder)
+
+    tree = parser.generateMainInformationModelFromDataFrames(*frames)
+    treeModel = writtenModel(parser)
+    statistics = parser.generateMainInformationModelStreaming(*frames)
+
+    assert writtenModel(parser) == treeModel
+    assert treeModel.count(b'xmlns:da=') == 1
+    assert statistics == parser.collectTreeStatistics(tree.find('.//da:Application', parser.NAMESPACES))
@@ -0,0 +1,29 @@
+import pandas as pd
+
+ROW = pd.Series({'AutomationDevice' : 'PLC1', 'Machine' : '01', 'Station' : '02', 'StationName' : 'Station0102',
+                 'Actuator' : '03', 'ActuatorType' : 'Act_Bin', 'ActuatorName' : 'Act03', 'ParameterName' : 'WaitingTime'})
+
+def formatTag(parser, plcType, key : str, row : pd.Series, wphNumber : int, nestNumber : int) -> tuple[str, str]:
+    """What PlcConfig.get_tag did before the resolver"""
+    tagData = parser.PLCTAG_DATAFRAME.loc[key]
+    return tagData[f'{plcType.value} Type'], tagData[f'{plcType.value} Format'].format(
+        Machine_Number = row['Machine'], Station_Number = row['Station'], Station_Name = row['StationName'],
+        Actuator_Number = row['Actuator'], Actuator_Name = row['ActuatorName'], Parameter_Name = row['ParameterName'],
+        Wph_Number = wphNumber, Nest_Number = nestNumber)
+
+def test_resolver_formats_every_plctags_key_like_str_format(parser):
+    for plcType in parser.PlcType:
+        resolver = parser.getTagResolver(plcType)
+        assert set(resolver.templates) == set(parser.PLCTAG_DATAFRAME.index)
+        requests = [(key, parser.tagRowFrom(ROW), 4, 2) for key in parser.PLCTAG_DATAFRAME.index]
+
+        expected = [formatTag(parser, plcType, key, ROW, 4, 2) for key in parser.PLCTAG_DATAFRAME.index]
+        assert resolver.resolveMany(requests) == expected
+        assert [parser.PlcConfig(plcType, '127.0.0.1').get_tag(key, ROW, 4, 2) for key in parser.PLCTAG_DATAFRAME.index] == expected
+
+def test_rows_are_read_from_series_tuples_and_itertuples(parser):
+    expected = parser.TagRow('01', '02', 'Station0102', '03', 'Act03')
+    assert parser.tagRowFrom(ROW.drop('ParameterName')) == expected
+    assert parser.tagRowFrom(next(ROW.drop('ParameterName').to_frame().T.itertuples())) == expected
+    assert parser.tagRowFrom(('01', '02', 'Station0102', '03', 'Act03')) == expected
+    assert parser.tagRowFrom(ROW.drop(['Actuator', 'ActuatorName', 'ParameterName'])) == parser.TagRow('01', '02', 'Station0102')
@@ -0,0 +1,49 @@
+import pandas as pd
+
+FIELDS = pd.DataFrame({'Machine_Number' : ['01', '02'], 'Station_Number' : ['03', '14'], 'Station_Name' : ['Feeder', 'Capper'],
+                       'Actuator_Number' : ['05', '06'], 'Actuator_Name' : ['Act05', 'Act06'], 'Wph_Number' : [1, 12], 'Nest_Number' : [None, 2]})
+
+FORMATS = {'plain' : 'M{Machine_Number}.ST{Station_Number}_{Station_Name}[{Wph_Number}]',
+           'spec' : 'M{Machine_Number}.ST{Wph_Number:03d}',
+           'conversion' : 'M{Machine_Number}.{Station_Name!r}',
+           'index' : 'M{Machine_Number}.{Station_Name[0]}{Actuator_Number}',
+           'attribute' : 'M{Machine_Number}.{Wph_Number.real}',
+           'none' : 'M{Machine_Number}.Nest[{Nest_Number}]'}
+
+def makeResolver(parser) -> 'parser.TagResolver':
+    dfPlcTags = pd.DataFrame({'OpcUa Type' : 'Int32', 'OpcUa Format' : list(FORMATS.values())}, index=list(FORMATS))
+    return parser.TagResolver(parser.PlcType.OPCUA, dfPlcTags)
+
+def test_resolve_columns_matches_str_format_on_both_paths(parser):
+    resolver = makeResolver(parser)
+    for key, tagFormat in FORMATS.items():
+        tagType, addresses = resolver.resolveColumns(key, FIELDS)
+        assert tagType == 'Int32'
+        assert list(addresses) == [tagFormat.format(**row) for row in FIELDS.to_dict('records')], key
+
+def test_resolve_columns_matches_resolve_for_every_plctags_key(parser):
+    row = parser.TagRow('01', '02', 'Station0102', '03', 'Act03', 'WaitingTime')
+    fields = pd.DataFrame({'Machine_Number' : ['01'], 'Station_Number' : ['02'], 'Station_Name' : ['Station0102'], 'Actuator_Number' : ['03'],
+                           'Actuator_Name' : ['Act03'], 'Parameter_Name' : ['WaitingTime'], 'Wph_Number' : [4], 'Nest_Number' : [2]})
+    for plcType in parser.PlcType:
+        resolver = parser.getTagResolver(plcType)
+        for key in parser.PLCTAG_DATAFRAME.index:
+            tagType, addresses = resolver.resolveColumns(key, fields)
+            assert (tagType, addresses[0]) == resolver.resolve(key, row, 4, 2), (plcType, key)
+
+def test_tag_table_has_the_addresses_of_get_tag(parser):
+    dfinformationModel, _, _ = parser.excelConfigFilesToDataFrames(parser.PROJECT.inputFolder)
+    tagTable = parser.makeTagTable(dfinformationModel)
+    row = dfinformationModel.iloc[0]
+    plcConfig = parser.plcConfigs()[row['AutomationDevice']]
+
+    station = tagTable[tagTable['Element'] == f"{row['AutomationDevice']}/M{row['Machine']}/ST{row['Station']}"]
+    assert list(station['Name']) == ['PackMlState', 'Sts_Idle', 'Sts_NoAlm']
+    assert station['PlcTag'].iloc[0] == plcConfig.get_tag(key='Station_PackMl_State', dfInformationModelRow=row)[1]
+    assert station['PlcTag'].iloc[1] == plcConfig.get_tag(key='station_node', dfInformationModelRow=row)[1] + '.Sts_Idle'
+
+    actuatorNode = plcConfig.get_tag(key='actuator_node', dfInformationModelRow=row)[1]
+    actuator = tagTable[tagTable['Element'] == f"{row['AutomationDevice']}/M{row['Machine']}/ST{row['Station']}/"
+                                               f"_{row['Machine']}_{row['Station']}_{row['Actuator']}_{row['ActuatorName']}"]
+    assert list(actuator['PlcTag']) == [f"{actuatorNode}.{primitive.PlcTag}" if primitive.PlcTag else None
+                                        for primitive in parser.Actuator_CONFIG[row['ActuatorType']]]
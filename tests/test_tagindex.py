@@ -0,0 +1,43 @@
+import pytest
+
+import cli
+from tagindex import TagEntry, TagIndex, writeTagIndex
+
+ENTRIES = [TagEntry('//_01_01_Station0101.Act_Open', 'PLC1', 'PLC1/M01/ST01/Act_Open', 11, 'plcTag'),
+           TagEntry('//_01_01_Station0101.Act_Close', 'PLC1', 'PLC1/M01/ST01/Act_Close', 12, 'plcTag'),
+           TagEntry('//_01_01_Station0101.Sts_Idle', 'PLC1', 'PLC1/M01/ST01/Sts_Idle', 13, 'plcTag'),
+           TagEntry('//_01_01_Station0101.Act_Open', 'PLC1', 'PLC1/M01/ST01/Act_OpenCopy', 14, 'plcTag'),
+           TagEntry('_01_01_Alms.L1.0', 'PLC1', 'Alarms/1', 1, 'alarm')]
+
+def test_a_prefix_search_is_one_range_of_the_index(tmp_path):
+    path = str(tmp_path / 'TagIndex.sqlite')
+    assert writeTagIndex(path, ENTRIES) == 5
+
+    with TagIndex(path) as index:
+        assert [entry.path for entry in index.search('//_01_01_Station0101.Act_')] == [
+            'PLC1/M01/ST01/Act_Close', 'PLC1/M01/ST01/Act_Open', 'PLC1/M01/ST01/Act_OpenCopy']
+        # the PLC addresses are case insensitive
+        assert [entry.path for entry in index.search('_01_01_station0101.sts')] == ['PLC1/M01/ST01/Sts_Idle']
+        assert index.search('_01_01_Station0101', limit=2) == [
+            TagEntry('_01_01_Station0101.Act_Close', 'PLC1', 'PLC1/M01/ST01/Act_Close', 12, 'plcTag'),
+            TagEntry('_01_01_Station0101.Act_Open', 'PLC1', 'PLC1/M01/ST01/Act_Open', 11, 'plcTag')]
+        assert [entry.kind for entry in index.lookup('_01_01_Alms.L1.0')] == ['alarm']
+        assert index.search('_02') == []
+
+    with pytest.raises(FileNotFoundError):
+        TagIndex(str(tmp_path / 'missing.sqlite'))
+
+def test_the_conversion_indexes_every_tag_of_the_model(parser, monkeypatch, capsys):
+    monkeypatch.setattr(parser, 'TAG_INDEX', True)
+    parser.runConverter()
+
+    with TagIndex(parser.PROJECT.tagIndexFile) as index:
+        station = index.search('_01_01_Station')
+        alarms = [entry for entry in index.search('') if entry.kind == 'alarm']
+    assert {entry.device for entry in station} == {'PLC1', 'PLC2'}
+    assert all(entry.path.startswith(f"{entry.device}/M01/ST01/") and entry.hmiId for entry in station)
+    assert len(alarms) == 2 * 20
+
+    assert cli.findTag(parser.PROJECT, '_01_01_Station') == 0
+    assert f"{len(station)} elements for _01_01_Station" in capsys.readouterr().out
+    assert cli.findTag(parser.PROJECT, '_99') == 1
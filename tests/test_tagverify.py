@@ -0,0 +1,58 @@
+import socket
+
+import pytest
+
+from tagverify import TagCache, loadTagCache, nodeAddress
+
+def freePort() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def test_a_plc_tag_is_the_string_identifier_of_its_node():
+    assert nodeAddress('//_01_Main.PackMl.Sts_State') == ('_01_Main.PackMl.Sts_State', None)
+    assert nodeAddress('//_01_Alms.Words[51]') == ('_01_Alms.Words', '51')
+
+def test_found_tags_are_cached_until_max_age(tmp_path):
+    cache = TagCache(maxAge=60)
+    cache.add('opc.tcp://127.0.0.1:4940 urn:PLC1', ['//A', '//B'], now=1000.0)
+    path = str(tmp_path / 'PlcTagCache.json')
+    cache.save(path)
+
+    loaded = loadTagCache(path, maxAge=60)
+    assert loaded.isFresh('opc.tcp://127.0.0.1:4940 urn:PLC1', '//A', now=1059.0)
+    assert not loaded.isFresh('opc.tcp://127.0.0.1:4940 urn:PLC1', '//A', now=1060.0)
+    assert not loaded.isFresh('opc.tcp://127.0.0.1:4941 urn:PLC1', '//A', now=1000.0)
+    assert not loaded.isFresh('opc.tcp://127.0.0.1:4940 urn:PLC1', '//C', now=1000.0)
+    assert loadTagCache(str(tmp_path / 'missing.json')).found == {}
+
+def test_the_tags_left_out_of_the_servers_are_missing(parser, monkeypatch):
+    pytest.importorskip('asyncua')
+    from opcua_standin import StandInServers, dropTags
+
+    monkeypatch.setattr(parser, 'VALIDATE_MODEL', True)
+    parser.runConverter()
+    endpoints : dict[int, tuple[str, list[str]]] = {}
+    dropped : set[tuple[str, str]] = set()
+    for deviceName in ('PLC1', 'PLC2'):
+        plcConfig = parser.PLC_CONFIG[deviceName]
+        monkeypatch.setattr(plcConfig, 'address', '127.0.0.1')
+        monkeypatch.setattr(plcConfig, 'port', freePort())
+        plcTags = list(dict.fromkeys(reference.plcTag for reference in parser.MODEL_TAG_REFERENCES if reference.device == deviceName))
+        deviceDropped = dropTags(plcTags, 0.01)
+        endpoints[plcConfig.port] = (plcConfig.defaultNamespaceUri, [plcTag for plcTag in plcTags if plcTag not in deviceDropped])
+        dropped |= {(deviceName, plcTag) for plcTag in deviceDropped}
+
+    monkeypatch.setattr(parser, 'VERIFY_TAGS', True)
+    with StandInServers(endpoints):
+        parser.runConverter()
+        first = parser.TAG_VERIFICATION
+        parser.runConverter()
+        second = parser.TAG_VERIFICATION
+
+    assert dropped
+    assert {(check.device, check.plcTag) for check in first.missing} == dropped
+    assert not first.errors and first.cached == 0
+    # found tags come from PlcTagCache.json, the missing ones are read again
+    assert second.cached == len(first.checks) - len(dropped)
+    assert second.read == len(dropped)
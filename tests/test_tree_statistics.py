@@ -0,0 +1,20 @@
+from lxml import etree
+
+def test_statistics_count_every_descendant_per_local_name(parser):
+    application = etree.fromstring('<InformationModel xmlns="http://www.ima.it/hmi/info-model" xmlns:da="http://www.ima.it/hmi/info-model/Automation">'
+                                   '<da:Application><da:Machine><da:Station><Primitive/><Primitive/></da:Station><!-- note --></da:Machine>'
+                                   '<Folder><Primitive/></Folder></da:Application></InformationModel>')[0]
+
+    assert parser.collectTreeStatistics(application) == {'Machine' : 1, 'Station' : 1, 'Primitive' : 3, 'Folder' : 1}
+
+def test_project_tags_list_each_element_type_once(parser):
+    frames = parser.excelConfigFilesToDataFrames(parser.PROJECT.inputFolder)
+    model = parser.generateMainInformationModelFromDataFrames(*frames)
+
+    parser.makeProjectHmiTypeTags(maininformationmodel=model)
+
+    tags = etree.parse(parser.PROJECT.projectTagsFile).getroot()
+    names = [tag.attrib['name'] for tag in tags.iter('{http://www.ima.it/hmi/info-model}Tag')]
+    application = model.find('.//da:Application', parser.NAMESPACES)
+    assert names == sorted({etree.QName(element).localname for element in application.iterdescendants()})
+    assert {'AutomationDevice', 'Machine', 'Station', 'ShiftRegister', 'Wph', 'Nest', 'Act_Bin', 'Primitive'} <= set(names)
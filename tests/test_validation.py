@@ -0,0 +1,99 @@
+import pandas as pd
+from lxml import etree
+
+import parser
+from projectconfig import ProjectPaths
+from synthetic_plant import MAIN_INFORMATION_MODEL_BASE
+from validation import TagReference, modelViolations
+
+MODEL = """<InformationModel xmlns="http://www.ima.it/hmi/info-model" xmlns:da="http://www.ima.it/hmi/info-model/Automation">
+    <da:Application name="Application">
+        <da:AutomationDevice name="PLC1" hmiId="1">
+            <da:Machine name="M01" scopeId="M01" hmiId="2">
+                <Primitive name="PackMlState" plcTag="//_01_Main.PackMl.Sts_State" hmiId="3"/>
+                <Primitive name="PackMlMode" plcTag="//_01_Main.PackMl.Sts_State" hmiId="4"/>
+            </da:Machine>
+            <da:Machine name="Machine01" scopeId="M01" hmiId="3"/>
+        </da:AutomationDevice>
+        <da:AutomationDevice name="PLC2" hmiId="5">
+            <da:Machine name="M01" scopeId="M01" hmiId="6">
+                <Primitive name="PackMlState" plcTag="//_01_Main.PackMl.Sts_State" hmiId="7"/>
+            </da:Machine>
+        </da:AutomationDevice>
+    </da:Application>
+</InformationModel>
+"""
+
+EXPECTED = [('duplicate plcTag', 'PLC1/M01/PackMlMode', "//_01_Main.PackMl.Sts_State is also the plcTag of PLC1/M01/PackMlState"),
+            ('duplicate scopeId', 'PLC1/M01', "a previous sibling has the scope path PLC1/M01"),
+            ('hmiId collision', 'PLC1/M01', "hmiId 3 is also the hmiId of PLC1/M01/PackMlState")]
+
+def test_duplicates_are_found_in_an_element_and_in_a_file(tmp_path):
+    path = tmp_path / 'MainInformationModel.xml'
+    path.write_text(MODEL, encoding='utf-8')
+
+    assert [tuple(violation) for violation in modelViolations(etree.fromstring(MODEL.encode()))] == EXPECTED
+    assert [tuple(violation) for violation in modelViolations(str(path))] == EXPECTED
+
+def test_a_synthetic_plant_has_no_violations(project : ProjectPaths, monkeypatch):
+    monkeypatch.setattr(parser, 'VALIDATE_MODEL', True)
+    parser.runConverter()
+    assert parser.MODEL_VIOLATIONS == []
+
+def test_unsupported_actuators_are_reported(project : ProjectPaths, monkeypatch):
+    monkeypatch.setattr(parser, 'VALIDATE_MODEL', True)
+    dfInformationModel, dfParameters, dfAlarms = parser.excelConfigFilesToDataFrames(project.inputFolder, workers=1)
+    dfInformationModel = dfInformationModel.astype({'ActuatorType' : object})
+    dfInformationModel.loc[dfInformationModel.index[0], 'ActuatorType'] = 'Act_Valve'
+
+    parser.generateMainInformationModelFromDataFrames(dfInformationModel, dfParameters, dfAlarms)
+
+    assert [(violation.check, violation.path) for violation in parser.MODEL_VIOLATIONS] == [
+        ('unsupported actuator', 'PLC1/M01/ST01/_01_01_01_Act01')]
+
+def test_malformed_alarm_inputs_are_reported(project : ProjectPaths, monkeypatch, capsys):
+    monkeypatch.setattr(parser, 'VALIDATE_MODEL', True)
+    dfInformationModel, dfParameters, dfAlarms = parser.excelConfigFilesToDataFrames(project.inputFolder, workers=1)
+    malformed = pd.DataFrame({'AutomationDevice' : 'PLC1', 'AlarmName' : ['Spare_1', 'Spare_2', 'Spare_3'],
+                              'AlarmInput' : ['Spare.L1.0', '_01.L1.0', '_01_99_Alms.L1.0'], 'AlarmAcknowledge' : None, 'AlarmMessage' : 'Spare'})
+    dfAlarms = parser.concatRecordBatches([dfAlarms, malformed], parser.ALARMS_DTYPES)
+
+    parser.generateMainInformationModelFromDataFrames(dfInformationModel, dfParameters, dfAlarms)
+
+    unresolved = {violation.path : violation.message for violation in parser.MODEL_VIOLATIONS if violation.check == 'unresolved alarm'}
+    assert set(unresolved) == {'PLC1/Alarms/Spare.L1', 'PLC1/Alarms/_01.L1', 'PLC1/Alarms/_01_99_Alms.L1'}
+    assert unresolved['PLC1/Alarms/_01_99_Alms.L1'] == "no station 99 in machine M01"
+    # reported once, by the validation
+    assert not [line for line in capsys.readouterr().out.splitlines() if line.startswith('Error during Alarm creation')]
+
+def test_unresolved_alarms_are_reported_without_validation(project : ProjectPaths, capsys):
+    dfInformationModel, dfParameters, dfAlarms = parser.excelConfigFilesToDataFrames(project.inputFolder, workers=1)
+    malformed = pd.DataFrame({'AutomationDevice' : 'PLC1', 'AlarmName' : ['Spare_1', 'Spare_2'], 'AlarmInput' : ['Spare.L1.0', '_01_99_Alms.L1.0'],
+                              'AlarmAcknowledge' : None, 'AlarmMessage' : 'Spare'})
+    dfAlarms = parser.concatRecordBatches([dfAlarms, malformed], parser.ALARMS_DTYPES)
+
+    parser.generateMainInformationModelFromDataFrames(dfInformationModel, dfParameters, dfAlarms)
+
+    errors = [line for line in capsys.readouterr().out.splitlines() if line.startswith('Error')]
+    assert errors == ["Error during Alarm creation : PLC1 Spare.L1 alarm input Spare.L1 is not _<Machine>_<Station>_<word> or _<Machine>_Alms.<word>",
+                      "Error during Alarm creation : PLC1 _01_99_Alms.L1 no station 99 in machine M01"]
+
+def test_streaming_walk_matches_the_written_model(project : ProjectPaths, monkeypatch):
+    monkeypatch.setattr(parser, 'VALIDATE_MODEL', True)
+    # base file elements with the scope path of another element and the same plcTag, written around the streamed devices
+    with open(project.baseFile('MainInformationModelBase.xml'), 'w', encoding='utf-8') as fh:
+        fh.write(MAIN_INFORMATION_MODEL_BASE.replace('<TagsContainer/>', '<TagsContainer><Primitive name="A" plcTag="//A"/><Primitive name="A" plcTag="//A"/></TagsContainer>')
+                                            .replace('<da:Application name="Application"/>', '<da:Application name="Application"><Folder name="PLC2"/></da:Application>'))
+    frames = parser.excelConfigFilesToDataFrames(project.inputFolder, workers=1)
+
+    parser.generateMainInformationModelFromDataFrames(*frames)
+    treeReferences, treeViolations = list(parser.MODEL_TAG_REFERENCES), list(parser.MODEL_VIOLATIONS)
+
+    parser.generateMainInformationModelStreaming(*frames)
+    writtenReferences : list[TagReference] = []
+    writtenViolations = modelViolations(project.mainInformationModelFile, writtenReferences)
+
+    assert parser.MODEL_TAG_REFERENCES == writtenReferences == treeReferences
+    assert parser.MODEL_VIOLATIONS == treeViolations
+    assert [violation.path for violation in treeViolations] == ['InformationModel/TagsContainer/A', 'InformationModel/TagsContainer/A', 'PLC2']
+    assert len(writtenReferences) > 1000
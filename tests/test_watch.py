@@ -0,0 +1,85 @@
+import os
+
+import pytest
+from openpyxl import load_workbook
+
+import watch
+from hmiids import HmiIdAllocator
+
+def renameActuator(path : str, sheet : str, name : str):
+    workbook = load_workbook(path, keep_vba=True)
+    # row 6 is the first actuator of the station sheet, column C its name
+    workbook[sheet]['C6'] = name
+    workbook.save(path)
+
+def convertedModel(parser) -> bytes:
+    """MainInformationModel.xml of a full conversion without the watch memo"""
+    frames = parser.excelConfigFilesToDataFrames(parser.PROJECT.inputFolder, workers=1)
+    parser.generateOutputs(*frames, allocator=HmiIdAllocator())
+    return readModel(parser)
+
+def readModel(parser) -> bytes:
+    with open(parser.PROJECT.mainInformationModelFile, 'rb') as fh:
+        return fh.read()
+
+@pytest.mark.parametrize('streaming, workers', [(False, 1), (True, 1), (False, 2)], ids=['tree', 'streaming', 'workers'])
+def test_watch_rebuilds_only_the_changed_station(parser, monkeypatch, streaming, workers):
+    monkeypatch.setattr(parser, 'PERSIST_HMI_IDS', False)
+    monkeypatch.setattr(parser, 'STREAMING_OUTPUT', streaming)
+    monkeypatch.setattr(parser, 'GENERATION_WORKERS', workers)
+    watcher = watch.ProjectWatcher(interval=0)
+    watcher.signatures = watch.workbookSignatures(parser.PROJECT.inputFolder)
+    assert watcher.rebuild(list(watcher.signatures))
+    assert readModel(parser) == convertedModel(parser)
+
+    workbook = os.path.join(parser.PROJECT.inputFolder, 'Synthetic_PLC1.xlsm')
+    renameActuator(workbook, '_01_02', 'Renamed')
+    changed = {path : signature for path, signature in watch.workbookSignatures(parser.PROJECT.inputFolder).items()
+                if path == workbook}
+    watcher.update(changed, [])
+
+    model = readModel(parser)
+    assert b'Renamed' in model
+    assert model == convertedModel(parser)
+    if workers == 1:
+        # 2 PLCs x 2 machines x (3 stations + 1 loop)
+        assert (watcher.memo.built, watcher.memo.reused) == (1, 15)
+    assert parser.SUBTREE_MEMO is None
+
+def test_failed_build_keeps_the_last_good_outputs(parser, monkeypatch, capsys):
+    monkeypatch.setattr(parser, 'PERSIST_HMI_IDS', False)
+    monkeypatch.setattr(parser, 'GENERATION_WORKERS', 1)
+    watcher = watch.ProjectWatcher(interval=0)
+    watcher.signatures = watch.workbookSignatures(parser.PROJECT.inputFolder)
+    assert watcher.rebuild(list(watcher.signatures))
+    model = readModel(parser)
+
+    workbook = os.path.join(parser.PROJECT.inputFolder, 'Synthetic_PLC1.xlsm')
+    with open(workbook, 'wb') as fh:
+        fh.write(b'not a workbook')
+    watcher.update({workbook : watch.workbookSignatures(parser.PROJECT.inputFolder)[workbook]}, [])
+    assert capsys.readouterr().out.startswith("Error build of Synthetic_PLC1.xlsm failed : BadZipFile")
+    assert readModel(parser) == model
+
+    # the other workbook still converts with the last good batches of the broken one
+    renameActuator(os.path.join(parser.PROJECT.inputFolder, 'Synthetic_PLC2.xlsm'), '_01_02', 'Renamed')
+    changed = {path : signature for path, signature in watch.workbookSignatures(parser.PROJECT.inputFolder).items()
+                if path.endswith('PLC2.xlsm')}
+    watcher.update(changed, [])
+    assert b'Renamed' in readModel(parser)
+    assert (watcher.memo.built, watcher.memo.reused) == (1, 15)
+
+def test_removed_station_subtrees_are_dropped(parser):
+    memo = parser.SubtreeMemo()
+    memo.startBuild()
+    memo.keep('a', parser.etree.Element('A'))
+    memo.keep('b', parser.etree.Element('B'))
+    memo.finishBuild()
+
+    memo.startBuild()
+    assert memo.take('a').tag == 'A'
+    memo.finishBuild()
+
+    memo.startBuild()
+    assert memo.take('b') is None
+    assert memo.take('a').tag == 'A'
@@ -0,0 +1,59 @@
+import pandas as pd
+
+from bench_workbook_loading import legacyExcelConfigFilesToDataFrames
+
+def byDevice(df : pd.DataFrame) -> pd.DataFrame:
+    """os.listdir order is not the sorted one of the reference loader"""
+    return df.astype(object).sort_values('AutomationDevice', kind='stable').reset_index(drop=True)
+
+def test_single_pass_loader_matches_the_per_tab_reader(parser):
+    dfInformationModel, dfParameters, dfAlarms = parser.excelConfigFilesToDataFrames(parser.PROJECT.inputFolder)
+    legacyInformationModel, legacyAlarms = legacyExcelConfigFilesToDataFrames(parser, parser.PROJECT.inputFolder)
+
+    assert len(dfInformationModel) == 2 * 2 * 3 * 2
+    # the batches keep the name of their header row
+    pd.testing.assert_frame_equal(byDevice(dfInformationModel), byDevice(legacyInformationModel), check_names=False)
+    pd.testing.assert_frame_equal(byDevice(dfAlarms), byDevice(legacyAlarms), check_names=False)
+    assert dfParameters.empty
+
+def test_each_config_sheet_is_parsed_once(parser, monkeypatch):
+    parsed : list[str] = []
+    excelParse = pd.ExcelFile.parse
+    def countingParse(self, sheet_name=0, **kwargs):
+        parsed.extend(sheet_name)
+        return excelParse(self, sheet_name=sheet_name, **kwargs)
+    monkeypatch.setattr(pd.ExcelFile, 'parse', countingParse)
+    monkeypatch.setattr(pd, 'read_excel', None)
+
+    parser.excelConfigFilesToDataFrames(parser.PROJECT.inputFolder)
+
+    stationSheets = [f'_{machine:02d}_{station:02d}' for machine in range(1, 3) for station in range(1, 4)]
+    assert sorted(parsed) == sorted(2 * (stationSheets + ['_Alarms']))
+
+def test_parameters_are_read_from_the_pars_block(parser):
+    sheet = pd.DataFrame([['NameL1', 'Station0102', None, None, None, None],
+                          ['Pars', 'Name', 'DataType', 'Minimum', 'Value', 'Maximum'],
+                          ['_01', 'WaitingTime', 'Int32', 0, 10, 100],
+                          ['Pars End', None, None, None, None, None]])
+
+    parameters = parser.parametersToDataFrame(tab='_01_02', plcName='PLC1', df_Raw=sheet)
+
+    assert parameters.drop(columns='Actuator').to_dict('records') == [{'AutomationDevice' : 'PLC1', 'Machine' : '01', 'Station' : '02',
+                                              'ParameterName' : 'WaitingTime', 'DataType' : 'Int32', 'Minimum' : 0, 'Maximum' : 100}]
+
+def test_parallel_ingestion_returns_the_serial_frames(parser):
+    serial = parser.excelConfigFilesToDataFrames(parser.PROJECT.inputFolder, workers=1)
+    parallel = parser.excelConfigFilesToDataFrames(parser.PROJECT.inputFolder, workers=2)
+
+    for serialFrame, parallelFrame in zip(serial, parallel):
+        pd.testing.assert_frame_equal(parallelFrame, serialFrame)
+    assert list(serial[0]['AutomationDevice'].unique()) == ['PLC1', 'PLC2']
+
+def test_frames_have_the_fixed_dtypes(parser):
+    dfInformationModel, dfParameters, dfAlarms = parser.excelConfigFilesToDataFrames(parser.PROJECT.inputFolder)
+
+    for frame, dtypes in [(dfInformationModel, parser.INFORMATION_MODEL_DTYPES), (dfParameters, parser.PARAMETERS_DTYPES),
+                          (dfAlarms, parser.ALARMS_DTYPES)]:
+        assert {column : str(dtype) for column, dtype in frame.dtypes.items()} == dtypes
+    assert list(dfInformationModel['Station'].cat.categories) == ['01', '02', '03']
+    assert dfInformationModel.index.equals(pd.RangeIndex(len(dfInformationModel)))
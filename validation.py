@@ -0,0 +1,123 @@
+"""
+    Validation of the generated information model.
+
+    The model is walked once, an element, a written file or subtree by subtree as it is written, and
+    three hash indexes are filled on the way : the scope path segments of the children of each element,
+    plcTag -> path per AutomationDevice and hmiId -> path. A second occurrence is a violation, reported
+    with its path and the first occurrence :
+
+        duplicate scopeId   two siblings with the same scopeId (else name), they have the same scope path
+        duplicate plcTag    two elements of one PLC reading the same address
+        hmiId collision     two elements with the same hmiId
+
+    Paths below da:Application are scope paths from the AutomationDevice (PLC1/M01/ST01/_01_01_01_Act01),
+    like the tag table and the hmiId map. The rows the generation leaves out, actuators of an unsupported
+    type and alarm words without a station, are checked by the converter and reported as violations too.
+"""
+from typing import Iterable, NamedTuple
+
+from lxml import etree
+
+from hmiids import DA_NAMESPACE, scopeSegment
+
+# element tags compared as strings, QName is not made for every element
+AUTOMATION_DEVICE_TAG = f"{{{DA_NAMESPACE}}}AutomationDevice"
+APPLICATION_TAG = f"{{{DA_NAMESPACE}}}Application"
+
+class Violation(NamedTuple):
+    check : str
+    path : str
+    message : str
+
+    def __str__(self) -> str:
+        return f"{self.check} {self.path} : {self.message}"
+
+class TagReference(NamedTuple):
+    """An element of the model with a plcTag, the hmiId is its own or, for a Primitive, the one of its nearest ancestor"""
+    device : str
+    plcTag : str
+    path : str
+    hmiId : str
+
+def modelEvents(source) -> tuple[Iterable, bool]:
+    """start and end events of an element (walked in place) or of a file (parsed, cleared as it goes)"""
+    if isinstance(source, etree._ElementTree):
+        source = source.getroot()
+    if isinstance(source, etree._Element):
+        return etree.iterwalk(source, events=('start', 'end')), False
+    return etree.iterparse(source, events=('start', 'end')), True
+
+class OpenElement(NamedTuple):
+    """An element whose children are walked : the path of its children, their scope segments, its AutomationDevice and nearest hmiId"""
+    path : str
+    children : dict[str, str]
+    device : str
+    hmiId : str
+
+class ModelWalk:
+    """
+        Indexes of one walk of the model, in document order. The model is walked at once or, when it is
+        written subtree by subtree, each subtree below its open ancestors (see parser.StreamingModelWriter).
+        Every element with a plcTag is appended to `references`.
+    """
+
+    def __init__(self, references : list[TagReference] = None) -> None:
+        self.violations : list[Violation] = []
+        self.plcTags : dict[tuple[str, str], str] = {}
+        self.hmiIds : dict[str, str] = {}
+        self.references = references
+
+    def visit(self, element : etree.Element, parent : OpenElement) -> OpenElement:
+        """Check one element below `parent`, returns it open for its children"""
+        segment = scopeSegment(element)
+        path = f"{parent.path}/{segment}" if parent.path else segment
+        if segment in parent.children:
+            self.violations.append(Violation('duplicate scopeId', path, f"a previous sibling has the scope path {parent.children[segment]}"))
+        else:
+            parent.children[segment] = path
+
+        device = element.get('name') if element.tag == AUTOMATION_DEVICE_TAG else parent.device
+
+        hmiId = element.get('hmiId')
+        plcTag = element.get('plcTag')
+        if plcTag:
+            if self.references is not None:
+                self.references.append(TagReference(device, plcTag, path, hmiId or parent.hmiId))
+            if (device, plcTag) in self.plcTags:
+                self.violations.append(Violation('duplicate plcTag', path, f"{plcTag} is also the plcTag of {self.plcTags[(device, plcTag)]}"))
+            else:
+                self.plcTags[(device, plcTag)] = path
+
+        if hmiId:
+            if hmiId in self.hmiIds:
+                self.violations.append(Violation('hmiId collision', path, f"hmiId {hmiId} is also the hmiId of {self.hmiIds[hmiId]}"))
+            else:
+                self.hmiIds[hmiId] = path
+
+        # the AutomationDevice scope paths start below da:Application
+        return OpenElement('' if element.tag == APPLICATION_TAG else path, {}, device, hmiId or parent.hmiId)
+
+    def walk(self, source, parent : OpenElement = None):
+        """Walk a model element or file, below `parent` or as the document"""
+        stack : list[OpenElement] = [parent if parent is not None else OpenElement('', {}, None, None)]
+        events, clear = modelEvents(source)
+        for event, element in events:
+            if not isinstance(element.tag, str):
+                continue
+            if event == 'end':
+                stack.pop()
+                if clear:
+                    element.clear(keep_tail=True)
+                    while element.getprevious() is not None:
+                        del element.getparent()[0]
+                continue
+            stack.append(self.visit(element, stack[-1]))
+
+def modelViolations(source, references : list[TagReference] = None) -> list[Violation]:
+    """
+        Duplicate scopeIds, duplicate plcTags and hmiId collisions of a model element or file, in document
+        order. Every element with a plcTag is appended to `references`.
+    """
+    walk = ModelWalk(references)
+    walk.walk(source)
+    return walk.violations
@@ -0,0 +1,157 @@
+"""
+    Watch mode : the converter stays resident and regenerates the outputs when a workbook is saved.
+
+        python cli.py --project D:/Projects/LineA --watch
+
+    The configuration, the record batches of every workbook and the generated station and loop subtrees
+    are kept in memory. A saved workbook is re-parsed alone (only its changed sheets with the build cache),
+    then the outputs are generated like a conversion (parser.generateOutputs, STREAMING_OUTPUT and
+    GENERATION_WORKERS apply) with parser.SUBTREE_MEMO set : only the stations whose rows changed are
+    rebuilt, the other subtrees are moved into the new tree as they are. Subtrees built by worker processes
+    are reused from the build cache instead. Outputs are replaced atomically and the latency of each update
+    is printed.
+
+    A workbook that cannot be converted is reported and the outputs of the last good build are kept, its
+    last good record batches are used until a save of it is converted, the watch goes on.
+
+    The input folder is polled, a workbook is picked up once its size and modification time stayed the
+    same for one poll, so a save still in progress is never read. Excel `~$` lock files are ignored.
+"""
+import os
+import time
+
+import pandas as pd
+
+import parser
+from hmiids import HmiIdAllocator, loadHmiIdAllocator
+
+def workbookSignatures(folder : str) -> dict[str, tuple[int, int]]:
+    """(size, mtime) of every workbook the converter reads"""
+    signatures : dict[str, tuple[int, int]] = {}
+    for file in os.listdir(folder):
+        if not file.endswith(".xlsm") or file.startswith("~$"):
+            continue
+        try:
+            stat = os.stat(os.path.join(folder, file))
+        except FileNotFoundError:
+            continue
+        signatures[os.path.join(folder, file)] = (stat.st_size, stat.st_mtime_ns)
+    return signatures
+
+class ProjectWatcher:
+
+    def __init__(self, interval : float = 1.0) -> None:
+        self.interval = interval
+        self.memo = parser.SubtreeMemo()
+        self.batches : dict[str, tuple] = {}
+        self.signatures : dict[str, tuple[int, int]] = {}
+        self.hmiIds : dict[str, int] = dict(loadHmiIdAllocator(parser.PROJECT.hmiIdMapFile if parser.PERSIST_HMI_IDS else None).previous)
+        self.alarmsHash : str = None
+        # end of the parsing of the last rebuild
+        self.parsed : float = None
+
+    def parse(self, paths : list[str]) -> dict[str, tuple]:
+        return {path : parser.workbookToRecordBatches(path, cache=parser.BUILD_CACHE) for path in paths}
+
+    def frames(self, batches : dict[str, tuple]) -> (pd.DataFrame, pd.DataFrame, pd.DataFrame):
+        """Frames of every workbook, concatenated in file name order like excelConfigFilesToDataFrames"""
+        workbooks = [batches[path] for path in sorted(batches)]
+        return tuple(parser.concatRecordBatches([batch for workbook in workbooks for batch in workbook[i]], dtypes)
+                        for i, dtypes in enumerate([parser.INFORMATION_MODEL_DTYPES, parser.PARAMETERS_DTYPES, parser.ALARMS_DTYPES]))
+
+    def generate(self, batches : dict[str, tuple]):
+        dfinformationModel, dfParameters, dfAlarms = self.frames(batches)
+
+        allocator = HmiIdAllocator(self.hmiIds)
+        alarmsHash = parser.hashFrame(dfAlarms)
+
+        self.memo.startBuild()
+        parser.SUBTREE_MEMO = self.memo
+        try:
+            parser.generateOutputs(dfinformationModel=dfinformationModel, dfParameters=dfParameters, dfAlarms=dfAlarms,
+                                   allocator=allocator, alarmsTextFiles=alarmsHash != self.alarmsHash)
+        finally:
+            parser.SUBTREE_MEMO = None
+        self.memo.finishBuild()
+
+        self.alarmsHash = alarmsHash
+        self.hmiIds = allocator.assigned
+        if parser.PERSIST_HMI_IDS:
+            allocator.save(parser.PROJECT.hmiIdMapFile)
+
+    def rebuild(self, paths : list[str], removed : list[str] = None) -> bool:
+        """
+            Parse `paths` and the workbooks without record batches, then generate. The batches are kept once
+            the outputs are generated, False when the build failed and was reported.
+        """
+        removed = removed or []
+        batches = {path : batch for path, batch in self.batches.items() if path not in removed}
+        try:
+            batches.update(self.parse([path for path in self.signatures if path in paths or path not in batches]))
+            self.parsed = time.perf_counter()
+            self.generate(batches)
+        except Exception as e:
+            names = ', '.join(os.path.basename(path) for path in [*paths, *removed])
+            print(f"Error build of {names} failed : {type(e).__name__} {e}, the outputs of the last good build are kept")
+            return False
+        self.batches = batches
+        return True
+
+    def subtrees(self) -> str:
+        if self.memo.built + self.memo.reused == 0:
+            return "subtrees built by the generation workers"
+        return f"{self.memo.built} subtrees rebuilt, {self.memo.reused} reused"
+
+    def poll(self) -> (dict[str, tuple[int, int]], list[str]):
+        """Workbooks whose signature changed and stayed stable for one poll interval, and the removed ones"""
+        signatures = workbookSignatures(parser.PROJECT.inputFolder)
+        candidates = {path : signature for path, signature in signatures.items() if self.signatures.get(path) != signature}
+        removed = [path for path in self.signatures if path not in signatures]
+        if not candidates and not removed:
+            return {}, removed
+        time.sleep(self.interval)
+        settled = workbookSignatures(parser.PROJECT.inputFolder)
+        return {path : signature for path, signature in candidates.items() if settled.get(path) == signature}, removed
+
+    def update(self, changed : dict[str, tuple[int, int]], removed : list[str]):
+        detected = time.time()
+        start = time.perf_counter()
+        # a workbook that fails is read again on its next save, not on every poll
+        for path in removed:
+            self.signatures.pop(path, None)
+        self.signatures.update(changed)
+        if not self.rebuild(list(changed), removed):
+            return
+        parsed, end = self.parsed, time.perf_counter()
+
+        # latency from the save, the modification time of the newest changed workbook
+        saved = max((signature[1] / 1e9 for signature in changed.values()), default=detected)
+        names = ', '.join(os.path.basename(path) for path in [*changed, *removed])
+        print(f"Updated {names} : {self.subtrees()}, "
+              f"parse {parsed - start:.2f} s, generate {end - parsed:.2f} s, "
+              f"{detected - saved + end - start:.2f} s since save")
+
+    def run(self):
+        print(f"Watching {parser.PROJECT.inputFolder}, Ctrl+C to stop")
+        self.signatures = workbookSignatures(parser.PROJECT.inputFolder)
+        start = time.perf_counter()
+        if self.rebuild(list(self.signatures)):
+            print(f"Initial build : {len(self.signatures)} workbooks, {self.subtrees()}, {time.perf_counter() - start:.2f} s")
+
+        try:
+            while True:
+                changed, removed = self.poll()
+                if changed or removed:
+                    self.update(changed, removed)
+                else:
+                    time.sleep(self.interval)
+        except KeyboardInterrupt:
+            print("Watch stopped")
+
+def watchProject(interval : float = 1.0):
+    """Watch parser.PROJECT, configured by the caller"""
+    parser.INSTRUMENTATION.enabled = False
+    if parser.BUILD_CACHE_FOLDER:
+        parser.BUILD_CACHE = parser.BuildCache(parser.BUILD_CACHE_FOLDER, maxBytes=parser.BUILD_CACHE_MAX_BYTES)
+    parser.PROJECT.makeOutputFolders()
+    ProjectWatcher(interval=interval).run()